@@ -19,6 +19,7 @@ class NumericInstructionBase(InstructionBase):
 
 
 class ConstantInstructionBase(NumericInstructionBase):
+    __slots__ = ('value', )
     type: INT_OR_FLOAT
     value: Union[int, float]
     bits: VALID_BITS
@@ -30,7 +31,7 @@ for (fi, bits) in itertools.product(['int', 'float'], [32, 64]):
     pycode += f'''
 class {name}(ConstantInstructionBase):
     type: INT_OR_FLOAT = '{fi[0]}'
-    value: {fi} = 0
+    value: {fi}
     bits: VALID_BITS = {bits}
 '''
 
@@ -208,6 +209,15 @@ class I64Extend_i32_{fi}(CvtInstructionBase):
     type: INT_OR_FLOAT = 'i'
 """
 
+# sign-extension operators
+for (nn, mm) in [(32, 8), (32, 16), (64, 8), (64, 16), (64, 32)]:
+    pycode += f"""
+class I{nn}Extend{mm}_s(CvtInstructionBase):
+    bits: VALID_BITS = {nn}
+    op: str = 'extend{mm}_s'
+    type: INT_OR_FLOAT = 'i'
+"""
+
 for (nn, mm, fi) in itertools.product([32, 64], [32, 64], 'su'):
     pycode += f"""
 class I{nn}Trunc_f{mm}_{fi}(CvtInstructionBase):
@@ -215,6 +225,11 @@ class I{nn}Trunc_f{mm}_{fi}(CvtInstructionBase):
     op: str = 'trunc_f{mm}_{fi}'
     type: INT_OR_FLOAT = 'i'
 
+class I{nn}Trunc_sat_f{mm}_{fi}(CvtInstructionBase):
+    bits: VALID_BITS = {nn}
+    op: str = 'trunc_sat_f{mm}_{fi}'
+    type: INT_OR_FLOAT = 'i'
+
 class F{nn}Convert_i{mm}_{fi}(CvtInstructionBase):
     bits: VALID_BITS = {nn}
     op: str = 'convert_i{mm}_{fi}'
@@ -267,6 +282,7 @@ VALID_BITS = Literal[32, 64]
 SIGNED = Optional[Literal['u', 's']]
 
 class MemoryLoadStoreInstructionBase(InstructionBase):
+    __slots__ = ('offset', 'align')
     type: INT_OR_FLOAT
     bits: VALID_BITS
     op: str
@@ -309,9 +325,228 @@ class MemorySize(InstructionBase):
 
 class MemoryGrow(InstructionBase):
     op: str = 'memory.grow'
+
+# Bulk memory operations
+
+class MemoryInit(InstructionBase):
+    op: str = 'memory.init'
+    __slots__ = ('dataidx', )
+    dataidx: int
+
+class MemoryCopy(InstructionBase):
+    op: str = 'memory.copy'
+
+class MemoryFill(InstructionBase):
+    op: str = 'memory.fill'
+
+# Atomic memory instructions (threads proposal)
+
+class AtomicMemoryInstructionBase(InstructionBase):
+    __slots__ = ('offset', 'align')
+    type: INT_OR_FLOAT = 'i'
+    bits: VALID_BITS
+    width: int  # bits accessed in memory
+    op: str
+    rmw: Optional[str] = None
+    offset: int
+    align: int
+
+class MemoryAtomicNotify(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'memory.atomic.notify'
+
+class MemoryAtomicWait32(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'memory.atomic.wait32'
+
+class MemoryAtomicWait64(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 64
+    op: str = 'memory.atomic.wait64'
 '''
 
+# (bits of value, bits accessed in memory), in binary opcode order
+ATOMIC_WIDTHS = [(32, 32), (64, 64), (32, 8), (32, 16), (64, 8), (64, 16), (64, 32)]
+
+for tpp in ['load', 'store', 'rmw.add', 'rmw.sub', 'rmw.and', 'rmw.or', 'rmw.xor', 'rmw.xchg', 'rmw.cmpxchg']:
+    for (nn, width) in ATOMIC_WIDTHS:
+        kind, _, rmw = tpp.partition('.')
+        if nn == width:
+            op = tpp
+        elif kind == 'store':
+            op = f'{tpp}{width}'
+        else:
+            op = f'{kind}{width}{"." if rmw else ""}{rmw}_u'
+        pycode += f"""
+class I{nn}Atomic_{op.replace('.', '_')}(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = {nn}
+    width: int = {width}
+    op: str = 'atomic_{op.replace('.', '_')}'
+    rmw: Optional[str] = {repr(rmw or None)}
+"""
+
 print(pycode)
 
 with open('wapysm/opcode/memory_generated.py', 'w') as w:
     w.write(pycode)
+
+
+
+
+pycode = '''# Vector Instructions (SIMD proposal)
+# Automatically generated. DO NOT EDIT
+
+from typing import Literal
+from . import InstructionBase
+
+
+SHAPE = Literal['v128', 'i8x16', 'i16x8', 'i32x4', 'i64x2', 'f32x4', 'f64x2']
+
+class VectorInstructionBase(InstructionBase):
+    shape: SHAPE
+    op: str
+
+class VectorMemoryInstructionBase(VectorInstructionBase):
+    __slots__ = ('offset', 'align')
+    offset: int
+    align: int
+
+class VectorMemoryLaneInstructionBase(VectorMemoryInstructionBase):
+    __slots__ = ('laneidx', )
+    laneidx: int
+
+class VectorConstInstructionBase(VectorInstructionBase):
+    __slots__ = ('value', )
+    value: int
+
+class VectorShuffleInstructionBase(VectorInstructionBase):
+    __slots__ = ('lanes', )
+    lanes: bytes
+
+class VectorSplatInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorLaneInstructionBase(VectorInstructionBase):
+    __slots__ = ('laneidx', )
+    laneidx: int
+
+class VectorUnopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorBinopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorTernopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorRelopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorShiftInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorTestInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorBitmaskInstructionBase(VectorInstructionBase):
+    pass
+'''
+
+VECTOR_INT_RELOPS = ['eq', 'ne', 'lt_s', 'lt_u', 'gt_s', 'gt_u', 'le_s', 'le_u', 'ge_s', 'ge_u']
+VECTOR_FLOAT_RELOPS = ['eq', 'ne', 'lt', 'gt', 'le', 'ge']
+
+# (shape, op) in binary opcode order
+vector_instructions = [('v128', op) for op in [
+    'load', 'load8x8_s', 'load8x8_u', 'load16x4_s', 'load16x4_u', 'load32x2_s', 'load32x2_u',
+    'load8_splat', 'load16_splat', 'load32_splat', 'load64_splat', 'store', 'const']]
+vector_instructions += [('i8x16', 'shuffle'), ('i8x16', 'swizzle')]
+vector_instructions += [(shape, 'splat') for shape in ['i8x16', 'i16x8', 'i32x4', 'i64x2', 'f32x4', 'f64x2']]
+vector_instructions += [
+    ('i8x16', 'extract_lane_s'), ('i8x16', 'extract_lane_u'), ('i8x16', 'replace_lane'),
+    ('i16x8', 'extract_lane_s'), ('i16x8', 'extract_lane_u'), ('i16x8', 'replace_lane')]
+vector_instructions += [(shape, op) for shape in ['i32x4', 'i64x2', 'f32x4', 'f64x2'] for op in ['extract_lane', 'replace_lane']]
+vector_instructions += [(shape, op) for shape in ['i8x16', 'i16x8', 'i32x4'] for op in VECTOR_INT_RELOPS]
+vector_instructions += [(shape, op) for shape in ['f32x4', 'f64x2'] for op in VECTOR_FLOAT_RELOPS]
+vector_instructions += [('v128', op) for op in [
+    'not', 'and', 'andnot', 'or', 'xor', 'bitselect', 'any_true',
+    'load8_lane', 'load16_lane', 'load32_lane', 'load64_lane',
+    'store8_lane', 'store16_lane', 'store32_lane', 'store64_lane', 'load32_zero', 'load64_zero']]
+vector_instructions += [('f32x4', 'demote_f64x2_zero'), ('f64x2', 'promote_low_f32x4')]
+vector_instructions += [('i8x16', op) for op in [
+    'abs', 'neg', 'popcnt', 'all_true', 'bitmask', 'narrow_i16x8_s', 'narrow_i16x8_u']]
+vector_instructions += [('f32x4', op) for op in ['ceil', 'floor', 'trunc', 'nearest']]
+vector_instructions += [('i8x16', op) for op in [
+    'shl', 'shr_s', 'shr_u', 'add', 'add_sat_s', 'add_sat_u', 'sub', 'sub_sat_s', 'sub_sat_u']]
+vector_instructions += [('f64x2', 'ceil'), ('f64x2', 'floor')]
+vector_instructions += [('i8x16', op) for op in ['min_s', 'min_u', 'max_s', 'max_u']]
+vector_instructions += [('f64x2', 'trunc'), ('i8x16', 'avgr_u')]
+vector_instructions += [
+    ('i16x8', 'extadd_pairwise_i8x16_s'), ('i16x8', 'extadd_pairwise_i8x16_u'),
+    ('i32x4', 'extadd_pairwise_i16x8_s'), ('i32x4', 'extadd_pairwise_i16x8_u')]
+vector_instructions += [('i16x8', op) for op in [
+    'abs', 'neg', 'q15mulr_sat_s', 'all_true', 'bitmask', 'narrow_i32x4_s', 'narrow_i32x4_u',
+    'extend_low_i8x16_s', 'extend_high_i8x16_s', 'extend_low_i8x16_u', 'extend_high_i8x16_u',
+    'shl', 'shr_s', 'shr_u', 'add', 'add_sat_s', 'add_sat_u', 'sub', 'sub_sat_s', 'sub_sat_u']]
+vector_instructions += [('f64x2', 'nearest')]
+vector_instructions += [('i16x8', op) for op in [
+    'mul', 'min_s', 'min_u', 'max_s', 'max_u', 'avgr_u',
+    'extmul_low_i8x16_s', 'extmul_high_i8x16_s', 'extmul_low_i8x16_u', 'extmul_high_i8x16_u']]
+vector_instructions += [('i32x4', op) for op in [
+    'abs', 'neg', 'all_true', 'bitmask',
+    'extend_low_i16x8_s', 'extend_high_i16x8_s', 'extend_low_i16x8_u', 'extend_high_i16x8_u',
+    'shl', 'shr_s', 'shr_u', 'add', 'sub', 'mul', 'min_s', 'min_u', 'max_s', 'max_u', 'dot_i16x8_s',
+    'extmul_low_i16x8_s', 'extmul_high_i16x8_s', 'extmul_low_i16x8_u', 'extmul_high_i16x8_u']]
+vector_instructions += [('i64x2', op) for op in [
+    'abs', 'neg', 'all_true', 'bitmask',
+    'extend_low_i32x4_s', 'extend_high_i32x4_s', 'extend_low_i32x4_u', 'extend_high_i32x4_u',
+    'shl', 'shr_s', 'shr_u', 'add', 'sub', 'mul', 'eq', 'ne', 'lt_s', 'gt_s', 'le_s', 'ge_s',
+    'extmul_low_i32x4_s', 'extmul_high_i32x4_s', 'extmul_low_i32x4_u', 'extmul_high_i32x4_u']]
+vector_instructions += [(shape, op) for shape in ['f32x4', 'f64x2'] for op in [
+    'abs', 'neg', 'sqrt', 'add', 'sub', 'mul', 'div', 'min', 'max', 'pmin', 'pmax']]
+vector_instructions += [
+    ('i32x4', 'trunc_sat_f32x4_s'), ('i32x4', 'trunc_sat_f32x4_u'),
+    ('f32x4', 'convert_i32x4_s'), ('f32x4', 'convert_i32x4_u'),
+    ('i32x4', 'trunc_sat_f64x2_s_zero'), ('i32x4', 'trunc_sat_f64x2_u_zero'),
+    ('f64x2', 'convert_low_i32x4_s'), ('f64x2', 'convert_low_i32x4_u')]
+
+
+def vector_base_class(op: str) -> str:
+    if op.startswith(('load', 'store')):
+        return 'VectorMemoryLaneInstructionBase' if op.endswith('_lane') else 'VectorMemoryInstructionBase'
+    if op == 'const':
+        return 'VectorConstInstructionBase'
+    if op == 'shuffle':
+        return 'VectorShuffleInstructionBase'
+    if op == 'splat':
+        return 'VectorSplatInstructionBase'
+    if op.startswith(('extract_lane', 'replace_lane')):
+        return 'VectorLaneInstructionBase'
+    if op in VECTOR_INT_RELOPS or op in VECTOR_FLOAT_RELOPS:
+        return 'VectorRelopInstructionBase'
+    if op in ('shl', 'shr_s', 'shr_u'):
+        return 'VectorShiftInstructionBase'
+    if op in ('any_true', 'all_true'):
+        return 'VectorTestInstructionBase'
+    if op == 'bitmask':
+        return 'VectorBitmaskInstructionBase'
+    if op == 'bitselect':
+        return 'VectorTernopInstructionBase'
+    if op in ('not', 'abs', 'neg', 'popcnt', 'sqrt', 'ceil', 'floor', 'trunc', 'nearest') or \
+            op.startswith(('extend_', 'extadd_', 'convert_', 'trunc_sat_', 'demote_', 'promote_')):
+        return 'VectorUnopInstructionBase'
+    return 'VectorBinopInstructionBase'
+
+
+for (shape, op) in vector_instructions:
+    pycode += f"""
+class {shape.capitalize()}{op.capitalize()}({vector_base_class(op)}):
+    shape: SHAPE = '{shape}'
+    op: str = '{op}'
+"""
+
+print(pycode)
+
+with open('wapysm/opcode/vector_generated.py', 'w') as w:
+    w.write(pycode)
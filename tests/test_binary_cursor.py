@@ -0,0 +1,84 @@
+import io
+import mmap
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.parser.binary.byteencode import read_leb128_signed, read_leb128_unsigned, read_utf8
+from wapysm.parser.binary.cursor import BinaryCursor
+from wapysm.parser.binary.module import parse_binary_wasm_module
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, simple_module
+
+# add(a, b) with a wide i32.const operand to take the multi-byte LEB128 path
+ADD_WASM = simple_module(
+    [functype([I32, I32], [I32])],
+    [(0, code(bytes([0x20, 0, 0x20, 1, 0x6A, 0x41, 0x80, 0x80, 0x04, 0x6A, 0x0B])))],
+    [export('add', 0, 0)],
+)
+
+class TestBinaryCursor(unittest.TestCase):
+    def test_leb128(self):
+        stream = BinaryCursor(b'\xe5\x8e\x26\xc0\xbb\x78\x05')
+        self.assertEqual(read_leb128_unsigned(stream), 624485)
+        self.assertEqual(read_leb128_signed(stream), -123456)
+        self.assertEqual(read_leb128_unsigned(stream), 5)
+        self.assertTrue(stream.eof())
+
+    def test_sub_bounds(self):
+        stream = BinaryCursor(b'\x03abcdef')
+        sub = stream.sub(4)
+        self.assertEqual(read_utf8(sub), 'abc')
+        self.assertTrue(sub.eof())
+        self.assertEqual(stream.read(), b'def')
+        with self.assertRaises(IndexError):
+            sub.read_byte()
+        with self.assertRaises(IndexError):
+            BinaryCursor(b'\x80\x80').sub(1).read_leb128_unsigned()
+        with self.assertRaises(IndexError):
+            stream.sub(1)
+
+    def test_open_stream_and_buffers(self):
+        for source in (ADD_WASM, bytearray(ADD_WASM), memoryview(ADD_WASM), io.BytesIO(ADD_WASM)):
+            wasm = WebAssembly.instantiate_streaming(source, {})
+            self.assertEqual(wasm.exports['add'](1, 2), ('i', 32, 65539))
+
+    def test_open_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(ADD_WASM)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                parsed = WebAssembly.compile(mm)
+                self.assertEqual(len(parsed.sections), 4)
+                # function bodies are views of mm until decoded
+                del parsed
+
+    def test_lazy_function_body(self):
+        parsed = parse_binary_wasm_module(ADD_WASM)
+        wcode = [x for s in parsed.sections if s.section_id == 10 for x in s.section_content][0].code
+        self.assertIsNone(wcode._expr)
+        self.assertEqual(bytes(wcode.body), bytes([0x20, 0, 0x20, 1, 0x6A, 0x41, 0x80, 0x80, 0x04, 0x6A, 0x0B]))
+        self.assertEqual(len(wcode.expr), 5)
+        self.assertIs(wcode.expr, wcode._expr)
+
+        parsed = parse_binary_wasm_module(ADD_WASM, lazy=False)
+        wcode = [x for s in parsed.sections if s.section_id == 10 for x in s.section_content][0].code
+        self.assertIsNone(wcode.body)
+        self.assertEqual(len(wcode._expr), 5)
+
+    def test_mutable_source_is_not_kept(self):
+        buf = bytearray(ADD_WASM)
+        wasm = WebAssembly.instantiate(buf, {})
+        # lazy function body must not be a view of buf
+        buf.clear()
+        self.assertEqual(wasm.exports['add'](1, 2), ('i', 32, 65539))
+
+        buf = bytearray(ADD_WASM)
+        wasm = WebAssembly.instantiate(memoryview(buf), {})
+        buf[:] = bytes(len(buf))
+        self.assertEqual(wasm.exports['add'](3, 4), ('i', 32, 65543))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,52 @@
+import gc
 import os
+import pickle
 import sys
+import tracemalloc
 import unittest
+from typing import Callable, Iterator, List
+
+import requests
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from wapysm.parser.binary.instruction import OPCODE_TABLE
+from wapysm.parser.binary.cursor import BinaryCursor
+from wapysm.execute.context import WasmCodeSection
+from wapysm.opcode import InstructionBase
+from wapysm.parser.binary.instruction import OPCODE_TABLE, OPCODE_TABLE_FC, OPCODE_TABLE_FD, OPCODE_TABLE_FE, read_instructions
+from wapysm.parser.binary.module import parse_binary_wasm_module
+
+REAL_WASM_URL = 'https://raw.githubusercontent.com/wasmerio/wasmer/master/tests/wasi-wast/wasi/unstable/fd_allocate.wasm'
+
+def walk_instructions(instrs: List[InstructionBase]) -> Iterator[InstructionBase]:
+    for inst in instrs:
+        yield inst
+        for attr in ('instr', 'else_block'):
+            yield from walk_instructions(getattr(inst, attr, None) or [])
+
+def traced_size(make: Callable[[], object]) -> int:
+    " Bytes allocated by make and kept by its result "
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = make()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+def copy_instructions(instrs: List[InstructionBase], with_dict: bool) -> List[object]:
+    " Copies of instructions with the same operands, or as objects of plain classes with __dict__ if with_dict "
+    plain_types = {t: type(t.__name__, (), {}) for t in {type(x) for x in instrs}}
+    copies = []
+    for inst in instrs:
+        copied = object.__new__(plain_types[type(inst)] if with_dict else type(inst))
+        for cls in type(inst).__mro__:
+            for k in getattr(cls, '__slots__', ()):
+                if hasattr(inst, k):
+                    setattr(copied, k, getattr(inst, k))
+        copies.append(copied)
+    return copies
 
 class TestBinaryInstructions(unittest.TestCase):
     def test_opcode_table(self):
@@ -14,3 +57,33 @@ class TestBinaryInstructions(unittest.TestCase):
         print({k: v for k, v in values.items() if v > 1})
         self.assertEqual(len(OPCODE_TABLE), len(set(OPCODE_TABLE.keys())))
         self.assertEqual(len(OPCODE_TABLE), len(set(OPCODE_TABLE.values())))
+
+    def test_instructions_have_no_dict(self):
+        for table in (OPCODE_TABLE, OPCODE_TABLE_FC, OPCODE_TABLE_FD, OPCODE_TABLE_FE):
+            for inst_type in table.values():
+                self.assertFalse(hasattr(inst_type(), '__dict__'), inst_type)
+
+    def test_memory_of_real_module(self):
+        try:
+            wasm = requests.get(REAL_WASM_URL, timeout=30).content
+        except requests.RequestException as e:
+            self.skipTest(f'module is not available: {e!r}')
+        parsed = parse_binary_wasm_module(wasm, lazy=False)
+        instrs = [
+            inst for s in parsed.sections if s.section_id == 10
+            for x in s.section_content if isinstance(x, WasmCodeSection) for inst in walk_instructions(x.code.expr)
+        ]
+        self.assertGreater(len(instrs), 1000)
+        slotted = traced_size(lambda: copy_instructions(instrs, False))
+        with_dict = traced_size(lambda: copy_instructions(instrs, True))
+        print(f'{len(instrs)} instructions: {slotted} bytes with __slots__, {with_dict} bytes with __dict__')
+        self.assertLess(slotted, with_dict * 0.75)
+
+    def test_instruction_repr_and_pickle(self):
+        # block (local.get 1, i32.const 5, i32.add) end
+        _, instr = read_instructions(BinaryCursor(bytes([0x02, 0x40, 0x20, 1, 0x41, 5, 0x6A, 0x0B, 0x0B])))
+        block = pickle.loads(pickle.dumps(instr))[0]
+        self.assertEqual(block.resultype, [])
+        self.assertEqual(repr(block.instr[0]), "LocalGetInstruction: {'index': 1}")
+        self.assertEqual(repr(block.instr[1]), "I32Const: {'value': 5}")
+        self.assertEqual(block.instr[1]._debug_internal_index, 1)
@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.webassembly import WebAssembly
+from wapysm.execute.utils import WasmTrappedException
+from wapysm.execute.interpreter.invocation import wrap_function
+from wasm_builder import FUNCREF, I32, code, export, functype, section, simple_module, u32, vector
+
+# (i32, i32, i32) -> () functions taking operands of bulk instruction
+def bulk_op(*opcode: int) -> bytes:
+    return code(bytes([0x20, 0, 0x20, 1, 0x20, 2, *opcode, 0x0B]))
+
+BULK_MEMORY_WASM = simple_module(
+    [functype([I32, I32, I32], []), functype([], []), functype([], [I32])],
+    [
+        (0, bulk_op(0xFC, 0x08, 0, 0)),  # memory.init 0
+        (0, bulk_op(0xFC, 0x0A, 0, 0)),  # memory.copy
+        (0, bulk_op(0xFC, 0x0B, 0)),  # memory.fill
+        (1, code(bytes([0xFC, 0x09, 0, 0x0B]))),  # data.drop 0
+        (0, bulk_op(0xFC, 0x0C, 0, 0)),  # table.init 0 0
+        (0, bulk_op(0xFC, 0x0E, 0, 0)),  # table.copy 0 0
+        (1, code(bytes([0xFC, 0x0D, 0, 0x0B]))),  # elem.drop 0
+        (2, code(bytes([0x41, 1, 0x0B]))),
+        (2, code(bytes([0x41, 2, 0x0B]))),
+    ],
+    [
+        export('mem', 2, 0), export('tab', 1, 0),
+        export('init', 0, 0), export('copy', 0, 1), export('fill', 0, 2), export('drop', 0, 3),
+        export('table_init', 0, 4), export('table_copy', 0, 5), export('elem_drop', 0, 6),
+    ],
+    [
+        section(4, vector([bytes([FUNCREF, 0]) + u32(4)])),
+        section(5, vector([bytes([0, 1])])),
+        # passive segment of function 7 and 8
+        section(9, vector([bytes([1, 0]) + vector([u32(7), u32(8)])])),
+        section(12, u32(2)),
+        section(11, vector([
+            bytes([1]) + u32(5) + b'hello',
+            bytes([0, 0x41]) + u32(100) + bytes([0x0B]) + u32(3) + b'xyz',
+        ])),
+    ],
+)
+
+
+class TestBulkMemory(unittest.TestCase):
+    def setUp(self):
+        self.wasm = WebAssembly.instantiate(BULK_MEMORY_WASM, {})
+        self.mem = self.wasm.module.named_exports['mem']
+        self.tab = self.wasm.module.named_exports['tab']
+
+    def test_active_data(self):
+        self.assertEqual(self.mem.data[100:103], b'xyz')
+
+    def test_memory_init(self):
+        self.wasm.exports['init'](10, 1, 4)
+        self.assertEqual(self.mem.data[10:14], b'ello')
+        with self.assertRaises(WasmTrappedException):
+            self.wasm.exports['init'](10, 1, 5)
+
+    def test_memory_copy_overlap(self):
+        self.wasm.exports['init'](10, 0, 5)
+        self.wasm.exports['copy'](12, 10, 5)
+        self.assertEqual(self.mem.data[10:17], b'hehello')
+        self.wasm.exports['copy'](10, 12, 5)
+        self.assertEqual(self.mem.data[10:17], b'hellolo')
+
+    def test_memory_fill(self):
+        self.wasm.exports['fill'](5, 0x1AA, 3)
+        self.assertEqual(self.mem.data[4:9], b'\0\xaa\xaa\xaa\0')
+        with self.assertRaises(WasmTrappedException):
+            self.wasm.exports['fill'](65535, 0, 2)
+
+    def test_data_drop(self):
+        self.wasm.exports['drop']()
+        self.wasm.exports['init'](0, 0, 0)
+        with self.assertRaises(WasmTrappedException):
+            self.wasm.exports['init'](0, 0, 1)
+
+    def test_table_init_copy(self):
+        self.wasm.exports['table_init'](1, 0, 2)
+        self.wasm.exports['table_copy'](2, 1, 2)
+        results = [wrap_function(self.tab.elem[x], self.wasm.module.store)() for x in (1, 2, 3)]
+        self.assertEqual(results, [('i', 32, 1), ('i', 32, 1), ('i', 32, 2)])
+        self.assertNotIn(0, self.tab.elem)
+
+    def test_elem_drop(self):
+        self.wasm.exports['elem_drop']()
+        with self.assertRaises(WasmTrappedException):
+            self.wasm.exports['table_init'](0, 0, 1)
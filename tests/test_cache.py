@@ -0,0 +1,153 @@
+import mmap
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wapysm.cache
+from wapysm.cache import ModuleCache, ModuleDiskCache
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, simple_module, u32
+
+def add_module(n: int) -> bytes:
+    return simple_module(
+        [functype([I32], [I32])],
+        [(0, code(b'\x20\x00\x41' + u32(n) + b'\x6A\x0B'))],
+        [export('add', 0, 0)],
+    )
+
+class TestModuleDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.directory = self.tempdir.name
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def entries(self):
+        return sorted(x for x in os.listdir(self.directory))
+
+    def test_store_and_load(self):
+        wasm = add_module(3)
+        cache = ModuleDiskCache(self.directory)
+        key = cache.key(wasm)
+        self.assertIsNone(cache.get(key))
+        WebAssembly.compile(wasm, cache_dir=self.directory)
+        self.assertEqual(self.entries(), [f'{key}.pickle'])
+
+        parsed = cache.get(key)
+        self.assertIsNotNone(parsed)
+        instance = WebAssembly.instantiate(wasm, {}, cache_dir=self.directory)
+        self.assertEqual(instance.exports['add'](4), ('i', 32, 7))
+
+    def test_broken_entry(self):
+        wasm = add_module(5)
+        cache = ModuleDiskCache(self.directory)
+        with open(os.path.join(self.directory, f'{cache.key(wasm)}.pickle'), 'wb') as f:
+            f.write(b'broken')
+        self.assertIsNone(cache.get(cache.key(wasm)))
+        self.assertEqual(self.entries(), [])
+        instance = WebAssembly.instantiate(wasm, {}, cache_dir=self.directory)
+        self.assertEqual(instance.exports['add'](1), ('i', 32, 6))
+
+    def test_truncated_and_empty_entry(self):
+        wasm = add_module(6)
+        cache = ModuleDiskCache(self.directory)
+        key = cache.key(wasm)
+        cache.compile(wasm)
+        path = os.path.join(self.directory, f'{key}.pickle')
+        with open(path, 'rb') as f:
+            pickled = f.read()
+        for broken in (pickled[:len(pickled) // 2], b''):
+            with open(path, 'wb') as f:
+                f.write(broken)
+            self.assertIsNone(cache.get(key))
+            self.assertEqual(self.entries(), [])
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(WebAssembly.instantiate(wasm, {}, cache_dir=self.directory).exports['add'](1), ('i', 32, 7))
+        self.assertEqual(self.entries(), [f'{key}.pickle'])
+
+    def test_lru_eviction(self):
+        cache = ModuleDiskCache(self.directory)
+        wasms = [add_module(n) for n in range(3)]
+        for n, wasm in enumerate(wasms):
+            cache.compile(wasm)
+            path = os.path.join(self.directory, f'{cache.key(wasm)}.pickle')
+            os.utime(path, (n, n))
+        size = os.path.getsize(path)
+        # use the oldest one, then make room for two entries
+        cache.get(cache.key(wasms[0]))
+        cache.max_bytes = size * 2
+        cache.evict()
+        self.assertEqual(self.entries(), sorted(f'{cache.key(w)}.pickle' for w in (wasms[0], wasms[2])))
+
+    def test_concurrent_writers(self):
+        wasm = add_module(9)
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda _: ModuleDiskCache(self.directory).compile(wasm), range(8)))
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.entries(), [f'{ModuleDiskCache.key(wasm)}.pickle'])
+
+class TestModuleCache(unittest.TestCase):
+    def test_shared(self):
+        cache = ModuleCache()
+        wasm = add_module(1)
+        parsed = WebAssembly.compile(wasm, module_cache=cache)
+        self.assertIs(cache.compile(bytes(wasm)), parsed)
+        a = WebAssembly.instantiate(wasm, {}, module_cache=cache)
+        b = WebAssembly.instantiate(wasm, {}, module_cache=cache)
+        self.assertIs(a.raw_module, b.raw_module)
+        self.assertEqual(a.exports['add'](1), ('i', 32, 2))
+
+    def test_entry_owns_binary(self):
+        cache = ModuleCache()
+        wasm = add_module(3)
+        buf = bytearray(wasm)
+        cache.compile(memoryview(buf).toreadonly())
+        buf[:] = bytes(len(buf))
+        self.assertEqual(WebAssembly.instantiate(wasm, {}, module_cache=cache).exports['add'](1), ('i', 32, 4))
+
+        with tempfile.TemporaryFile() as f:
+            f.write(add_module(4))
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                cache.compile(mm)
+        self.assertEqual(WebAssembly.instantiate(add_module(4), {}, module_cache=cache).exports['add'](1), ('i', 32, 5))
+
+    def test_single_flight(self):
+        original = wapysm.cache.parse_binary_wasm_module
+        calls = []
+
+        def slow_parse(source):
+            calls.append(threading.get_ident())
+            time.sleep(0.1)
+            return original(source)
+
+        wapysm.cache.parse_binary_wasm_module = slow_parse
+        try:
+            cache = ModuleCache()
+            with ThreadPoolExecutor(4) as executor:
+                results = list(executor.map(lambda _: cache.compile(add_module(2)), range(4)))
+        finally:
+            wapysm.cache.parse_binary_wasm_module = original
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(x is results[0] for x in results))
+
+    def test_eviction(self):
+        wasms = [add_module(n) for n in range(3)]
+        cache = ModuleCache(max_bytes=len(wasms[0]) * 2)
+        first = cache.compile(wasms[0])
+        cache.compile(wasms[1])
+        cache.compile(wasms[0])  # now wasms[1] is least recently used
+        cache.compile(wasms[2])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.total_bytes, len(wasms[0]) * 2)
+        self.assertIs(cache.compile(wasms[0]), first)
+        self.assertEqual(len(cache), 2)
+
+if __name__ == '__main__':
+    unittest.main()
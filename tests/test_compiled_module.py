@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WasmCompiledModule
+from wapysm.execute.initialization import compile_wasm_module
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, section, simple_module, u32, vector
+
+# get() and set(x) on i32 at address 0, which is initialized to 7 by data segment
+MEMORY_WASM = simple_module(
+    [functype([], [I32]), functype([I32], [])],
+    [
+        (0, code(b'\x41\x00\x28\x02\x00\x0B')),
+        (1, code(b'\x41\x00\x20\x00\x36\x02\x00\x0B')),
+    ],
+    [export('get', 0, 0), export('set', 0, 1)],
+    [
+        section(5, vector([b'\x00' + u32(1)])),
+        section(11, vector([b'\x00\x41\x00\x0B' + u32(4) + b'\x07\x00\x00\x00'])),
+    ],
+)
+
+class TestCompiledModule(unittest.TestCase):
+    def test_flattened(self):
+        compiled = WebAssembly.compile(MEMORY_WASM)
+        self.assertIsInstance(compiled, WasmCompiledModule)
+        self.assertIs(compile_wasm_module(compiled), compiled)
+        self.assertEqual(compiled.funcs, [0, 1])
+        self.assertEqual([x.name for x in compiled.exports], ['get', 'set'])
+        self.assertEqual(len(compiled.mems), 1)
+        self.assertEqual(compiled.datas[0].init, b'\x07\x00\x00\x00')
+        self.assertIsNone(compiled.start)
+
+    def test_instances_are_independent(self):
+        compiled = WebAssembly.compile(MEMORY_WASM)
+        a = WebAssembly.instantiate_parsed(compiled, {})
+        b = WebAssembly.instantiate_parsed(compiled, {})
+        a.exports['set'](42)
+        self.assertEqual(a.exports['get'](), ('i', 32, 42))
+        self.assertEqual(b.exports['get'](), ('i', 32, 7))
+        # segments of compiled module are not dropped by instantiation
+        self.assertEqual(compiled.datas[0].init, b'\x07\x00\x00\x00')
+
+    def test_shared_types_and_offsets(self):
+        compiled = WebAssembly.compile(MEMORY_WASM)
+        self.assertEqual(compiled.data_offsets, [0])
+        self.assertEqual([x.argument_types for x in compiled.functypes], [[], ['i32']])
+        a = WebAssembly.instantiate_parsed(compiled, {})
+        b = WebAssembly.instantiate_parsed(compiled, {})
+        self.assertIsNot(a.module.types, b.module.types)
+        for typeidx in (0, 1):
+            self.assertIs(a.module.types[typeidx], compiled.functypes[typeidx])
+            self.assertIs(b.module.types[typeidx], compiled.functypes[typeidx])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.webassembly import WebAssembly
+from wapysm.execute.utils import wasm_iextend_signed, wasm_trunc_sat_signed, wasm_trunc_sat_unsigned
+from wasm_builder import F64, I32, I64, code, export, functype, simple_module
+
+CONVERSIONS_WASM = simple_module(
+    [functype([I32], [I32]), functype([I64], [I64]), functype([F64], [I32])],
+    [
+        (0, code(bytes([0x20, 0, 0xC0, 0x0B]))),  # i32.extend8_s
+        (0, code(bytes([0x20, 0, 0xC1, 0x0B]))),  # i32.extend16_s
+        (1, code(bytes([0x20, 0, 0xC4, 0x0B]))),  # i64.extend32_s
+        (2, code(bytes([0x20, 0, 0xFC, 0x02, 0x0B]))),  # i32.trunc_sat_f64_s
+        (2, code(bytes([0x20, 0, 0xFC, 0x03, 0x0B]))),  # i32.trunc_sat_f64_u
+    ],
+    [
+        export('extend8', 0, 0), export('extend16', 0, 1), export('extend32', 0, 2),
+        export('trunc_sat_s', 0, 3), export('trunc_sat_u', 0, 4),
+    ],
+)
+
+class TestSignExtension(unittest.TestCase):
+    def test_iextend_signed(self):
+        self.assertEqual(wasm_iextend_signed(0x7F, 8), 127)
+        self.assertEqual(wasm_iextend_signed(0x80, 8), -128)
+        self.assertEqual(wasm_iextend_signed(0x12345678, 16), 0x5678)
+        self.assertEqual(wasm_iextend_signed(0x1234ABCD, 16), -0x5433)
+        self.assertEqual(wasm_iextend_signed(0xFFFFFFFF, 32), -1)
+
+    def test_extend_instructions(self):
+        wasm = WebAssembly.instantiate(CONVERSIONS_WASM, {})
+        self.assertEqual(wasm.exports['extend8'](0x180), ('i', 32, 0xFFFFFF80))
+        self.assertEqual(wasm.exports['extend16'](0x7FFF), ('i', 32, 0x7FFF))
+        self.assertEqual(wasm.exports['extend32'](('i', 64, 0x80000000)), ('i', 64, 0xFFFFFFFF80000000))
+
+
+class TestSaturatingTruncation(unittest.TestCase):
+    def test_trunc_sat(self):
+        self.assertEqual(wasm_trunc_sat_signed(float('nan'), 32), 0)
+        self.assertEqual(wasm_trunc_sat_signed(float('-inf'), 32), -2**31)
+        self.assertEqual(wasm_trunc_sat_signed(1e100, 64), 2**63 - 1)
+        self.assertEqual(wasm_trunc_sat_signed(-3.9, 32), -3)
+        self.assertEqual(wasm_trunc_sat_unsigned(-3.9, 32), 0)
+        self.assertEqual(wasm_trunc_sat_unsigned(float('inf'), 32), 2**32 - 1)
+        self.assertEqual(wasm_trunc_sat_unsigned(4294967296.5, 32), 2**32 - 1)
+
+    def test_trunc_sat_instructions(self):
+        wasm = WebAssembly.instantiate(CONVERSIONS_WASM, {})
+        self.assertEqual(wasm.exports['trunc_sat_s'](('f', 64, -1e10)), ('i', 32, 0x80000000))
+        self.assertEqual(wasm.exports['trunc_sat_s'](('f', 64, -2.5)), ('i', 32, 0xFFFFFFFE))
+        self.assertEqual(wasm.exports['trunc_sat_u'](('f', 64, 1e10)), ('i', 32, 0xFFFFFFFF))
+        self.assertEqual(wasm.exports['trunc_sat_u'](('f', 64, float('nan'))), ('i', 32, 0))
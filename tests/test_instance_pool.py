@@ -0,0 +1,110 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WASM_PAGE_SIZE
+from wapysm.execute.pool import WasmInstancePool
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, section, simple_module, u32, vector
+
+# get(addr) and set(addr, x) on i32, get_global() and set_global(x) on mutable global, store8(addr, x) and store16(addr, x)
+POOL_WASM = simple_module(
+    [functype([I32], [I32]), functype([I32, I32], []), functype([], [I32]), functype([I32], [])],
+    [
+        (0, code(b'\x20\x00\x28\x02\x00\x0B')),
+        (1, code(b'\x20\x00\x20\x01\x36\x02\x00\x0B')),
+        (2, code(b'\x23\x00\x0B')),
+        (3, code(b'\x20\x00\x24\x00\x0B')),
+        (1, code(b'\x20\x00\x20\x01\x3A\x00\x00\x0B')),
+        (1, code(b'\x20\x00\x20\x01\x3B\x01\x00\x0B')),
+    ],
+    [
+        export('get', 0, 0), export('set', 0, 1), export('get_global', 0, 2), export('set_global', 0, 3),
+        export('store8', 0, 4), export('store16', 0, 5),
+    ],
+    [
+        section(5, vector([b'\x00' + u32(4)])),
+        section(6, vector([bytes([I32, 1, 0x41, 3, 0x0B])])),
+        section(11, vector([b'\x00\x41\x00\x0B' + u32(4) + b'\x07\x00\x00\x00'])),
+    ],
+)
+
+# get() on i32 at address 0 and get_global(), set(x) on both, and start function setting them to 21 and 5
+START_WASM = simple_module(
+    [functype([], [I32]), functype([I32], []), functype([], [])],
+    [
+        (0, code(b'\x41\x00\x28\x02\x00\x0B')),
+        (0, code(b'\x23\x00\x0B')),
+        (1, code(b'\x41\x00\x20\x00\x36\x02\x00\x20\x00\x24\x00\x0B')),
+        (2, code(b'\x41\x00\x41\x15\x36\x02\x00\x41\x05\x24\x00\x0B')),
+    ],
+    [export('get', 0, 0), export('get_global', 0, 1), export('set', 0, 2)],
+    [
+        section(5, vector([b'\x00' + u32(1)])),
+        section(6, vector([bytes([I32, 1, 0x41, 0, 0x0B])])),
+        section(8, u32(3)),
+    ],
+)
+
+class TestInstancePool(unittest.TestCase):
+    def test_reset_dirty_pages(self):
+        compiled = WebAssembly.compile(POOL_WASM)
+        pool = WasmInstancePool.from_module(compiled, {})
+        with pool.instance() as module:
+            wasm = WebAssembly(module, compiled)
+            self.assertEqual(wasm.exports['get'](0), ('i', 32, 7))
+            wasm.exports['set'](0, 42)
+            wasm.exports['set'](2 * WASM_PAGE_SIZE + 8, 5)
+            wasm.exports['set_global'](9)
+            mem = module.store.mems[module.memaddrs[0]]
+            self.assertEqual(mem.grow(1), 4)
+            self.assertEqual(mem.dirty, {0, 2})
+        self.assertEqual(pool.idle_count(), 1)
+
+        with pool.instance() as reused:
+            self.assertIs(reused, module)
+            wasm = WebAssembly(reused, compiled)
+            self.assertEqual(wasm.exports['get'](0), ('i', 32, 7))
+            self.assertEqual(wasm.exports['get'](2 * WASM_PAGE_SIZE + 8), ('i', 32, 0))
+            self.assertEqual(wasm.exports['get_global'](), ('i', 32, 3))
+            self.assertEqual(len(mem.data), 4 * WASM_PAGE_SIZE)
+            self.assertEqual(mem.dirty, set())
+
+    def test_narrow_store(self):
+        compiled = WebAssembly.compile(POOL_WASM)
+        pool = WasmInstancePool.from_module(compiled, {})
+        with pool.instance() as module:
+            wasm = WebAssembly(module, compiled)
+            mem = module.store.mems[module.memaddrs[0]]
+            wasm.exports['set'](WASM_PAGE_SIZE - 4, 0x44332211)
+            wasm.exports['store8'](WASM_PAGE_SIZE - 3, 0xFFAB)
+            wasm.exports['store16'](WASM_PAGE_SIZE - 2, 0x12345)
+            self.assertEqual(mem.read(WASM_PAGE_SIZE - 4, 8), b'\x11\xAB\x45\x23\x00\x00\x00\x00')
+            self.assertEqual(wasm.exports['get'](WASM_PAGE_SIZE - 4), ('i', 32, 0x2345AB11))
+            self.assertEqual(mem.dirty, {0})
+
+    def test_start_function(self):
+        compiled = WebAssembly.compile(START_WASM)
+        pool = WasmInstancePool.from_module(compiled, {})
+        with pool.instance() as module:
+            wasm = WebAssembly(module, compiled)
+            self.assertEqual(wasm.exports['get'](), ('i', 32, 21))
+            self.assertEqual(wasm.exports['get_global'](), ('i', 32, 5))
+            wasm.exports['set'](1)
+        with pool.instance() as module:
+            wasm = WebAssembly(module, compiled)
+            self.assertEqual(wasm.exports['get'](), ('i', 32, 21))
+            self.assertEqual(wasm.exports['get_global'](), ('i', 32, 5))
+
+    def test_max_idle(self):
+        pool = WasmInstancePool.from_module(WebAssembly.compile(POOL_WASM), {}, max_idle=1)
+        a = pool.acquire()
+        b = pool.acquire()
+        self.assertIsNot(a, b)
+        pool.release(a)
+        pool.release(b)
+        self.assertEqual(pool.idle_count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import gc
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WasmCodeSection
+from wapysm.parser.binary.intern import interned_counts
+from wapysm.parser.binary.module import parse_binary_wasm_module
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, simple_module
+
+def shared_module(own_body: bytes) -> bytes:
+    return simple_module(
+        [functype([I32], [I32])],
+        [(0, code(b'\x20\x00\x41\x2A\x6A\x0B')), (0, code(own_body))],  # x + 42, and module specific function
+        [export('shared', 0, 0), export('own', 0, 1)],
+    )
+
+def code_functions(parsed):
+    return [x.code for s in parsed.sections if s.section_id == 10 for x in s.section_content if isinstance(x, WasmCodeSection)]
+
+class TestIntern(unittest.TestCase):
+    def test_shared_between_modules(self):
+        a = parse_binary_wasm_module(shared_module(b'\x20\x00\x0B'))
+        b = parse_binary_wasm_module(shared_module(b'\x41\x00\x0B'), lazy=False)
+        a_shared, a_own = code_functions(a)
+        b_shared, b_own = code_functions(b)
+        self.assertIs(a_shared.expr, b_shared.expr)
+        self.assertIsNot(a_own.expr, b_own.expr)
+        self.assertIs(a.sections[0].section_content[0], b.sections[0].section_content[0])
+
+        wasm_a = WebAssembly.instantiate(shared_module(b'\x20\x00\x0B'), {})
+        wasm_b = WebAssembly.instantiate(shared_module(b'\x41\x00\x0B'), {})
+        self.assertEqual(wasm_a.exports['shared'](1), ('i', 32, 43))
+        self.assertEqual(wasm_b.exports['shared'](2), ('i', 32, 44))
+        self.assertEqual(wasm_a.exports['own'](5), ('i', 32, 5))
+        self.assertEqual(wasm_b.exports['own'](5), ('i', 32, 0))
+
+    def test_released_with_modules(self):
+        gc.collect()
+        before = interned_counts()
+        parsed = parse_binary_wasm_module(shared_module(b'\x41\x07\x0B'), lazy=False)
+        self.assertEqual(interned_counts()[0], before[0] + 2)
+        del parsed
+        gc.collect()
+        self.assertEqual(interned_counts(), before)
+
+if __name__ == '__main__':
+    unittest.main()
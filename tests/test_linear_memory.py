@@ -0,0 +1,208 @@
+import hashlib
+import io
+import os
+import struct
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WASM_PAGE_SIZE, WasmMemoryInstance
+from wapysm.execute.utils import WasmTrappedException
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, name, s32, section, simple_module, u32, vector
+
+# get(addr) and set(addr, x) on i32 of memory imported as env.mem
+IMPORTED_MEMORY_WASM = simple_module(
+    [functype([I32], [I32]), functype([I32, I32], [])],
+    [
+        (0, code(b'\x20\x00\x28\x02\x00\x0B')),
+        (1, code(b'\x20\x00\x20\x01\x36\x02\x00\x0B')),
+    ],
+    [export('get', 0, 0), export('set', 0, 1)],
+    [section(2, vector([name('env') + name('mem') + b'\x02\x00' + u32(2)]))],
+)
+
+# size(), grow(n) and set(addr, x) on memory of 1 to 3 pages, with data segment at the end of the first page
+GROW_WASM = simple_module(
+    [functype([], [I32]), functype([I32], [I32]), functype([I32, I32], [])],
+    [
+        (0, code(b'\x3F\x00\x0B')),
+        (1, code(b'\x20\x00\x40\x00\x0B')),
+        (2, code(b'\x20\x00\x20\x01\x36\x02\x00\x0B')),
+    ],
+    [export('size', 0, 0), export('grow', 0, 1), export('set', 0, 2)],
+    [
+        section(5, vector([b'\x01' + u32(1) + u32(3)])),
+        section(11, vector([b'\x00\x41' + s32(WASM_PAGE_SIZE - 4) + b'\x0B' + u32(4) + b'\x01\x02\x03\x04'])),
+    ],
+)
+
+class TestLinearMemory(unittest.TestCase):
+    def test_size_and_grow(self):
+        wasm = WebAssembly.instantiate(GROW_WASM, {})
+        mem = wasm.module.store.mems[wasm.module.memaddrs[0]]
+        self.assertEqual(len(mem), WASM_PAGE_SIZE)
+        self.assertEqual(mem.read(WASM_PAGE_SIZE - 4, 4), b'\x01\x02\x03\x04')
+        self.assertEqual(wasm.exports['size'](), ('i', 32, 1))
+        with self.assertRaises(WasmTrappedException):
+            wasm.exports['set'](WASM_PAGE_SIZE - 2, 1)
+
+        self.assertEqual(wasm.exports['grow'](1), ('i', 32, 1))
+        self.assertEqual(wasm.exports['size'](), ('i', 32, 2))
+        wasm.exports['set'](WASM_PAGE_SIZE - 2, 0x05060708)
+        self.assertEqual(mem.read(WASM_PAGE_SIZE - 2, 4), b'\x08\x07\x06\x05')
+        self.assertEqual(wasm.exports['grow'](2), ('i', 32, -1))
+        self.assertEqual(wasm.exports['size'](), ('i', 32, 2))
+
+        # data segment beyond the first page
+        with self.assertRaises(WasmTrappedException):
+            WebAssembly.instantiate(GROW_WASM.replace(s32(WASM_PAGE_SIZE - 4), s32(WASM_PAGE_SIZE - 3)), {})
+
+    def check_grow_and_shrink(self, mem: WasmMemoryInstance):
+        mem.write(10, b'abc')
+        self.assertEqual(mem.grow(2), 1)
+        self.assertEqual(len(mem.data), 3 * WASM_PAGE_SIZE)
+        self.assertEqual(mem.read(10, 3), b'abc')
+        mem.write(2 * WASM_PAGE_SIZE, b'xyz')
+        self.assertEqual(mem.grow(2), -1)
+        self.assertEqual(mem.grow(1), 3)
+
+        mem.resize(WASM_PAGE_SIZE)
+        self.assertEqual(mem.grow(2), 1)
+        # pages dropped by resize are zero when grown again
+        self.assertEqual(mem.read(2 * WASM_PAGE_SIZE, 3), b'\0\0\0')
+        self.assertEqual(mem.read(10, 3), b'abc')
+
+        mem.discard(0, WASM_PAGE_SIZE)
+        self.assertEqual(mem.read(10, 3), b'\0\0\0')
+        mem.load(b'\0' * WASM_PAGE_SIZE + b'def')
+        self.assertEqual(len(mem.data), WASM_PAGE_SIZE + 3)
+        self.assertEqual(mem.read(WASM_PAGE_SIZE, 3), b'def')
+
+    def test_mmap(self):
+        mem = WasmMemoryInstance(1, 4)
+        if mem._mmap is None:
+            self.skipTest('mmap backend is not available')
+        self.assertIsInstance(mem.data, memoryview)
+        reserved = mem._mmap
+        self.check_grow_and_shrink(mem)
+        # grown in place within reserved mapping
+        self.assertIs(mem._mmap, reserved)
+
+    def test_bytearray(self):
+        mem = WasmMemoryInstance(1, 4, use_mmap=False)
+        self.assertIsInstance(mem.data, bytearray)
+        self.check_grow_and_shrink(mem)
+
+    def test_without_maximum(self):
+        mem = WasmMemoryInstance(0, None)
+        self.assertEqual(len(mem.data), 0)
+        self.assertEqual(mem.grow(16), 0)
+        mem.write(16 * WASM_PAGE_SIZE - 1, b'\xff')
+        self.assertEqual(mem[16 * WASM_PAGE_SIZE - 1], 0xff)
+
+    def check_view(self, mem: WasmMemoryInstance):
+        grown = []
+        mem.grow_listeners.append(grown.append)
+        ints = mem.view('<i4', 8, 4)
+        self.assertEqual(ints.format, 'i')
+        ints[1] = -5
+        self.assertEqual(mem.read(12, 4), struct.pack('<i', -5))
+        mem.write(16, struct.pack('<i', 7))
+        self.assertEqual(ints.tolist(), [0, -5, 7, 0])
+        self.assertEqual(hashlib.sha256(mem.view('B', 8, 16)).digest(), hashlib.sha256(mem.read(8, 16)).digest())
+        self.assertTrue(mem.view('<f8', 0, 1, readonly=True).readonly)
+        with self.assertRaises(IndexError):
+            mem.view('<i4', WASM_PAGE_SIZE - 8, 3)
+        with self.assertRaises(ValueError):
+            mem.view('>i4', 0, 1)
+
+        self.assertEqual(mem.grow(1), 1)
+        self.assertEqual(grown, [mem])
+        return ints
+
+    def test_view_mmap(self):
+        mem = WasmMemoryInstance(1, 4)
+        if mem._mmap is None:
+            self.skipTest('mmap backend is not available')
+        ints = self.check_view(mem)
+        # still views the same memory after grow
+        mem.write(8, struct.pack('<i', 3))
+        self.assertEqual(ints[0], 3)
+
+    def test_view_bytearray(self):
+        mem = WasmMemoryInstance(1, 4, use_mmap=False)
+        ints = self.check_view(mem)
+        # grow replaced data exported by the view
+        self.assertEqual(len(mem.data), 2 * WASM_PAGE_SIZE)
+        self.assertEqual(mem.read(12, 4), struct.pack('<i', -5))
+        ints.release()
+
+    def test_view_dirty(self):
+        mem = WasmMemoryInstance(3, None)
+        mem.dirty = set()
+        mem.view('B', WASM_PAGE_SIZE - 1, 2, readonly=True)
+        self.assertEqual(mem.dirty, set())
+        mem.view('B', WASM_PAGE_SIZE - 1, 2)
+        self.assertEqual(mem.dirty, {0, 1})
+
+    def test_numpy_array(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        mem = WasmMemoryInstance(1, None)
+        array = mem.array('<f8', 16, 4)
+        array[:] = numpy.arange(4)
+        self.assertEqual(mem.read(24, 8), struct.pack('<d', 1.0))
+
+    def check_map_file(self, mem: WasmMemoryInstance):
+        contents = bytes(range(256)) * 1024 + b'tail'
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'input.bin')
+            with open(path, 'wb') as f:
+                f.write(contents)
+            mem.write(WASM_PAGE_SIZE + len(contents), b'\xff' * 8)
+            self.assertEqual(mem.map_file(path, WASM_PAGE_SIZE, len(contents) + 8), len(contents))
+        self.assertEqual(mem.read(WASM_PAGE_SIZE, len(contents)), contents)
+        # beyond the end of file
+        self.assertEqual(mem.read(WASM_PAGE_SIZE + len(contents), 8), b'\0' * 8)
+        with self.assertRaises(WasmTrappedException):
+            mem.write(WASM_PAGE_SIZE + 100, b'x')
+        with self.assertRaises(WasmTrappedException):
+            mem.view('B', WASM_PAGE_SIZE, 1)
+        mem.write(WASM_PAGE_SIZE - 1, b'x')
+
+        mem.map_file(io.BytesIO(b'copy on write'), 0, readonly=False)
+        mem.write(0, b'COPY')
+        self.assertEqual(mem.read(0, 13), b'COPY on write')
+
+        mem.unmap_file(WASM_PAGE_SIZE, len(contents))
+        self.assertEqual(mem.read(WASM_PAGE_SIZE, 4), b'\0' * 4)
+        mem.write(WASM_PAGE_SIZE, b'x')
+        self.assertEqual(mem.mapped_ranges, [(0, 13)])
+
+    def test_map_file_mmap(self):
+        mem = WasmMemoryInstance(8, None)
+        if mem._mmap is None:
+            self.skipTest('mmap backend is not available')
+        self.check_map_file(mem)
+
+    def test_map_file_bytearray(self):
+        self.check_map_file(WasmMemoryInstance(8, None, use_mmap=False))
+
+    def test_map_file_imported(self):
+        mem = WasmMemoryInstance(2, None)
+        wasm = WebAssembly.instantiate(IMPORTED_MEMORY_WASM, {'env': {'mem': mem}})
+        with tempfile.TemporaryFile() as f:
+            f.write(struct.pack('<i', 1234) * (WASM_PAGE_SIZE // 4))
+            f.flush()
+            mem.map_file(f.fileno(), WASM_PAGE_SIZE)
+        self.assertEqual(wasm.exports['get'](WASM_PAGE_SIZE + 8), ('i', 32, 1234))
+        with self.assertRaises(WasmTrappedException):
+            wasm.exports['set'](WASM_PAGE_SIZE, 1)
+        wasm.exports['set'](0, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.webassembly import WebAssembly
+from wapysm.parser.binary.byteencode import read_blocktype, write_blocktype
+from wasm_builder import I32, code, export, functype, simple_module
+
+MULTI_VALUE_WASM = simple_module(
+    [
+        functype([I32, I32], [I32, I32]),
+        functype([I32], [I32, I32]),
+        functype([I32], [I32]),
+        functype([], [I32, I32]),
+    ],
+    [
+        (0, code(bytes([0x20, 1, 0x20, 0, 0x0B]))),
+        # block (type 1) consumes x and leaves x + 1 and x
+        (1, code(bytes([0x20, 0, 0x02, 1, 0x41, 1, 0x6A, 0x20, 0, 0x0B, 0x0B]))),
+        # if (type 2) with 10 as parameter
+        (2, code(bytes([0x41, 10, 0x20, 0, 0x04, 2, 0x41, 1, 0x6A, 0x05, 0x41, 1, 0x6B, 0x0B, 0x0B]))),
+        # return inside block
+        (3, code(bytes([0x02, 0x40, 0x41, 7, 0x41, 8, 0x0F, 0x0B, 0x41, 0, 0x41, 0, 0x0B]))),
+    ],
+    [export('swap', 0, 0), export('block_params', 0, 1), export('if_params', 0, 2), export('return_in_block', 0, 3)],
+)
+
+class TestMultiValue(unittest.TestCase):
+    def test_blocktype(self):
+        for blocktype in ([], ['i32'], 3, 624485):
+            stream = io.BytesIO()
+            write_blocktype(stream, blocktype)
+            stream.seek(0)
+            self.assertEqual(read_blocktype(stream), blocktype)
+
+    def test_multiple_results(self):
+        wasm = WebAssembly.instantiate(MULTI_VALUE_WASM, {})
+        self.assertEqual(wasm.exports['swap'](1, 2), [('i', 32, 2), ('i', 32, 1)])
+        self.assertEqual(wasm.exports['return_in_block'](), [('i', 32, 7), ('i', 32, 8)])
+
+    def test_block_parameters(self):
+        wasm = WebAssembly.instantiate(MULTI_VALUE_WASM, {})
+        self.assertEqual(wasm.exports['block_params'](5), [('i', 32, 6), ('i', 32, 5)])
+        self.assertEqual(wasm.exports['if_params'](1), ('i', 32, 11))
+        self.assertEqual(wasm.exports['if_params'](0), ('i', 32, 9))
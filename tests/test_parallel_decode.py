@@ -0,0 +1,137 @@
+import gc
+import io
+import threading
+import os
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WasmCodeSection
+import wapysm.parser.binary.module
+from wapysm.parser.binary.module import parse_binary_wasm_module
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, simple_module, u32
+
+# f{i}(x) = x + i
+FUNCS_WASM = simple_module(
+    [functype([I32], [I32])],
+    [(0, code(b'\x20\x00\x41' + u32(i) + b'\x6A\x0B')) for i in range(10)],
+    [export(f'f{i}', 0, i) for i in range(10)],
+)
+
+class TestParallelDecode(unittest.TestCase):
+    def check(self, executor):
+        parsed = WebAssembly.compile(FUNCS_WASM, executor)
+        codes = [x.code for s in parsed.sections if s.section_id == 10 for x in s.section_content if isinstance(x, WasmCodeSection)]
+        self.assertEqual(len(codes), 10)
+        for i, wcode in enumerate(codes):
+            self.assertIsNone(wcode.body)
+            self.assertEqual(wcode.expr[1].value, i)
+
+    def test_thread_pool(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.check(executor)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            self.check(executor)
+
+    def test_pipelined_stream(self):
+        stream = io.BytesIO(FUNCS_WASM)
+        submitted_at = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted_at.append(stream.tell())
+                return super().submit(fn, *args, **kwargs)
+
+        with RecordingExecutor(2) as executor:
+            parsed = parse_binary_wasm_module(stream, executor=executor, chunk_size=4)
+            wasm = WebAssembly.instantiate_streaming(io.BytesIO(FUNCS_WASM), {}, executor)
+        # 10 bodies in chunks of 4 with first ones submitted before the end of stream,
+        # and none for the second module, whose bodies are interned by the first one
+        self.assertEqual(len(submitted_at), 3)
+        self.assertLess(submitted_at[0], len(FUNCS_WASM))
+        codes = [x.code for s in parsed.sections if s.section_id == 10 for x in s.section_content if isinstance(x, WasmCodeSection)]
+        self.assertEqual([c.expr[1].value for c in codes], list(range(10)))
+        self.assertEqual(wasm.exports['f7'](3), ('i', 32, 10))
+
+    def test_interned_bodies_not_submitted(self):
+        # 6 identical bodies, which no other test uses
+        wasm = simple_module(
+            [functype([I32], [I32])],
+            [(0, code(b'\x20\x00\x41' + u32(12345) + b'\x6B\x0B')) for _ in range(6)],
+            [export('f', 0, 5)],
+        )
+        submitted = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.extend(args[0])
+                return super().submit(fn, *args, **kwargs)
+
+        with RecordingExecutor(2) as executor:
+            first = parse_binary_wasm_module(wasm, executor=executor, chunk_size=2)
+            self.assertEqual(len(submitted), 1)
+            parse_binary_wasm_module(io.BytesIO(wasm), executor=executor, chunk_size=2)
+            parse_binary_wasm_module(wasm, executor=executor)
+            self.assertEqual(len(submitted), 1)
+        codes = [x.code for s in first.sections if s.section_id == 10 for x in s.section_content]
+        self.assertTrue(all(c.expr is codes[0].expr for c in codes))
+
+    def test_gc_enabled_while_reading_stream(self):
+        enabled = []
+
+        class RecordingStream(io.BytesIO):
+            def read(self, size=-1):
+                enabled.append(gc.isenabled())
+                return super().read(size)
+
+        with ThreadPoolExecutor(2) as executor:
+            parse_binary_wasm_module(RecordingStream(FUNCS_WASM), executor=executor, chunk_size=4, pause_gc=True)
+            parse_binary_wasm_module(RecordingStream(FUNCS_WASM), section_ids={10}, pause_gc=True)
+        self.assertTrue(enabled)
+        self.assertTrue(all(enabled))
+        self.assertTrue(gc.isenabled())
+
+    def test_gc_pause_is_opt_in(self):
+        original = wapysm.parser.binary.module.parse_binary_wasm_sections
+        enabled = []
+
+        def recording_parse(*args):
+            enabled.append(gc.isenabled())
+            return original(*args)
+
+        wapysm.parser.binary.module.parse_binary_wasm_sections = recording_parse
+        try:
+            parse_binary_wasm_module(FUNCS_WASM, lazy=False)
+            parse_binary_wasm_module(FUNCS_WASM, lazy=False, pause_gc=True)
+        finally:
+            wapysm.parser.binary.module.parse_binary_wasm_sections = original
+        self.assertEqual(enabled, [True, False])
+        self.assertTrue(gc.isenabled())
+
+    def test_overlapping_gc_pauses(self):
+        inner_started = threading.Event()
+        outer_left = threading.Event()
+        enabled = []
+
+        def inner():
+            with wapysm.parser.binary.module._gc_paused(True):
+                inner_started.set()
+                outer_left.wait(10)
+                # the other pause has ended, but this one has not
+                enabled.append(gc.isenabled())
+
+        thread = threading.Thread(target=inner)
+        with wapysm.parser.binary.module._gc_paused(True):
+            thread.start()
+            inner_started.wait(10)
+        outer_left.set()
+        thread.join()
+        self.assertEqual(enabled, [False])
+        self.assertTrue(gc.isenabled())
+
+if __name__ == '__main__':
+    unittest.main()
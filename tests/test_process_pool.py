@@ -0,0 +1,131 @@
+import os
+import pickle
+import signal
+import sys
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.utils import WasmTrappedException
+from wapysm.opcode import Unreachable
+from wapysm.process_pool import WasmPreforkPool, WasmProcessPool
+from wasm_builder import I32, code, export, functype, section, simple_module, u32, vector
+
+# add(a, b), fail() reaching unreachable, and get() and set(x) on i32 at address 0 initialized to 7
+POOL_WASM = simple_module(
+    [functype([I32, I32], [I32]), functype([], []), functype([], [I32]), functype([I32], [])],
+    [
+        (0, code(b'\x20\x00\x20\x01\x6A\x0B')),
+        (1, code(b'\x00\x0B')),
+        (2, code(b'\x41\x00\x28\x02\x00\x0B')),
+        (3, code(b'\x41\x00\x20\x00\x36\x02\x00\x0B')),
+    ],
+    [export('add', 0, 0), export('fail', 0, 1), export('get', 0, 2), export('set', 0, 3)],
+    [
+        section(5, vector([b'\x00' + u32(1)])),
+        section(11, vector([b'\x00\x41\x00\x0B' + u32(4) + b'\x07\x00\x00\x00'])),
+    ],
+)
+
+# get() and set(x) on i32 at address 0, which start function sets to 21
+START_WASM = simple_module(
+    [functype([], [I32]), functype([I32], []), functype([], [])],
+    [
+        (0, code(b'\x41\x00\x28\x02\x00\x0B')),
+        (1, code(b'\x41\x00\x20\x00\x36\x02\x00\x0B')),
+        (2, code(b'\x41\x00\x41\x15\x36\x02\x00\x0B')),
+    ],
+    [export('get', 0, 0), export('set', 0, 1)],
+    [section(5, vector([b'\x00' + u32(1)])), section(8, u32(2))],
+)
+
+class TestProcessPool(unittest.TestCase):
+    def test_trap_pickle(self):
+        e = WasmTrappedException('trapped: unreachable', Unreachable(), ('i', 32, 1))
+        e.wasm_stacktrace.append('in fail')
+        e.update_message()
+        copied = pickle.loads(pickle.dumps(e))
+        self.assertEqual(str(copied), str(e))
+        self.assertIsInstance(copied.op, Unreachable)
+        self.assertEqual(copied.operands, (('i', 32, 1), ))
+
+    def test_submit_and_map(self):
+        with WasmProcessPool(POOL_WASM, max_workers=2) as pool:
+            self.assertEqual(pool.submit('add', 1, 2).result(), ('i', 32, 3))
+            self.assertEqual([x[2] for x in pool.map('add', range(5), range(5))], [0, 2, 4, 6, 8])
+            with self.assertRaises(WasmTrappedException):
+                pool.submit('fail').result()
+            with self.assertRaises(KeyError):
+                pool.submit('missing').result()
+
+    def test_reset_and_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'pool.wasm')
+            with open(path, 'wb') as f:
+                f.write(POOL_WASM)
+            cache_dir = os.path.join(d, 'cache')
+            with WasmProcessPool(path, max_workers=1, cache_dir=cache_dir, reset=True) as pool:
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                pool.submit('set', 42).result()
+                self.assertEqual(pool.submit('get').result(), ('i', 32, 7))
+
+        with WasmProcessPool(POOL_WASM, max_workers=1) as pool:
+            pool.submit('set', 42).result()
+            self.assertEqual(pool.submit('get').result(), ('i', 32, 42))
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'os.fork is not available')
+class TestPreforkPool(unittest.TestCase):
+    def test_inherited_instance(self):
+        with WasmPreforkPool(POOL_WASM, workers=2, warmup=lambda wasm: wasm.exports['set'](5)) as pool:
+            self.assertEqual(len(set(pool.pids)), 2)
+            self.assertEqual([x[2] for x in pool.map('add', range(5), range(5))], [0, 2, 4, 6, 8])
+            # memory initialized by warmup in the parent
+            self.assertEqual(pool.submit('get').result(), ('i', 32, 5))
+            with self.assertRaises(WasmTrappedException):
+                pool.submit('fail').result()
+            with self.assertRaises(KeyError):
+                pool.submit('missing').result()
+
+    def test_map_submits_eagerly(self):
+        with WasmPreforkPool(POOL_WASM, workers=1) as pool:
+            results = pool.map('set', [1, 2, 3])
+            # calls run in order without iterating results
+            self.assertEqual(pool.submit('get').result(timeout=10), ('i', 32, 3))
+            self.assertEqual(list(results), [None, None, None])
+
+    def test_reset(self):
+        with WasmPreforkPool(POOL_WASM, workers=1, warmup=lambda wasm: wasm.exports['set'](5), reset=True) as pool:
+            pool.submit('set', 42).result()
+            self.assertEqual(pool.submit('get').result(), ('i', 32, 5))
+
+    def test_start_function(self):
+        with WasmPreforkPool(START_WASM, workers=1, reset=True) as pool:
+            self.assertEqual(pool.submit('get').result(), ('i', 32, 21))
+            pool.submit('set', 3).result()
+            self.assertEqual(pool.submit('get').result(), ('i', 32, 21))
+
+    def test_killed_workers(self):
+        with WasmPreforkPool(POOL_WASM, workers=2) as pool:
+            os.kill(pool.pids[0], signal.SIGKILL)
+            os.waitpid(pool.pids[0], 0)
+            # calls are taken by the other worker
+            self.assertEqual([x[2] for x in pool.map('add', range(4), range(4), timeout=10)], [0, 2, 4, 6])
+
+            os.kill(pool.pids[1], signal.SIGKILL)
+            os.waitpid(pool.pids[1], 0)
+            futures = [pool.submit('add', 1, 2) for _ in range(3)]
+            for future in futures:
+                with self.assertRaises(BrokenProcessPool):
+                    future.result(timeout=10)
+            with self.assertRaises(BrokenProcessPool):
+                pool.submit('add', 1, 2)
+
+    def test_submit_after_shutdown(self):
+        pool = WasmPreforkPool(POOL_WASM, workers=1)
+        pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            pool.submit('add', 1, 2)
+
+if __name__ == '__main__':
+    unittest.main()
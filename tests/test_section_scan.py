@@ -0,0 +1,69 @@
+import io
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WasmExport
+from wapysm.parser.binary.cursor import BinaryCursor
+from wapysm.parser.binary.module import iter_binary_wasm_events, parse_binary_wasm_module, scan_binary_wasm_section_headers
+from wasm_builder import I32, code, export, functype, name, section, simple_module
+
+SCAN_WASM = simple_module(
+    [functype([I32], [I32])],
+    [(0, code(b'\x20\x00\x0B'))],
+    [export('id', 0, 0)],
+    [section(0, name('meta') + b'\x01\x02\x03')],
+)
+
+class NonSeekableStream(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self.inner = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self.inner.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+class TestSectionScan(unittest.TestCase):
+    def test_headers(self):
+        headers = scan_binary_wasm_section_headers(SCAN_WASM)
+        self.assertEqual([h.section_id for h in headers], [0, 1, 3, 7, 10])
+        self.assertEqual(headers[-1].offset + headers[-1].size, len(SCAN_WASM))
+        custom = headers[0]
+        self.assertEqual(SCAN_WASM[custom.offset:custom.offset + custom.size], name('meta') + b'\x01\x02\x03')
+
+        for stream in (io.BytesIO(SCAN_WASM), NonSeekableStream(SCAN_WASM)):
+            self.assertEqual([vars(h) for h in scan_binary_wasm_section_headers(stream)], [vars(h) for h in headers])
+        for buffer in (bytearray(SCAN_WASM), memoryview(SCAN_WASM), BinaryCursor(SCAN_WASM)):
+            self.assertEqual([vars(h) for h in scan_binary_wasm_section_headers(buffer)], [vars(h) for h in headers])
+
+    def test_selected_sections(self):
+        for source in (SCAN_WASM, io.BytesIO(SCAN_WASM), NonSeekableStream(SCAN_WASM)):
+            parsed = parse_binary_wasm_module(source, section_ids={7})
+            self.assertEqual([s.section_id for s in parsed.sections], [7])
+            exports = parsed.sections[0].section_content
+            assert isinstance(exports, list) and isinstance(exports[0], WasmExport)
+            self.assertEqual(exports[0].name, 'id')
+
+class TestParseEvents(unittest.TestCase):
+    def test_events(self):
+        for source in (SCAN_WASM, NonSeekableStream(SCAN_WASM)):
+            events = list(iter_binary_wasm_events(source))
+            self.assertEqual([e for e, _ in events], ['section', 'content', 'section', 'content', 'section', 'content', 'section', 'export', 'section', 'code'])
+            self.assertEqual([v.section_id for e, v in events if e == 'section'], [0, 1, 3, 7, 10])
+            self.assertEqual(events[7][1].name, 'id')
+            self.assertEqual(len(events[9][1].code.expr), 1)
+
+    def test_events_read_incrementally(self):
+        stream = io.BytesIO(SCAN_WASM)
+        events = iter_binary_wasm_events(stream)
+        event_type, header = next(events)
+        self.assertEqual((event_type, header.section_id), ('section', 0))
+        self.assertEqual(stream.tell(), header.offset)
+
+if __name__ == '__main__':
+    unittest.main()
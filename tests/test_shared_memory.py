@@ -0,0 +1,72 @@
+import os
+import pickle
+import struct
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.context import WASM_PAGE_SIZE, WasmMemoryInstance
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, name, section, simple_module, u32, vector
+
+# set(addr, x) on i32 of memory imported as env.mem
+SET_WASM = simple_module(
+    [functype([I32, I32], [])],
+    [(0, code(b'\x20\x00\x20\x01\x36\x02\x00\x0B'))],
+    [export('set', 0, 0)],
+    [section(2, vector([name('env') + name('mem') + b'\x02\x00' + u32(2)]))],
+)
+
+def fill_partition(mem: WasmMemoryInstance, begin: int, count: int) -> int:
+    " Runs in worker process, writing index * 3 to each i32 of the partition "
+    try:
+        wasm = WebAssembly.instantiate(SET_WASM, {'env': {'mem': mem}})
+        for i in range(begin, begin + count):
+            wasm.exports['set'](i * 4, i * 3)
+        return os.getpid()
+    finally:
+        mem.close()
+
+class TestSharedMemory(unittest.TestCase):
+    def setUp(self):
+        self.mem = WasmMemoryInstance.create_shared(2, 4)
+
+    def tearDown(self):
+        self.mem.close()
+        self.mem.unlink()
+
+    def test_pickle_attaches(self):
+        attached = pickle.loads(pickle.dumps(self.mem))
+        try:
+            self.assertEqual(len(attached.data), 2 * WASM_PAGE_SIZE)
+            attached.write(8, b'abcd')
+            self.assertEqual(self.mem.read(8, 4), b'abcd')
+            self.assertEqual(attached.grow(1), 2)
+            # size is followed on access beyond known size
+            self.mem.write(2 * WASM_PAGE_SIZE, b'x')
+            self.assertEqual(len(self.mem.data), 3 * WASM_PAGE_SIZE)
+            self.assertEqual(attached.grow(2), -1)
+        finally:
+            attached.close()
+
+    def test_pickle_copies_unshared(self):
+        mem = WasmMemoryInstance(1, 2)
+        mem.write(0, b'abcd')
+        copied = pickle.loads(pickle.dumps(mem))
+        copied.write(0, b'x')
+        self.assertEqual(mem.read(0, 4), b'abcd')
+        self.assertEqual(copied.read(0, 4), b'xbcd')
+        self.assertEqual(copied.maximum, 2)
+
+    def test_worker_processes(self):
+        count = 1000
+        with ProcessPoolExecutor(2) as executor:
+            futures = [executor.submit(fill_partition, self.mem, i * count, count) for i in range(2)]
+            for future in futures:
+                future.result()
+        values = struct.unpack_from(f'<{2 * count}i', self.mem.view('B', 0, 8 * count, readonly=True))
+        self.assertEqual(list(values), [i * 3 for i in range(2 * count)])
+
+if __name__ == '__main__':
+    unittest.main()
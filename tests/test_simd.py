@@ -0,0 +1,103 @@
+import os
+import random
+import struct
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.webassembly import WebAssembly
+from wapysm.execute.interpreter.vector import (
+    v128_abs, v128_add, v128_eq, v128_from_lanes, v128_lanes, v128_ne,
+    v128_shl, v128_shr_signed, v128_shr_unsigned, v128_sub)
+from wasm_builder import F32, I32, V128, code, export, functype, section, simple_module, u32, vector
+
+SHAPES = {8: 'i8x16', 16: 'i16x8', 32: 'i32x4', 64: 'i64x2'}
+
+def simd_op(subopcode: int, *immediates: int) -> bytes:
+    return b'\xFD' + u32(subopcode) + bytes(immediates)
+
+def v128(*lanes: int, fmt: str = '<4I') -> int:
+    return int.from_bytes(struct.pack(fmt, *lanes), 'little')
+
+GET_0_1 = bytes([0x20, 0, 0x20, 1])
+
+SIMD_WASM = simple_module(
+    [
+        functype([V128, V128], [V128]), functype([I32], [V128]), functype([V128], [I32]),
+        functype([I32, V128], [V128]), functype([F32], [V128]),
+    ],
+    [
+        (0, code(GET_0_1 + simd_op(0xAE) + b'\x0B')),  # i32x4.add
+        (0, code(GET_0_1 + simd_op(0x0D, *range(31, 15, -1)) + b'\x0B')),  # i8x16.shuffle (reverse of 2nd operand)
+        (1, code(bytes([0x20, 0]) + simd_op(0x10) + b'\x0B')),  # i16x8.splat
+        (2, code(bytes([0x20, 0]) + simd_op(0x15, 3) + b'\x0B')),  # i8x16.extract_lane_s 3
+        (2, code(bytes([0x20, 0]) + simd_op(0x64) + b'\x0B')),  # i8x16.bitmask
+        (2, code(bytes([0x20, 0]) + simd_op(0xA3) + b'\x0B')),  # i32x4.all_true
+        # v128.store, then v128.load8x8_s from the same address
+        (3, code(GET_0_1 + simd_op(0x0B, 4, 0) + bytes([0x20, 0]) + simd_op(0x01, 3, 0) + b'\x0B')),
+        # f32x4.splat, then f32x4.mul with v128.const
+        (4, code(bytes([0x20, 0]) + simd_op(0x13) + b'\xFD\x0C' + struct.pack('<4f', 1, 2, -3, 0.5) + simd_op(0xE6) + b'\x0B')),
+    ],
+    [
+        export('add', 0, 0), export('reverse', 0, 1), export('splat', 0, 2), export('extract', 0, 3),
+        export('bitmask', 0, 4), export('all_true', 0, 5), export('load_extend', 0, 6), export('scale', 0, 7),
+    ],
+    [section(5, vector([bytes([0, 1])]))],
+)
+
+class TestVectorLanes(unittest.TestCase):
+    def test_swar_matches_lanes(self):
+        rnd = random.Random(30)
+        for bits, shape in SHAPES.items():
+            mask = 2**bits - 1
+            for _ in range(50):
+                a = rnd.getrandbits(128)
+                b = rnd.getrandbits(128) if rnd.random() < 0.8 else a ^ (1 << rnd.randrange(128))
+                la, lb = v128_lanes(a, shape), v128_lanes(b, shape)
+                count = rnd.randrange(bits * 2)
+                self.assertEqual(v128_add(a, b, bits), v128_from_lanes([x + y for x, y in zip(la, lb)], shape))
+                self.assertEqual(v128_sub(a, b, bits), v128_from_lanes([x - y for x, y in zip(la, lb)], shape))
+                self.assertEqual(v128_abs(a, bits), v128_from_lanes([abs(x) for x in la], shape))
+                self.assertEqual(v128_eq(a, b, bits), v128_from_lanes([-1 if x == y else 0 for x, y in zip(la, lb)], shape))
+                self.assertEqual(v128_ne(a, b, bits), v128_from_lanes([-1 if x != y else 0 for x, y in zip(la, lb)], shape))
+                self.assertEqual(v128_shl(a, count, bits), v128_from_lanes([x << (count % bits) for x in la], shape))
+                self.assertEqual(v128_shr_signed(a, count, bits), v128_from_lanes([x >> (count % bits) for x in la], shape))
+                self.assertEqual(
+                    v128_shr_unsigned(a, count, bits),
+                    v128_from_lanes([(x & mask) >> (count % bits) for x in la], shape))
+
+    def test_float_lanes_round_to_f32(self):
+        self.assertEqual(v128_lanes(v128_from_lanes([1e39, -1e39, 0.1, 0], 'f32x4'), 'f32x4')[:2], (float('inf'), float('-inf')))
+
+
+class TestVectorInstructions(unittest.TestCase):
+    def setUp(self):
+        self.wasm = WebAssembly.instantiate(SIMD_WASM, {})
+
+    def test_add(self):
+        a = ('v', 128, v128(1, 2, 0xFFFFFFFF, 4))
+        b = ('v', 128, v128(10, 20, 1, 40))
+        self.assertEqual(self.wasm.exports['add'](a, b), ('v', 128, v128(11, 22, 0, 44)))
+
+    def test_shuffle(self):
+        b = int.from_bytes(bytes(range(16)), 'little')
+        self.assertEqual(self.wasm.exports['reverse'](('v', 128, 0), ('v', 128, b)), ('v', 128, int.from_bytes(bytes(range(16)), 'big')))
+
+    def test_splat_and_lanes(self):
+        self.assertEqual(self.wasm.exports['splat'](0x12345), ('v', 128, int.from_bytes(b'\x45\x23' * 8, 'little')))
+        value = ('v', 128, v128(*range(-8, 8), fmt='<16b'))
+        self.assertEqual(self.wasm.exports['extract'](value), ('i', 32, 0xFFFFFFFB))
+        self.assertEqual(self.wasm.exports['bitmask'](value), ('i', 32, 0xFF))
+        self.assertEqual(self.wasm.exports['all_true'](('v', 128, v128(1, 2, 3, 4))), ('i', 32, 1))
+        self.assertEqual(self.wasm.exports['all_true'](('v', 128, v128(1, 2, 0, 4))), ('i', 32, 0))
+
+    def test_load_extend(self):
+        value = ('v', 128, v128(*range(-8, 8), fmt='<16b'))
+        self.assertEqual(self.wasm.exports['load_extend'](16, value), ('v', 128, v128(*range(-8, 0), fmt='<8h')))
+
+    def test_float(self):
+        self.assertEqual(self.wasm.exports['scale'](('f', 32, 2.0)), ('v', 128, v128(2, 4, -6, 1, fmt='<4f')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.execute.snapshot import WasmInstanceSnapshot
+from wapysm.webassembly import WebAssembly
+from wasm_builder import I32, code, export, functype, section, simple_module, u32, vector
+
+# get() and set(x) on i32 at address 0 (initialized to 7 by data segment) and on mutable global
+STATE_WASM = simple_module(
+    [functype([], [I32]), functype([I32], [])],
+    [
+        (0, code(b'\x41\x00\x28\x02\x00\x0B')),
+        (1, code(b'\x41\x00\x20\x00\x36\x02\x00\x0B')),
+        (0, code(b'\x23\x00\x0B')),
+        (1, code(b'\x20\x00\x24\x00\x0B')),
+    ],
+    [export('get', 0, 0), export('set', 0, 1), export('get_global', 0, 2), export('set_global', 0, 3)],
+    [
+        section(5, vector([b'\x00' + u32(1)])),
+        section(6, vector([bytes([I32, 1, 0x41, 3, 0x0B])])),
+        section(11, vector([b'\x00\x41\x00\x0B' + u32(4) + b'\x07\x00\x00\x00'])),
+    ],
+)
+
+# call() calls 11() through table element 0
+TABLE_WASM = simple_module(
+    [functype([], [I32])],
+    [
+        (0, code(b'\x41\x0B\x0B')),
+        (0, code(b'\x41\x00\x11\x00\x00\x0B')),
+    ],
+    [export('call', 0, 1)],
+    [
+        section(4, vector([b'\x70\x00' + u32(1)])),
+        section(9, vector([b'\x00\x41\x00\x0B' + vector([u32(0)])])),
+    ],
+)
+
+# get() on i32 at address 0 and get_global(), set(x) on both, and start function setting them to 21 and 5
+START_WASM = simple_module(
+    [functype([], [I32]), functype([I32], []), functype([], [])],
+    [
+        (0, code(b'\x41\x00\x28\x02\x00\x0B')),
+        (0, code(b'\x23\x00\x0B')),
+        (1, code(b'\x41\x00\x20\x00\x36\x02\x00\x20\x00\x24\x00\x0B')),
+        (2, code(b'\x41\x00\x41\x15\x36\x02\x00\x41\x05\x24\x00\x0B')),
+    ],
+    [export('get', 0, 0), export('get_global', 0, 1), export('set', 0, 2)],
+    [
+        section(5, vector([b'\x00' + u32(1)])),
+        section(6, vector([bytes([I32, 1, 0x41, 0, 0x0B])])),
+        section(8, u32(3)),
+    ],
+)
+
+class TestSnapshot(unittest.TestCase):
+    def test_clone_state(self):
+        wasm = WebAssembly.instantiate(STATE_WASM, {})
+        wasm.exports['set'](42)
+        wasm.exports['set_global'](9)
+        snapshot = wasm.snapshot()
+        self.assertEqual(snapshot.memories[0][:4], b'\x2a\x00\x00\x00')
+        self.assertEqual(snapshot.globals_, [('i', 32, 9)])
+
+        clone = WebAssembly.from_snapshot(snapshot, {})
+        self.assertEqual(clone.exports['get'](), ('i', 32, 42))
+        self.assertEqual(clone.exports['get_global'](), ('i', 32, 9))
+
+        # clones share nothing mutable with the original nor with each other
+        clone.exports['set'](1)
+        clone.exports['set_global'](2)
+        other = WebAssembly.from_snapshot(snapshot, {})
+        self.assertEqual(wasm.exports['get'](), ('i', 32, 42))
+        self.assertEqual(other.exports['get'](), ('i', 32, 42))
+        self.assertEqual(other.exports['get_global'](), ('i', 32, 9))
+
+    def test_clone_after_start(self):
+        wasm = WebAssembly.instantiate(START_WASM, {})
+        self.assertEqual(wasm.exports['get'](), ('i', 32, 21))
+        snapshot = wasm.snapshot()
+        wasm.exports['set'](1)
+        clone = WebAssembly.from_snapshot(snapshot, {})
+        self.assertEqual(clone.exports['get'](), ('i', 32, 21))
+        self.assertEqual(clone.exports['get_global'](), ('i', 32, 5))
+
+        # start function is not run again by cloning
+        wasm.exports['set'](8)
+        clone = WebAssembly.from_snapshot(wasm.snapshot(), {})
+        self.assertEqual(clone.exports['get'](), ('i', 32, 8))
+        self.assertEqual(clone.exports['get_global'](), ('i', 32, 8))
+
+    def test_clone_table(self):
+        snapshot = WebAssembly.instantiate(TABLE_WASM, {}).snapshot()
+        self.assertEqual(snapshot.tables[0][0][0], 0)
+        clone = WebAssembly.from_snapshot(snapshot, {})
+        self.assertEqual(clone.exports['call'](), ('i', 32, 11))
+
+    def test_snapshot_file(self):
+        wasm = WebAssembly.instantiate(STATE_WASM, {})
+        wasm.exports['set'](42)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'state.snapshot')
+            wasm.snapshot().save(path)
+            self.assertEqual(os.listdir(d), ['state.snapshot'])
+            clone = WebAssembly.from_snapshot(path, {})
+            self.assertEqual(clone.exports['get'](), ('i', 32, 42))
+            self.assertIsInstance(WasmInstanceSnapshot.load(path), WasmInstanceSnapshot)
+
+if __name__ == '__main__':
+    unittest.main()
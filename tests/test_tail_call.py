@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.webassembly import WebAssembly
+from wasm_builder import FUNCREF, I32, code, export, functype, section, simple_module, u32, vector
+
+# count(n, acc): if n == 0 then acc else count(n - 1, acc + 1)
+def count_body(*tail_call: int) -> bytes:
+    return code(bytes([
+        0x20, 0, 0x45, 0x04, 0x40, 0x20, 1, 0x0F, 0x0B,
+        0x20, 0, 0x41, 1, 0x6B, 0x20, 1, 0x41, 1, 0x6A,
+        *tail_call, 0x0B,
+    ]))
+
+TAIL_CALL_WASM = simple_module(
+    [functype([I32, I32], [I32])],
+    [
+        (0, count_body(0x12, 0)),  # return_call 0
+        (0, count_body(0x41, 0, 0x13, 0, 0)),  # return_call_indirect 0 0 through table slot 0
+    ],
+    [export('count', 0, 0), export('count_indirect', 0, 1)],
+    [
+        section(4, vector([bytes([FUNCREF, 0]) + u32(1)])),
+        section(9, vector([bytes([0, 0x41, 0, 0x0B]) + vector([u32(1)])])),
+    ],
+)
+
+class TestTailCall(unittest.TestCase):
+    def test_return_call(self):
+        wasm = WebAssembly.instantiate(TAIL_CALL_WASM, {})
+        # much deeper than Python's recursion limit
+        self.assertEqual(wasm.exports['count'](5000, 3), ('i', 32, 5003))
+
+    def test_return_call_indirect(self):
+        wasm = WebAssembly.instantiate(TAIL_CALL_WASM, {})
+        self.assertEqual(wasm.exports['count_indirect'](5000, 0), ('i', 32, 5000))
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+import time
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wapysm.webassembly import WebAssembly
+from wapysm.execute.context import WasmMemoryInstance
+from wapysm.execute.utils import WasmTrappedException
+from wasm_builder import I32, I64, code, export, functype, name, section, simple_module, u32, vector
+
+def atomic_op(subopcode: int, align: int) -> bytes:
+    return b'\xFE' + u32(subopcode) + u32(align) + u32(0)
+
+def threads_module(shared: bool) -> bytes:
+    limits = bytes([0x03]) + u32(1) + u32(1) if shared else bytes([0x00]) + u32(1)
+    return simple_module(
+        [functype([], [I32]), functype([I32, I64], [I32]), functype([I32], [I32]), functype([I32, I32], [I32])],
+        [
+            (0, code(bytes([0x41, 0, 0x41, 1]) + atomic_op(0x1E, 2) + b'\x0B')),  # i32.atomic.rmw.add
+            (1, code(bytes([0x41, 8, 0x20, 0, 0x20, 1]) + atomic_op(0x01, 2) + b'\x0B')),  # memory.atomic.wait32
+            (2, code(bytes([0x41, 8, 0x20, 0]) + atomic_op(0x00, 2) + b'\x0B')),  # memory.atomic.notify
+            (3, code(bytes([0x41, 4, 0x20, 0, 0x20, 1]) + atomic_op(0x48, 2) + b'\x0B')),  # i32.atomic.rmw.cmpxchg
+            (2, code(bytes([0x20, 0]) + atomic_op(0x10, 2) + b'\x0B')),  # i32.atomic.load
+        ],
+        [
+            export('inc', 0, 0), export('wait', 0, 1), export('notify', 0, 2),
+            export('cmpxchg', 0, 3), export('load', 0, 4),
+        ],
+        [section(2, vector([name('env') + name('memory') + bytes([0x02]) + limits]))],
+    )
+
+class TestAtomics(unittest.TestCase):
+    def setUp(self):
+        self.mem = WasmMemoryInstance(1, 1, True)
+        self.wasm = WebAssembly.instantiate(threads_module(True), {'env': {'memory': self.mem}})
+
+    def test_parallel_increment(self):
+        # every thread has its own instance, as a thread-spawning host would do
+        instances = [WebAssembly.instantiate(threads_module(True), {'env': {'memory': self.mem}}) for _ in range(4)]
+
+        def run(wasm):
+            for _ in range(200):
+                wasm.exports['inc']()
+        threads = [threading.Thread(target=run, args=(wasm, )) for wasm in instances]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.mem.data[0:4], (800).to_bytes(4, 'little'))
+
+    def test_cmpxchg(self):
+        self.assertEqual(self.wasm.exports['cmpxchg'](1, 5), ('i', 32, 0))
+        self.assertEqual(self.wasm.exports['cmpxchg'](0, 5), ('i', 32, 0))
+        self.assertEqual(self.wasm.exports['cmpxchg'](0, 7), ('i', 32, 5))
+        self.assertEqual(self.wasm.exports['load'](4), ('i', 32, 5))
+
+    def test_unaligned(self):
+        with self.assertRaises(WasmTrappedException):
+            self.wasm.exports['load'](2)
+
+    def test_wait_and_notify(self):
+        self.assertEqual(self.wasm.exports['wait'](1, ('i', 64, 0)), ('i', 32, 1))  # not-equal
+        self.assertEqual(self.wasm.exports['wait'](0, ('i', 64, 1000000)), ('i', 32, 2))  # timed-out
+        self.assertEqual(self.wasm.exports['notify'](1), ('i', 32, 0))
+
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(self.wasm.exports['wait'](0, ('i', 64, -1))))
+        waiter.start()
+        while not self.mem.waiters.get(8):
+            time.sleep(0.001)
+        self.assertEqual(self.wasm.exports['notify'](1), ('i', 32, 1))
+        waiter.join(5)
+        self.assertEqual(results, [('i', 32, 0)])
+
+    def test_wait_unshared_memory(self):
+        wasm = WebAssembly.instantiate(threads_module(False), {'env': {'memory': WasmMemoryInstance(1, None)}})
+        with self.assertRaises(WasmTrappedException):
+            wasm.exports['wait'](0, ('i', 64, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# Helpers to assemble small WASM binaries for tests, without wat2wasm
+import io
+from typing import List, Sequence, Tuple
+
+from wapysm.parser.binary.byteencode import write_leb128_signed, write_leb128_unsigned, write_utf8
+
+I32 = 0x7F
+I64 = 0x7E
+F32 = 0x7D
+F64 = 0x7C
+V128 = 0x7B
+FUNCREF = 0x70
+
+
+def u32(value: int) -> bytes:
+    strm = io.BytesIO()
+    write_leb128_unsigned(strm, value)
+    return strm.getvalue()
+
+def s32(value: int) -> bytes:
+    strm = io.BytesIO()
+    write_leb128_signed(strm, value)
+    return strm.getvalue()
+
+def name(value: str) -> bytes:
+    strm = io.BytesIO()
+    write_utf8(strm, value)
+    return strm.getvalue()
+
+def vector(items: Sequence[bytes]) -> bytes:
+    return u32(len(items)) + b''.join(items)
+
+def section(section_id: int, payload: bytes) -> bytes:
+    return bytes([section_id]) + u32(len(payload)) + payload
+
+def functype(params: Sequence[int], results: Sequence[int]) -> bytes:
+    return b'\x60' + vector([bytes([x]) for x in params]) + vector([bytes([x]) for x in results])
+
+def code(body: bytes, locals: Sequence[Tuple[int, int]] = ()) -> bytes:
+    func = vector([u32(n) + bytes([t]) for n, t in locals]) + body
+    return u32(len(func)) + func
+
+def export(export_name: str, kind: int, index: int) -> bytes:
+    return name(export_name) + bytes([kind]) + u32(index)
+
+def module(*sections: bytes) -> bytes:
+    return b'\x00asm\x01\x00\x00\x00' + b''.join(sections)
+
+# data count section comes before code section
+_SECTION_ORDER = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 12, 10, 11]
+
+def simple_module(
+    types: List[bytes],
+    funcs: List[Tuple[int, bytes]],
+    exports: List[bytes],
+    extra_sections: List[bytes] = [],
+) -> bytes:
+    "Assembles module from type, function, export and code sections, plus any other sections"
+
+    sections = [
+        section(1, vector(types)),
+        section(3, vector([u32(typeidx) for typeidx, _ in funcs])),
+        section(7, vector(exports)),
+        section(10, vector([body for _, body in funcs])),
+    ] + extra_sections
+    return module(*sorted(sections, key=lambda x: _SECTION_ORDER.index(x[0])))
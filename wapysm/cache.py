@@ -0,0 +1,183 @@
+# Caches of parsed modules, in memory and on disk
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from . import __version__
+from .execute.context import WasmCompiledModule
+from .execute.initialization import compile_wasm_module
+from .parser.binary.cursor import BUFFER_SOURCE
+from .parser.binary.module import parse_binary_wasm_module
+
+# bump when pickled structure changes without version change
+_CACHE_FORMAT = 3
+
+# raised by pickle for empty, truncated or otherwise broken file
+_BROKEN_ENTRY_ERRORS = (pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError, IndexError, TypeError)
+
+
+class ModuleDiskCache():
+    """
+    Compiled modules stored in a directory, keyed by SHA-256 of module binary and wapysm version.
+    A hit skips reading sections and compiling the module, but not decoding function bodies:
+    they are stored undecoded, and decoded on their first call as usual (sharing interned ones).
+    Storing decoded instructions would make entries 10 times larger and slower to unpickle than to decode.
+    Entries are pickles, so the directory must be writable only by trusted users.
+    Entries are written to temporary files and renamed, so that multiple processes can share the directory.
+    Least recently used entries are removed when the total size exceeds max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(buffer_source: BUFFER_SOURCE) -> str:
+        digest = hashlib.sha256(buffer_source)
+        digest.update(f'\0wapysm {__version__} {_CACHE_FORMAT}'.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.pickle')
+
+    def get(self, key: str) -> Optional[WasmCompiledModule]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                parsed = pickle.loads(f.read())
+        except OSError:
+            # missing, or not readable
+            return None
+        except _BROKEN_ENTRY_ERRORS:
+            # broken entry, e.g. by power loss, which would fail again on each get
+            self._remove(path)
+            return None
+        if not isinstance(parsed, WasmCompiledModule):
+            self._remove(path)
+            return None
+        try:
+            # mark as recently used
+            os.utime(path)
+        except OSError:
+            # removed by other process meanwhile
+            pass
+        return parsed
+
+    def put(self, key: str, parsed: WasmCompiledModule):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f'{key}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+    def compile(self, buffer_source: BUFFER_SOURCE) -> WasmCompiledModule:
+        " Returns cached module if any, otherwise parses and stores it "
+        key = self.key(buffer_source)
+        parsed = self.get(key)
+        if parsed is None:
+            parsed = compile_wasm_module(parse_binary_wasm_module(buffer_source))
+            self.put(key, parsed)
+        return parsed
+
+    def evict(self):
+        " Removes least recently used entries until the total size fits in max_bytes "
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.pickle'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            # already removed by other process
+            pass
+
+
+class ModuleCache():
+    """
+    Compiled modules kept in memory, keyed like ModuleDiskCache, and shared by all instances of them.
+    Concurrent compiles of the same module wait for the first one instead of parsing it again.
+    Least recently used modules are dropped once the total size of their binaries exceeds max_bytes.
+    Misses are passed to disk_cache if given.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_cache: Optional[ModuleDiskCache] = None) -> None:
+        self.max_bytes = max_bytes
+        self.disk_cache = disk_cache
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        # key to parsed module and size of binary, in order of use
+        self._entries: 'OrderedDict[str, Tuple[WasmCompiledModule, int]]' = OrderedDict()
+        self._inflight: Dict[str, 'Future[WasmCompiledModule]'] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compile(self, buffer_source: BUFFER_SOURCE) -> WasmCompiledModule:
+        " Returns shared module, which is parsed from a copy of buffer_source unless it is bytes "
+        # cached module keeps views of its binary, which must not be closed or modified by the caller
+        if not isinstance(buffer_source, bytes):
+            buffer_source = bytes(buffer_source)
+        key = ModuleDiskCache.key(buffer_source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            future = self._inflight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            if self.disk_cache is not None:
+                parsed = self.disk_cache.compile(buffer_source)
+            else:
+                parsed = compile_wasm_module(parse_binary_wasm_module(buffer_source))
+        except BaseException as ex:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(ex)
+            raise
+
+        size = len(buffer_source)
+        with self._lock:
+            del self._inflight[key]
+            self._entries[key] = (parsed, size)
+            self.total_bytes += size
+            # keep at least the new one
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+        future.set_result(parsed)
+        return parsed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
@@ -1,30 +1,48 @@
+import mmap
+import os
 import struct
+import sys
+import threading
+import time
 
-from typing import Callable, Dict, List, Optional, Union, Literal, Tuple
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Union, Literal, Tuple
 from ..execute.utils import WASM_VALUE, trap
 from ..parser.structure import WasmFunctionType, WasmLimits, VALTYPE_TYPE, WasmGlobalType, WasmTableType
+from ..parser.binary.intern import decode_function_body
 from ..opcode import InstructionBase
 
 
+# instructions, or code section entry whose instructions are decoded on first access
+LAZY_INSTRUCTIONS = Union[List[InstructionBase], 'WasmCodeFunction']
+
 class WasmType(WasmFunctionType):
-    def __init__(self, argument_types: List[VALTYPE_TYPE], return_types: List[VALTYPE_TYPE], instructions: List[InstructionBase]) -> None:
+    def __init__(self, argument_types: List[VALTYPE_TYPE], return_types: List[VALTYPE_TYPE], instructions: LAZY_INSTRUCTIONS) -> None:
         super().__init__(argument_types, return_types)
-        self.instructions = instructions
+        self._instructions = instructions
 
-    instructions: List[InstructionBase]
+    @property
+    def instructions(self) -> List[InstructionBase]:
+        instructions = self._instructions
+        return instructions.expr if isinstance(instructions, WasmCodeFunction) else instructions
 
 class WasmFunction():
     "2.5.3 Functions"
-    def __init__(self, wasm_mod: 'WasmModule', typeidx: int, locals: List[Tuple[int, VALTYPE_TYPE]], body: List[InstructionBase]) -> None:
+    def __init__(self, wasm_mod: 'WasmModule', typeidx: int, locals: List[Tuple[int, VALTYPE_TYPE]], body: LAZY_INSTRUCTIONS) -> None:
         self.wasm_mod = wasm_mod
         self.typeidx = typeidx
         self.locals = locals
-        self.body = body
+        self._body = body
 
     # module: WasmModule
     typeidx: int
     locals: List[Tuple[int, VALTYPE_TYPE]]
-    body: List[InstructionBase]
+
+    @property
+    def body(self) -> List[InstructionBase]:
+        body = self._body
+        return body.expr if isinstance(body, WasmCodeFunction) else body
+
+WASM_SEGMENT_MODE = Literal['active', 'passive', 'declarative']
 
 class WasmTable(WasmTableType):
     "2.5.4 Tables"
@@ -51,6 +69,25 @@ class WasmTable(WasmTableType):
         for i in range(num):
             self.elem_addrs[lim.minimum + i] = -1
 
+    def set_elements(self, dest: int, addrs: List[int], funcs: List[Optional['WasmFunctionInstance']]):
+        if dest + len(addrs) > len(self):
+            trap(f'out of bounds table access: {dest} + {len(addrs)} > {len(self)}')
+        self.elem_addrs.update(zip(range(dest, dest + len(addrs)), addrs))
+        for i, f in enumerate(funcs):
+            if f is None:
+                self.elem.pop(dest + i, None)
+            else:
+                self.elem[dest + i] = f
+
+    def copy(self, dest: int, src: int, length: int, source: Optional['WasmTable'] = None):
+        if source is None:
+            source = self
+        if src + length > len(source):
+            trap(f'out of bounds table access: {src} + {length} > {len(source)}')
+        addrs = [source.elem_addrs[i] for i in range(src, src + length)]
+        funcs = [source.elem.get(i) for i in range(src, src + length)]
+        self.set_elements(dest, addrs, funcs)
+
 class WasmGlobal():
     "2.5.6 Globals"
 
@@ -77,25 +114,29 @@ class WasmElem():
 class WasmElemUnresolved():
     "2.5.7 Element Segments but indexes unresolved"
 
-    def __init__(self, tableidx: int, offset: List[InstructionBase], init: List[int]) -> None:
+    def __init__(self, tableidx: int, offset: List[InstructionBase], init: List[int], mode: WASM_SEGMENT_MODE = 'active') -> None:
         self.tableidx = tableidx
         self.offset = offset
         self.init = init
+        self.mode = mode
 
     tableidx: int
     offset: List[InstructionBase]
-    init: List[int]
+    init: List[int]  # -1 for null reference
+    mode: WASM_SEGMENT_MODE
 
 class WasmData():
     "2.5.8 Data Segments"
-    def __init__(self, memidx: int, offset: List[InstructionBase], init: bytes) -> None:
+    def __init__(self, memidx: int, offset: List[InstructionBase], init: bytes, mode: WASM_SEGMENT_MODE = 'active') -> None:
         self.memidx = memidx
         self.offset = offset
         self.init = init
+        self.mode = mode
 
     memidx: int
     offset: List[InstructionBase]
     init: bytes  # was vec(byte)
+    mode: WASM_SEGMENT_MODE  # 'declarative' is not used
 
 class WasmImport():
     module: str
@@ -112,8 +153,43 @@ class WasmExportValue(WasmExport):
     value: 'WASM_EXPORT_RESOLVED'
 
 class WasmCodeFunction():
+    """
+    5.5.13 Code Section
+    expr is decoded from body on its first access, as most functions of large modules are never called.
+    Decoded expr is shared with identical bodies of other modules, and must not be modified.
+    """
     code_locals: List[Tuple[int, VALTYPE_TYPE]]
-    expr: List[InstructionBase]
+    body: Optional[memoryview]  # encoded expr as view of module binary, None if expr was given
+    _expr: Optional[List[InstructionBase]] = None
+
+    def __init__(self, body: Optional[memoryview] = None) -> None:
+        self.body = body
+
+    @property
+    def expr(self) -> List[InstructionBase]:
+        expr = self._expr
+        if expr is None:
+            assert self.body is not None
+            expr = decode_function_body(self.body)
+            self._expr = expr
+        return expr
+
+    @expr.setter
+    def expr(self, expr: List[InstructionBase]):
+        self._expr = expr
+        self.body = None
+
+    def __getstate__(self):
+        # memoryview can't be pickled
+        state = self.__dict__.copy()
+        if self.body is not None:
+            state['body'] = bytes(self.body)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.body is not None:
+            self.body = memoryview(self.body)
 
 class WasmCodeSection():
     size: int
@@ -137,16 +213,54 @@ WASM_SECTION_TYPE = Union[
     List[WasmElemUnresolved],  # element section
     List[WasmCodeSection],  # code section
     List[WasmData],  # data section
+    # int is also used for data count section
 ]
 
 class WasmSection():
     section_id: int
     section_content: WASM_SECTION_TYPE
 
+class WasmSectionHeader():
+    " 5.5.2 Sections, without content. offset is of content, from the beginning of module "
+    def __init__(self, section_id: int, offset: int, size: int) -> None:
+        self.section_id = section_id
+        self.offset = offset
+        self.size = size
+
+    def __repr__(self) -> str:
+        return f'WasmSectionHeader(section_id={self.section_id}, offset={self.offset}, size={self.size})'
+
+    section_id: int
+    offset: int
+    size: int
+
 class WasmParsedModule():
     version: int
     sections: List[WasmSection]
 
+class WasmCompiledModule(WasmParsedModule):
+    """
+    Parsed module with its sections flattened once, to be shared by all instances of it.
+    Each field from types to codes is concatenation of the same sections in binary order,
+    and the rest are computed from them once instead of on each instantiation.
+    Imports and exports are still resolved per instance, as their objects differ.
+    """
+    types: List[WasmFunctionType]
+    imports: List[WasmImport]
+    funcs: List[int]  # typeidx of each function in code section
+    tables: List[WasmTableType]
+    mems: List[WasmLimits]
+    globals_: List[WasmGlobalSection]
+    exports: List[WasmExport]
+    start: Optional[int]
+    elems: List[WasmElemUnresolved]
+    datas: List[WasmData]
+    codes: List[WasmCodeSection]
+    blocktypes: List[WasmType]  # types without instructions, which block types and call_indirect refer
+    functypes: List[WasmType]  # type of each function in code section, with its instructions
+    elem_offsets: List[Optional[int]]  # offset of each element segment, or None if it is not a constant
+    data_offsets: List[Optional[int]]  # offset of each data segment, or None if it is not a constant
+
 class WasmModule():
     # These types are temporary and subject to change
     def __init__(self) -> None:
@@ -167,7 +281,8 @@ class WasmModule():
     memaddrs: Dict[int, int]
     globaladdrs: Dict[int, int]
 
-    elem: Dict[int, WasmElem]
+    # segments available for table.init and memory.init, replaced with empty one when dropped
+    elem: Dict[int, WasmElemUnresolved]
     data: Dict[int, WasmData]
     start: Optional[WasmFunction]
     imports: Dict[int, WasmImport]
@@ -197,60 +312,486 @@ class WasmHostFunctionInstance(WasmFunctionInstance):
 
 
 WASM_PAGE_SIZE = 65536
+# limit of 32-bit memories, also reserved for memories without maximum
+WASM_MAX_PAGES = 65536
+
+# address space is reserved without committing swap, pages are allocated on first write
+_MAP_NORESERVE = getattr(mmap, 'MAP_NORESERVE', 0x4000 if sys.platform.startswith('linux') else 0)
+_MAP_FIXED = getattr(mmap, 'MAP_FIXED', 0x10)
+
+# shared memory blocks start with current size in bytes, followed by data aligned to pages
+_SHM_HEADER = mmap.PAGESIZE
+
+
+# memoryview formats of NumPy-style type strings, which are little-endian as wasm memory
+_VIEW_FORMATS = {
+    'i1': 'b', 'u1': 'B', 'i2': 'h', 'u2': 'H', 'i4': 'i', 'u4': 'I', 'i8': 'q', 'u8': 'Q', 'f4': 'f', 'f8': 'd',
+}
+
+
+def _view_format(fmt: str) -> str:
+    " Native memoryview format of little-endian fmt, given as NumPy type string ('<i4') or struct format ('<i') "
+    code = fmt.lstrip('<|=')
+    if fmt[:1] in '>!' or (fmt[:1] == '=' and sys.byteorder != 'little'):
+        raise ValueError(f'{fmt} is not little-endian')
+    code = _VIEW_FORMATS.get(code, code)
+    if code not in 'bBhHiIqQfd' or len(code) != 1:
+        raise ValueError(f'unsupported format {fmt}')
+    if sys.byteorder != 'little' and code not in 'bB':
+        raise ValueError(f'{fmt} can not be viewed on big-endian host')
+    return code
+
+
+def _reserve_memory(pages: int) -> Optional[mmap.mmap]:
+    " Maps private anonymous memory of pages, or returns None where it is not available "
+    if os.name != 'posix' or pages <= 0:
+        return None
+    try:
+        return mmap.mmap(-1, pages * WASM_PAGE_SIZE, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS | _MAP_NORESERVE)
+    except (OSError, OverflowError, ValueError):
+        return None
+
+
+def _mmap_address(mm: mmap.mmap) -> int:
+    import ctypes
+    buf = ctypes.c_char.from_buffer(mm)
+    address = ctypes.addressof(buf)
+    del buf
+    return address
+
+
+def _map_fixed(address: int, length: int, fd: int, file_offset: int) -> bool:
+    """
+    Replaces pages at address by private (copy-on-write) mapping of fd, or by zero pages if fd is -1,
+    using mmap(2) with MAP_FIXED through ctypes. Returns False where it is not available.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+    except (ImportError, OSError):
+        return False
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+    flags = mmap.MAP_PRIVATE | _MAP_FIXED | (mmap.MAP_ANONYMOUS if fd < 0 else 0)
+    result = libc.mmap(address, length, mmap.PROT_READ | mmap.PROT_WRITE, flags, fd, file_offset)
+    if result != address:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return True
+
 
 class WasmMemory(WasmLimits):
     """
     2.5.5 Memories
     Itself is "type"
     """
-    def __init__(self, minimum: int, maximum: Optional[int]) -> None:
-        super().__init__(minimum, maximum)
+    def __init__(self, minimum: int, maximum: Optional[int], shared: bool = False) -> None:
+        super().__init__(minimum, maximum, shared)
 
 class WasmMemoryInstance(WasmMemory):
-    " 4.2.8 Memory Instances "
-    data: bytearray
+    """
+    4.2.8 Memory Instances
+    By default data is a view of anonymous mmap reserving maximum pages, which grows in place,
+    and whose zero pages are provided by OS. Otherwise data is a bytearray,
+    or a view of multiprocessing.shared_memory block made by create_shared.
+    Memories are picklable: shared memory blocks are attached, and others are copied.
+    """
+    data: Union[bytearray, memoryview]
     maximum: Optional[int]
-
-    def __init__(self, minimum: int, maximum: Optional[int]) -> None:
-        super().__init__(minimum, maximum)
-        self.data = bytearray(minimum * WASM_PAGE_SIZE)
+    _mmap: Optional[mmap.mmap]
+    _shm: Optional[Any]  # multiprocessing.shared_memory.SharedMemory
+    _shm_owner: bool
+
+    # atomic instructions and memory.grow hold the lock, waiters are notified through the condition
+    lock: threading.Lock
+    condition: threading.Condition
+    waiters: Dict[int, List[List[bool]]]
+
+    # indices of pages written since tracking was started by setting an empty set, None if not tracked
+    dirty: Optional[Set[int]]
+
+    # called with this instance after data is resized or replaced
+    grow_listeners: List[Callable[['WasmMemoryInstance'], None]]
+
+    # [begin, end) ranges where writes trap, and ranges given to map_file
+    readonly_ranges: List[Tuple[int, int]]
+    mapped_ranges: List[Tuple[int, int]]
+
+    def __init__(self, minimum: int, maximum: Optional[int], shared: bool = False, use_mmap: bool = True) -> None:
+        super().__init__(minimum, maximum, shared)
+        self._mmap = _reserve_memory(WASM_MAX_PAGES if maximum is None else min(maximum, WASM_MAX_PAGES)) if use_mmap else None
+        if self._mmap is not None and minimum <= len(self._mmap) // WASM_PAGE_SIZE:
+            self.data = memoryview(self._mmap)[:minimum * WASM_PAGE_SIZE]
+        else:
+            self._mmap = None
+            self.data = bytearray(minimum * WASM_PAGE_SIZE)
+        self._shm = None
+        self._shm_owner = False
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.waiters = {}
+        self.dirty = None
+        self.grow_listeners = []
+        self.readonly_ranges = []
+        self.mapped_ranges = []
+
+    @staticmethod
+    def create_shared(minimum: int, maximum: int, shared: bool = True) -> 'WasmMemoryInstance':
+        """
+        Memory in a new multiprocessing.shared_memory block reserving maximum pages,
+        which is attached instead of copied when pickled, e.g. when passed to worker processes in import object.
+        Size is shared by processes, but grow is serialized only within a process, and so are atomic instructions,
+        wait and notify. Processes should work on their own parts of memory, and leave growing to one of them.
+        The creating process should call unlink when done, and every process close.
+        """
+        from multiprocessing import shared_memory
+        if maximum is None:
+            raise ValueError('memory in shared memory block needs maximum')
+        mem = WasmMemoryInstance(0, maximum, shared, use_mmap=False)
+        mem.minimum = minimum
+        mem._attach_shared(shared_memory.SharedMemory(create=True, size=_SHM_HEADER + maximum * WASM_PAGE_SIZE), True)
+        mem.resize(minimum * WASM_PAGE_SIZE)
+        return mem
+
+    def _attach_shared(self, shm: Any, owner: bool):
+        self._shm = shm
+        self._shm_owner = owner
+        self.data = shm.buf[_SHM_HEADER:_SHM_HEADER + struct.unpack_from('<Q', shm.buf, 0)[0]]
+
+    def _sync_size(self):
+        " Follows size changed by other processes "
+        if self._shm is not None:
+            length = struct.unpack_from('<Q', self._shm.buf, 0)[0]
+            if length != len(self.data):
+                self.data = self._shm.buf[_SHM_HEADER:_SHM_HEADER + length]
+                for listener in list(self.grow_listeners):
+                    listener(self)
+
+    def close(self):
+        " Detaches shared memory block from this process, after which memory can't be used "
+        if self._shm is not None:
+            if isinstance(self.data, memoryview):
+                self.data.release()
+            self.data = bytearray()
+            self._shm.close()
+
+    def unlink(self):
+        " Removes shared memory block made by create_shared, which stays until all processes close it "
+        if self._shm is not None and self._shm_owner:
+            self._shm.unlink()
+
+    def __getstate__(self):
+        state = {
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'shared': self.shared,
+            'use_mmap': self._mmap is not None,
+            'readonly_ranges': self.readonly_ranges,
+        }
+        if self._shm is not None:
+            state['shm_name'] = self._shm.name
+        else:
+            state['contents'] = bytes(self.data)
+        return state
+
+    def __setstate__(self, state):
+        self.__init__(0, state['maximum'], state['shared'], state['use_mmap'])  # type: ignore
+        self.minimum = state['minimum']
+        if 'shm_name' in state:
+            from multiprocessing import shared_memory
+            try:
+                # not to be removed when this process exits, only for 3.13 and later
+                shm = shared_memory.SharedMemory(name=state['shm_name'], track=False)  # type: ignore
+            except TypeError:
+                shm = shared_memory.SharedMemory(name=state['shm_name'])
+            self._attach_shared(shm, False)
+        else:
+            self.load(state['contents'])
+        self.readonly_ranges = list(state['readonly_ranges'])
+
+    def grow(self, pages: int) -> int:
+        " memory.grow, returns previous number of pages, or -1 if memory can't grow "
+        with self.lock:
+            self._sync_size()
+            old_pages = len(self.data) // WASM_PAGE_SIZE
+            new_pages = old_pages + pages
+            if pages < 0 or new_pages > WASM_MAX_PAGES or (self.maximum is not None and new_pages > self.maximum):
+                return -1
+            self.resize(new_pages * WASM_PAGE_SIZE)
+            return old_pages
+
+    def resize(self, length: int):
+        """
+        Changes size of data to length bytes, without copying within reserved mmap.
+        Bytes beyond length are discarded, and are zero when grown again.
+        bytearray is replaced by a copy if it can't be resized while views are exported.
+        """
+        size = len(self.data)
+        if length < size:
+            self.unmap_file(length, size - length)
+        if self._shm is not None:
+            if _SHM_HEADER + length > len(self._shm.buf):
+                raise IndexError(f'{length} bytes exceed shared memory block of {len(self._shm.buf) - _SHM_HEADER} bytes')
+            if length < size:
+                self.data[length:] = bytes(size - length)
+            self.data = self._shm.buf[_SHM_HEADER:_SHM_HEADER + length]
+            struct.pack_into('<Q', self._shm.buf, 0, length)
+        elif self._mmap is not None and length <= len(self._mmap):
+            if length < size:
+                self._mmap.madvise(mmap.MADV_DONTNEED, length, size - length)
+            self.data = memoryview(self._mmap)[:length]
+        else:
+            try:
+                if not isinstance(self.data, bytearray):
+                    raise BufferError('data is not resizable')
+                if length < size:
+                    del self.data[length:]
+                else:
+                    self.data += bytes(length - size)
+            except BufferError:
+                data = bytearray(length)
+                data[:min(size, length)] = self.data[:min(size, length)]
+                self.data = data
+                self._mmap = None
+        for listener in list(self.grow_listeners):
+            listener(self)
+
+    def view(self, fmt: str, offset: int, count: int, readonly: bool = False) -> memoryview:
+        """
+        memoryview of count items of fmt ('<i4', '<f8', 'B', ...) at offset, without copying.
+        Views of mmap-backed and shared memory stay valid after grow, as the mapping never moves.
+        Views of bytearray-backed memory see old data after grow replaced it, see grow_listeners.
+        Writable views mark their pages dirty on creation, as writes through them can't be tracked.
+        """
+        code = _view_format(fmt)
+        length = count * struct.calcsize(code)
+        if offset + length > len(self.data):
+            self._sync_size()
+        if offset < 0 or count < 0 or offset + length > len(self.data):
+            raise IndexError(f'out of bounds memory access: {offset} + {length} > {len(self.data)}')
+        if self._shm is not None:
+            buf = self._shm.buf[_SHM_HEADER:]
+        else:
+            buf = memoryview(self._mmap) if self._mmap is not None else memoryview(self.data)
+        view = buf[offset:offset + length].cast(code)  # type: ignore
+        if readonly:
+            return view.toreadonly()
+        self._check_writable(offset, length)
+        self._mark_dirty(offset, length)
+        return view
+
+    def array(self, dtype: str, offset: int, count: int, readonly: bool = False) -> Any:
+        " NumPy array sharing memory with view, requires numpy "
+        import numpy  # type: ignore
+        return numpy.frombuffer(self.view(dtype, offset, count, readonly), dtype=numpy.dtype(dtype).newbyteorder('<'))
+
+    def map_file(
+        self,
+        file: Union[str, int, IO[bytes]],
+        offset: int,
+        length: Optional[int] = None,
+        file_offset: int = 0,
+        readonly: bool = True,
+    ) -> int:
+        """
+        Maps length bytes (rest of file by default) of file (path, descriptor or binary file object)
+        from file_offset at offset, which must be aligned to pages, and returns number of bytes taken from file.
+        Mapping is copy-on-write, and writes are never written back to the file.
+        Views of memory see mapped contents, as the mapping replaces pages in place.
+        If readonly, writes to the range trap.
+        Bytes of length beyond the end of file are zero.
+        Where mmap(2) with MAP_FIXED is not available, file is read into memory instead.
+        """
+        if offset % WASM_PAGE_SIZE != 0:
+            raise ValueError(f'offset {offset} is not aligned to {WASM_PAGE_SIZE}')
+        if file_offset % mmap.ALLOCATIONGRANULARITY != 0:
+            raise ValueError(f'file_offset {file_offset} is not aligned to {mmap.ALLOCATIONGRANULARITY}')
+        if isinstance(file, (str, int)):
+            with open(file, 'rb', closefd=not isinstance(file, int)) as f:
+                return self.map_file(f, offset, length, file_offset, readonly)
+
+        try:
+            fd: Optional[int] = file.fileno()
+        except (AttributeError, OSError):
+            fd = None
+        if fd is not None:
+            file_size = os.fstat(fd).st_size
+        else:
+            file_size = file.seek(0, os.SEEK_END)
+        file_length = max(0, file_size - file_offset)
+        if length is None:
+            length = file_length
+        file_length = min(file_length, length)
+        with self.lock:
+            if offset + length > len(self.data):
+                raise IndexError(f'out of bounds memory access: {offset} + {length} > {len(self.data)}')
+            self.unmap_file(offset, length)
+            # whole pages are mapped, and the rest is read
+            mapped_length = file_length // mmap.PAGESIZE * mmap.PAGESIZE
+            if fd is None or self._mmap is None or mapped_length == 0 or \
+                    not _map_fixed(_mmap_address(self._mmap) + offset, mapped_length, fd, file_offset):
+                mapped_length = 0
+            file.seek(file_offset + mapped_length)
+            view = memoryview(self._mmap if self._mmap is not None else self.data)[offset + mapped_length:offset + file_length]
+            while len(view) > 0:
+                n = file.readinto(view)  # type: ignore
+                if not n:
+                    break
+                view = view[n:]
+            self.data[offset + file_length:offset + length] = bytes(length - file_length)
+            if length > 0:
+                self.mapped_ranges.append((offset, offset + length))
+            if readonly:
+                self.readonly_ranges.append((offset, offset + length))
+        return file_length
+
+    def unmap_file(self, offset: int, length: int):
+        " Fills whole ranges given to map_file which overlap [offset, offset + length) with zero, and makes them writable "
+        end = offset + length
+        for begin_, end_ in [x for x in self.mapped_ranges if x[0] < end and offset < x[1]]:
+            self.mapped_ranges.remove((begin_, end_))
+            pages_end = begin_ + (end_ - begin_) // mmap.PAGESIZE * mmap.PAGESIZE
+            if self._mmap is None or pages_end == begin_ or \
+                    not _map_fixed(_mmap_address(self._mmap) + begin_, pages_end - begin_, -1, 0):
+                pages_end = begin_
+            self.data[pages_end:end_] = bytes(end_ - pages_end)
+        self.readonly_ranges = [x for x in self.readonly_ranges if not (x[0] < end and offset < x[1])]
+
+    def _check_writable(self, begin: int, length: int):
+        for begin_, end_ in self.readonly_ranges:
+            if begin < end_ and begin_ < begin + length:
+                trap(f'write to read-only memory: {begin} + {length} overlaps [{begin_}, {end_})')
+
+    def discard(self, begin: int, length: int):
+        " Fills pages in [begin, begin + length) with zero, and returns them to OS if mmap is used "
+        mapped = any(x[0] < begin + length and begin < x[1] for x in self.mapped_ranges)
+        if self._mmap is not None and not mapped and begin % mmap.PAGESIZE == 0 and length % mmap.PAGESIZE == 0:
+            self._mmap.madvise(mmap.MADV_DONTNEED, begin, length)
+        else:
+            self.data[begin:begin + length] = bytes(length)
+
+    def load(self, data: Union[bytes, bytearray, memoryview]):
+        " Replaces whole contents with data, writing only non-zero pages into fresh mmap "
+        self.resize(0)
+        self.resize(len(data))
+        if self._mmap is None:
+            self.data[:] = data
+            return
+        view = memoryview(data)
+        zero_page = bytes(WASM_PAGE_SIZE)
+        for begin in range(0, len(data), WASM_PAGE_SIZE):
+            page = view[begin:begin + WASM_PAGE_SIZE]
+            if page != zero_page[:len(page)]:
+                self.data[begin:begin + len(page)] = page
 
     def __len__(self):
-        return len(self.data) * WASM_PAGE_SIZE
+        if self._shm is not None:
+            self._sync_size()
+        return len(self.data)
 
     def __getitem__(self, key: int) -> int:
         return self.data[key]
 
     def __setitem__(self, key: int, value: int):
+        if self.readonly_ranges:
+            self._check_writable(key, 1)
         self.data[key] = value
-
-    def trim(self, begin: int, length: int) -> bytearray:
-        return self.data[begin:begin + length]
+        if self.dirty is not None:
+            self.dirty.add(key // WASM_PAGE_SIZE)
+
+    def _mark_dirty(self, begin: int, length: int):
+        if self.dirty is not None and length > 0:
+            self.dirty.update(range(begin // WASM_PAGE_SIZE, (begin + length - 1) // WASM_PAGE_SIZE + 1))
+
+    def trim(self, begin: int, length: int) -> Union[bytearray, bytes]:
+        if begin + length > len(self.data):
+            self._sync_size()
+        data = self.data[begin:begin + length]
+        return data if isinstance(data, bytearray) else data.tobytes()
+
+    def read(self, src: int, length: int) -> Union[bytearray, bytes]:
+        if src + length > len(self.data):
+            self._sync_size()
+        if src + length > len(self.data):
+            trap(f'out of bounds memory access: {src} + {length} > {len(self.data)}')
+        return self.trim(src, length)
+
+    def write(self, dest: int, data: Union[bytes, bytearray]):
+        if dest + len(data) > len(self.data):
+            self._sync_size()
+        if dest + len(data) > len(self.data):
+            trap(f'out of bounds memory access: {dest} + {len(data)} > {len(self.data)}')
+        if self.readonly_ranges:
+            self._check_writable(dest, len(data))
+        self.data[dest:dest + len(data)] = data
+        self._mark_dirty(dest, len(data))
+
+    def fill(self, dest: int, value: int, length: int):
+        self.write(dest, bytes((value & 0xFF, )) * length)
+
+    def copy(self, dest: int, src: int, length: int):
+        self.write(dest, self.read(src, length))
+
+    def wait(self, addr: int, expected: int, length: int, timeout_ns: int) -> int:
+        """
+        memory.atomic.wait32 and memory.atomic.wait64
+        Returns 0 when woken by notify, 1 when the value is not expected one, 2 on timeout.
+        Negative timeout waits forever.
+        """
+        if not self.shared:
+            trap('memory.atomic.wait on unshared memory')
+        deadline = None if timeout_ns < 0 else time.monotonic() + timeout_ns / 1e9
+        with self.condition:
+            if int.from_bytes(self.read(addr, length), 'little') != expected:
+                return 1
+            waiter = [False]
+            self.waiters.setdefault(addr, []).append(waiter)
+            while not waiter[0]:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.waiters[addr].remove(waiter)
+                    return 2
+                self.condition.wait(remaining)
+            return 0
+
+    def notify(self, addr: int, count: int) -> int:
+        " memory.atomic.notify, returns number of woken waiters "
+        with self.condition:
+            waiters = self.waiters.get(addr, [])
+            woken = waiters[:count]
+            del waiters[:count]
+            for waiter in woken:
+                waiter[0] = True
+            if woken:
+                self.condition.notify_all()
+            return len(woken)
 
     def set_int64(self, addr: int, v: int):
-        self.data[addr:addr + 8] = struct.pack('<L', v)
+        self.write(addr, struct.pack('<Q', v & 0xFFFFFFFFFFFFFFFF))
 
     def get_int64(self, addr: int) -> int:
-        return struct.unpack('<L', self.trim(addr, 8))[0]
+        return struct.unpack_from('<q', self.data, addr)[0]
 
     def set_int32(self, addr: int, v: int):
-        self.data[addr:addr + 4] = struct.pack('<I', v)
+        self.write(addr, struct.pack('<I', v))
 
     def get_int32(self, addr: int) -> int:
-        return struct.unpack('<I', self.trim(addr, 8))[0]
+        return struct.unpack_from('<I', self.data, addr)[0]
 
 
     def set_float64(self, addr: int, v: float):
-        self.data[addr:addr + 8] = struct.pack('<d', v)
+        self.write(addr, struct.pack('<d', v))
 
     def get_float64(self, addr: int) -> float:
-        return struct.unpack('<d', self.trim(addr, 8))[0]
+        return struct.unpack_from('<d', self.data, addr)[0]
 
     def set_float32(self, addr: int, v: float):
-        self.data[addr:addr + 4] = struct.pack('<f', v)
+        self.write(addr, struct.pack('<f', v))
 
     def get_float32(self, addr: int) -> float:
-        return struct.unpack('<f', self.trim(addr, 8))[0]
+        return struct.unpack_from('<f', self.data, addr)[0]
 
 
 class WasmGlobalInstance():
@@ -1,9 +1,11 @@
 from typing import Callable, Dict, List, Optional, Union, cast
 from ..execute.utils import WASM_VALUE, trap
 from ..execute.interpreter.runner import interpret_wasm_section, invoke_wasm_function
+from ..opcode import InstructionBase
+from ..opcode.numeric_generated import ConstantInstructionBase
 from ..execute.context import WASM_EXPORT_OBJECT, WASM_HOST_FUNC, WasmGlobalInstance, WasmHostFunctionInstance, WasmLocalFunctionInstance, WasmMemoryInstance, WasmStore
 from ..parser.structure import WasmFunctionType, WasmLimits, WasmTableType
-from .context import WASM_PAGE_SIZE, WASM_SECTION_TYPE, WasmCodeSection, WasmData, WasmElemUnresolved, WasmExport, WasmExportValue, WasmFunction, WasmFunctionInstance, WasmGlobalSection, WasmImport, WasmModule, WasmParsedModule, WasmTable, WasmType
+from .context import WASM_SECTION_TYPE, WasmCodeSection, WasmData, WasmElemUnresolved, WasmExport, WasmExportValue, WasmFunction, WasmFunctionInstance, WasmGlobalSection, WasmImport, WasmModule, WasmParsedModule, WasmCompiledModule, WasmTable, WasmType
 
 
 def _next_addr(module: WasmModule) -> int:
@@ -15,17 +17,18 @@ def _next_addr(module: WasmModule) -> int:
 
 def allocate_function(
     module: WasmModule,
-    functype: WasmFunctionType,
+    functype: WasmType,
     typeidx: int,
     code: WasmCodeSection,
 ) -> int:
+    " functype is shared, as it depends only on the compiled module "
     funcaddr = _next_addr(module)
-    wf = WasmFunction(module, typeidx, code.code.code_locals, code.code.expr)
+    wf = WasmFunction(module, typeidx, code.code.code_locals, code.code)
     localfunc = WasmLocalFunctionInstance()
     localfunc.module = module
     localfunc.wf = wf
-    localfunc.functype = WasmType(functype.argument_types, functype.return_types, code.code.expr)
-    module.types[typeidx] = localfunc.functype
+    localfunc.functype = functype
+    module.types[typeidx] = functype
     module.funcaddrs[len(module.funcaddrs)] = funcaddr
     module.store.funcs[funcaddr] = localfunc
     return funcaddr
@@ -74,7 +77,7 @@ def allocate_memory(
     size: WasmLimits,
 ) -> int:
     memaddr = _next_addr(module)
-    mem = WasmMemoryInstance(size.minimum, size.maximum)
+    mem = WasmMemoryInstance(size.minimum, size.maximum, size.shared)
     module.memaddrs[len(module.memaddrs)] = memaddr
     module.store.mems[memaddr] = mem
     return memaddr
@@ -112,22 +115,62 @@ def allocate_external_global(
     return globaddr
 
 
-def initialize_wasm_module(parsed: WasmParsedModule, externval: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> WasmModule:
-    """ (Initialization of) 4.5.3.8. Modules """
+def _constant_offset(offset: List[InstructionBase]) -> Optional[int]:
+    " Value of segment offset if it is a single i32.const, as usual, otherwise None "
+    if len(offset) == 1 and isinstance(offset[0], ConstantInstructionBase) and offset[0].type == 'i':
+        return cast(int, offset[0].value)
+    return None
+
+
+def compile_wasm_module(parsed: WasmParsedModule) -> WasmCompiledModule:
+    """
+    Flattens sections of parsed module, and computes what instantiation needs from them
+    (types of functions and constant segment offsets), unless already done.
+    """
+    if isinstance(parsed, WasmCompiledModule):
+        return parsed
     assert parsed.version == 1
     sections: Dict[int, List[WASM_SECTION_TYPE]] = {}
-    for s in range(12):
+    for s in range(13):
         sections[s] = []
     for sec in parsed.sections:
         sections[sec.section_id].append(sec.section_content)
-    types: List[WasmFunctionType] = [x for y in sections[1] for x in cast(List[WasmFunctionType], y)]
-    impts: List[WasmImport] = [x for y in sections[2] for x in cast(List[WasmImport], y)]  # noqa: F841
-    funcs: List[int] = [x for y in sections[3] for x in cast(List[int], y)]
-    tabls: List[WasmTableType] = [x for y in sections[4] for x in cast(List[WasmTableType], y)]
-    memrs: List[WasmLimits] = [x for y in sections[5] for x in cast(List[WasmLimits], y)]
-    glbls: List[WasmGlobalSection] = [x for y in sections[6] for x in cast(List[WasmGlobalSection], y)]
-    expts: List[WasmExport] = [x for y in sections[7] for x in cast(List[WasmExport], y)]
-    codes: List[WasmCodeSection] = [x for y in sections[10] for x in cast(List[WasmCodeSection], y)]
+
+    compiled = WasmCompiledModule()
+    compiled.version = parsed.version
+    compiled.sections = parsed.sections
+    compiled.types = [x for y in sections[1] for x in cast(List[WasmFunctionType], y)]
+    compiled.imports = [x for y in sections[2] for x in cast(List[WasmImport], y)]
+    compiled.funcs = [x for y in sections[3] for x in cast(List[int], y)]
+    compiled.tables = [x for y in sections[4] for x in cast(List[WasmTableType], y)]
+    compiled.mems = [x for y in sections[5] for x in cast(List[WasmLimits], y)]
+    compiled.globals_ = [x for y in sections[6] for x in cast(List[WasmGlobalSection], y)]
+    compiled.exports = [x for y in sections[7] for x in cast(List[WasmExport], y)]
+    compiled.start = cast(int, next(iter(sections[8]), None))
+    compiled.elems = [x for y in sections[9] for x in cast(List[WasmElemUnresolved], y)]
+    compiled.datas = [x for y in sections[11] for x in cast(List[WasmData], y)]
+    compiled.codes = [x for y in sections[10] for x in cast(List[WasmCodeSection], y)]
+
+    compiled.blocktypes = [WasmType(x.argument_types, x.return_types, []) for x in compiled.types]
+    compiled.functypes = [
+        WasmType(compiled.types[typeidx].argument_types, compiled.types[typeidx].return_types, code.code)
+        for typeidx, code in zip(compiled.funcs, compiled.codes)
+    ]
+    compiled.elem_offsets = [_constant_offset(x.offset) if x.mode == 'active' else None for x in compiled.elems]
+    compiled.data_offsets = [_constant_offset(x.offset) if x.mode == 'active' else None for x in compiled.datas]
+    return compiled
+
+
+def initialize_wasm_module(parsed: WasmParsedModule, externval: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> WasmModule:
+    """ (Initialization of) 4.5.3.8. Modules """
+    compiled = compile_wasm_module(parsed)
+    impts = compiled.imports
+    funcs = compiled.funcs
+    tabls = compiled.tables
+    memrs = compiled.mems
+    glbls = compiled.globals_
+    expts = compiled.exports
+    codes = compiled.codes
 
     # assert len(types) == len(funcs)
     assert len(funcs) == len(codes)
@@ -135,6 +178,8 @@ def initialize_wasm_module(parsed: WasmParsedModule, externval: Dict[str, Dict[s
 
     ret_module = WasmModule()
     ret_module.store = WasmStore()
+    # block types refer types which are not used by any function
+    ret_module.types = dict(enumerate(compiled.blocktypes))
 
     func_addrs = []
     table_addrs = []
@@ -155,8 +200,8 @@ def initialize_wasm_module(parsed: WasmParsedModule, externval: Dict[str, Dict[s
             global_addrs.append(allocate_external_global(ret_module, v))
 
     # allocate local objects
-    for funk, kode in zip(funcs, codes):
-        func_addrs.append(allocate_function(ret_module, types[funk], funk, kode))
+    for funk, kode, functype in zip(funcs, codes, compiled.functypes):
+        func_addrs.append(allocate_function(ret_module, functype, funk, kode))
 
     for tabl in tabls:
         table_addrs.append(allocate_table(ret_module, tabl))
@@ -189,15 +234,10 @@ def initialize_wasm_module(parsed: WasmParsedModule, externval: Dict[str, Dict[s
 
 def instantiate_wasm_module(module: WasmModule, parsed: WasmParsedModule, externval: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]):
     """ (Instantiation of) 4.5.3.8. Modules """
-
-    sections: Dict[int, List[WASM_SECTION_TYPE]] = {}
-    for s in range(12):
-        sections[s] = []
-    for sec in parsed.sections:
-        sections[sec.section_id].append(sec.section_content)
-    strts: Optional[int] = cast(int, next(iter(sections[8]), None))  # noqa: F841
-    elems: List[WasmElemUnresolved] = [x for y in sections[9] for x in cast(List[WasmElemUnresolved], y)]  # noqa: F841
-    datum: List[WasmData] = [x for y in sections[11] for x in cast(List[WasmData], y)]  # noqa: F841
+    compiled = compile_wasm_module(parsed)
+    strts = compiled.start
+    elems = compiled.elems
+    datum = compiled.datas
 
     # 4. ?
     for addr, exp in module.exports.items():
@@ -210,13 +250,22 @@ def instantiate_wasm_module(module: WasmModule, parsed: WasmParsedModule, extern
         elif exp.exportdesc_type == 'global' and not isinstance(exp.value, WasmGlobalInstance):
             trap(f'addr {addr}: {exp.exportdesc_type} expected but {exp.value}')
 
+    for idx, elem in enumerate(elems):
+        module.elem[idx] = elem
+    for idx, data in enumerate(datum):
+        module.data[idx] = data
+
     eo: List[int] = []
-    for elem in elems:
-        eoval_wv, _ = interpret_wasm_section(elem.offset, module, module.store, {}, ['i32'])
-        assert eoval_wv
-        assert eoval_wv[0] == 'i', eoval_wv[1] == 32
-        eoval = eoval_wv[2]
-        eo.append(cast(int, eoval))
+    for elem, eoval in zip(elems, compiled.elem_offsets):
+        if elem.mode != 'active':
+            eo.append(0)
+            continue
+        if eoval is None:
+            eoval_wv, _ = interpret_wasm_section(elem.offset, module, module.store, {}, ['i32'])
+            assert eoval_wv
+            assert eoval_wv[0] == 'i', eoval_wv[1] == 32
+            eoval = cast(int, eoval_wv[2])
+        eo.append(eoval)
         tableidx = elem.tableidx
         tableaddr = module.tableaddrs[tableidx]
         tableinst = module.store.tables[tableaddr]
@@ -225,38 +274,53 @@ def instantiate_wasm_module(module: WasmModule, parsed: WasmParsedModule, extern
             trap(f'eend > len(tableinst.elem): {eend} > {len(tableinst.elem_addrs)}')
 
     do = []
-    for data in datum:
-        doval_wv, _ = interpret_wasm_section(data.offset, module, module.store, {}, ['i32'])
-        assert doval_wv
-        assert doval_wv[0] == 'i', doval_wv[1] == 32
-        doval = doval_wv[2]
-        do.append(cast(int, doval))
+    for data, doval in zip(datum, compiled.data_offsets):
+        if data.mode != 'active':
+            do.append(0)
+            continue
+        if doval is None:
+            doval_wv, _ = interpret_wasm_section(data.offset, module, module.store, {}, ['i32'])
+            assert doval_wv
+            assert doval_wv[0] == 'i', doval_wv[1] == 32
+            doval = cast(int, doval_wv[2])
+        do.append(doval)
         memidx = data.memidx
         memaddr = module.memaddrs[memidx]
         meminst = module.store.mems[memaddr]
         dend = doval + len(data.init)
-        if dend > len(meminst) * WASM_PAGE_SIZE:
-            trap(f'dend > len(meminst) * WASM_PAGE_SIZE: {dend} > {len(meminst) * WASM_PAGE_SIZE}')
+        if dend > len(meminst):
+            trap(f'dend > len(meminst): {dend} > {len(meminst)}')
 
 
     for idx, elem in enumerate(elems):
+        if elem.mode == 'passive':
+            continue
+        # active and declarative segments are dropped after instantiation
+        module.elem[idx] = WasmElemUnresolved(elem.tableidx, elem.offset, [], elem.mode)
+        if elem.mode == 'declarative':
+            continue
         tableidx = elem.tableidx
         tableaddr = module.tableaddrs[tableidx]
         tableinst = module.store.tables[tableaddr]
         for jdx, funcidx in enumerate(elem.init):
+            if funcidx < 0:
+                continue
             funcaddr = module.funcaddrs[funcidx]
             tableinst.elem_addrs[eo[idx] + jdx] = funcaddr
             tableinst.elem[eo[idx] + jdx] = module.store.funcs[funcaddr]
 
     for idx, data in enumerate(datum):
+        if data.mode != 'active':
+            continue
+        # active segments are dropped after instantiation
+        module.data[idx] = WasmData(data.memidx, data.offset, b'', data.mode)
         memidx = data.memidx
         memaddr = module.memaddrs[memidx]
         meminst = module.store.mems[memaddr]
-        for jdx, b in enumerate(data.init):
-            meminst[do[idx] + jdx] = b
+        meminst.write(do[idx], data.init)
 
     if strts is not None:
         # start section itself is funcaddr for now
         funcaddr = module.funcaddrs[strts]
         func = module.store.funcs[funcaddr]
-        invoke_wasm_function(func, module, module.store, [], [], [])
+        invoke_wasm_function(func, module, module.store, [])
@@ -1,5 +1,5 @@
 import itertools
-from typing import List, Optional, Union, cast
+from typing import List, Union, cast
 
 from ..utils import WASM_VALUE, typeof
 from ..context import (
@@ -7,7 +7,13 @@ from ..context import (
     WasmStore, WasmModule)
 from .runner import invoke_wasm_function
 
-def invoke_function_external(funcaddr_or_func: Union[int, WasmFunctionInstance], store: WasmStore, exec_args: List[WASM_VALUE]) -> Optional[WASM_VALUE]:
+def invoke_function_external(
+    funcaddr_or_func: Union[int, WasmFunctionInstance],
+    store: WasmStore,
+    exec_args: List[WASM_VALUE],
+) -> Union[None, WASM_VALUE, List[WASM_VALUE]]:
+    "Returns list of values if the function has multiple results"
+
     if isinstance(funcaddr_or_func, int):
         funcinst: WasmFunctionInstance = store.funcs[funcaddr_or_func]
     else:
@@ -22,6 +28,8 @@ def invoke_function_external(funcaddr_or_func: Union[int, WasmFunctionInstance],
     dummy_mod.store = store
     stack: List[WASM_VALUE] = list(exec_args)
     invoke_wasm_function(funcinst, dummy_mod, store, stack)
+    if len(functype.return_types) > 1:
+        return stack[-len(functype.return_types):]
     return stack[-1] if stack else None
 
 
@@ -4,6 +4,8 @@ from typing import Callable, Dict, List, Optional, Tuple, Type, Union, cast
 
 from ...execute.context import (
     WASM_PAGE_SIZE,
+    WasmData,
+    WasmElemUnresolved,
     WasmFunctionInstance,
     WasmGlobalInstance,
     WasmHostFunctionInstance,
@@ -23,16 +25,24 @@ from ...execute.utils import (
     wasm_ine, wasm_ipopcnt, wasm_irem_signed,
     wasm_irotl, wasm_irotr, wasm_ishl,
     wasm_ishr_signed, wasm_ishr_unsigned, wasm_isub,
+    wasm_iextend_signed, wasm_trunc_sat_signed, wasm_trunc_sat_unsigned,
     zero_from_type)
 from ...opcode import (
-    Block, BlockInstructionBase, Br, BrIf, BrTable, Call,
-    CallIndirect, DropInstruction, GlobalGetInstruction,
+    AtomicFence, Block, BlockInstructionBase, Br, BrIf, BrTable, Call,
+    CallIndirect, DataDrop, DropInstruction, ElemDrop, GlobalGetInstruction,
     GlobalSetInstruction, IfElse, InstructionBase,
     LocalGetInstruction, LocalSetInstruction,
-    LocalTeeInstruction, Loop, Nop, Return,
-    SelectInstruction, Unreachable)
+    LocalTeeInstruction, Loop, Nop, Return, ReturnCall, ReturnCallIndirect,
+    SelectInstruction, TableCopy, TableInit, Unreachable)
 from ...opcode.memory_generated import (
+    AtomicMemoryInstructionBase,
+    MemoryAtomicNotify,
+    MemoryAtomicWait32,
+    MemoryAtomicWait64,
+    MemoryCopy,
+    MemoryFill,
     MemoryGrow,
+    MemoryInit,
     MemoryLoadStoreInstructionBase,
     MemorySize)
 from ...opcode.numeric_generated import (
@@ -49,6 +59,12 @@ from ...opcode.numeric_generated import (
     I32Reinterpret_f32, I32Trunc_f32_s,
     I32Trunc_f32_u, I32Trunc_f64_s,
     I32Trunc_f64_u, I32Wrap_I64,
+    I32Extend8_s, I32Extend16_s,
+    I32Trunc_sat_f32_s, I32Trunc_sat_f32_u,
+    I32Trunc_sat_f64_s, I32Trunc_sat_f64_u,
+    I64Extend8_s, I64Extend16_s, I64Extend32_s,
+    I64Trunc_sat_f32_s, I64Trunc_sat_f32_u,
+    I64Trunc_sat_f64_s, I64Trunc_sat_f64_u,
     I64Extend_i32_s, I64Extend_i32_u,
     I64Reinterpret_f64, I64Trunc_f32_s,
     I64Trunc_f32_u, I64Trunc_f64_s,
@@ -56,7 +72,9 @@ from ...opcode.numeric_generated import (
     RelOperatorInstructionBase,
     TestOperatorInstructionBase,
     UnaryOperatorInstructionBase)
+from ...opcode.vector_generated import VectorInstructionBase
 from ...parser.structure import VALTYPE_TYPE
+from .vector import execute_vector_instruction
 
 UNOP_FUNC: Dict[
     str,
@@ -168,6 +186,21 @@ CVTOP_FUNC: Dict[
     I64Trunc_f64_u: int,
     I64Trunc_f64_s: int,
 
+    I32Trunc_sat_f32_u: lambda a: wasm_trunc_sat_unsigned(a, 32),
+    I32Trunc_sat_f32_s: lambda a: wasm_trunc_sat_signed(a, 32),
+    I32Trunc_sat_f64_u: lambda a: wasm_trunc_sat_unsigned(a, 32),
+    I32Trunc_sat_f64_s: lambda a: wasm_trunc_sat_signed(a, 32),
+    I64Trunc_sat_f32_u: lambda a: wasm_trunc_sat_unsigned(a, 64),
+    I64Trunc_sat_f32_s: lambda a: wasm_trunc_sat_signed(a, 64),
+    I64Trunc_sat_f64_u: lambda a: wasm_trunc_sat_unsigned(a, 64),
+    I64Trunc_sat_f64_s: lambda a: wasm_trunc_sat_signed(a, 64),
+
+    I32Extend8_s: lambda a: wasm_iextend_signed(a, 8),
+    I32Extend16_s: lambda a: wasm_iextend_signed(a, 16),
+    I64Extend8_s: lambda a: wasm_iextend_signed(a, 8),
+    I64Extend16_s: lambda a: wasm_iextend_signed(a, 16),
+    I64Extend32_s: lambda a: wasm_iextend_signed(a, 32),
+
     F32Demote_f64: lambda a: struct.unpack('<f', struct.pack('<f', a))[0],
     F64Promote_f32: lambda a: struct.unpack('<d', struct.pack('<d', a))[0],
 
@@ -186,41 +219,100 @@ CVTOP_FUNC: Dict[
     F64Reinterpret_i64: lambda a: struct.unpack('<d', struct.pack('<Q', a))[0],
 }
 
-def invoke_wasm_function(f: WasmFunctionInstance, module: WasmModule, store: WasmStore, stack: List[WASM_VALUE]):
+ATOMIC_RMW_FUNC: Dict[str, Callable[..., int]] = {
+    'add': lambda old, a: old + a,
+    'sub': lambda old, a: old - a,
+    'and': lambda old, a: old & a,
+    'or': lambda old, a: old | a,
+    'xor': lambda old, a: old ^ a,
+    'xchg': lambda old, a: a,
+    'cmpxchg': lambda old, expected, replacement: replacement if old == expected else old,
+}
+
+# struct format of unsigned integer stored by store and storeN
+STORE_PACK_FORMAT: Dict[int, str] = {8: '<B', 16: '<H', 32: '<I', 64: '<Q'}
+
+def _atomic_address(op: AtomicMemoryInstructionBase, operand_i: WASM_VALUE) -> int:
+    ea = int(operand_i[2] + op.offset)
+    if ea % (op.width // 8) != 0:
+        trap(f'unaligned atomic memory access: {ea}')
+    return ea
+
+def _pop_arguments(f: WasmFunctionInstance, stack: List[WASM_VALUE]) -> List[WASM_VALUE]:
     if f.functype.argument_types:
         argl = len(f.functype.argument_types)
         args = stack[-argl:]
         stack[-argl:] = []
     else:
         args = []
+    return args
+
+def _function_locals(f: WasmLocalFunctionInstance, args: List[WASM_VALUE]) -> Dict[int, WASM_VALUE]:
+    locals: Dict[int, WASM_VALUE] = {}
+    for i, v in enumerate(args):
+        locals[i] = v
+    for n, tp in f.wf.locals:
+        for _ in range(n):
+            locals[len(locals)] = zero_from_type(tp)
+    return locals
+
+def _indirect_function(
+    op: Union[CallIndirect, ReturnCallIndirect],
+    module: WasmModule,
+    store: WasmStore,
+    stack: List[WASM_VALUE],
+) -> WasmFunctionInstance:
+    tab = store.tables[module.tableaddrs[op.tableidx]]
+    ft_expect = module.types[op.typeidx]
+    operand_i_value = stack.pop()[2]
+
+    a = tab.elem_addrs.get(cast(int, operand_i_value), -1)
+    if a not in store.funcs:
+        trap(f'uninitialized element {operand_i_value}')
+
+    f = store.funcs[a]
+    ft_actual = f.functype
+
+    if ft_expect != ft_actual:
+        trap('type signature mismatch')
+    return f
+
+def invoke_wasm_function(f: WasmFunctionInstance, module: WasmModule, store: WasmStore, stack: List[WASM_VALUE]):
+    args = _pop_arguments(f, stack)
     rettype = f.functype.return_types
     if isinstance(f, WasmLocalFunctionInstance):
-        locals: Dict[int, WASM_VALUE] = {}
-        for i, v in enumerate(args):
-            locals[i] = v
-        for n, tp in f.wf.locals:
-            for _ in range(n):
-                locals[len(locals)] = zero_from_type(tp)
-        ret, _ = interpret_wasm_section(f.wf.body, f.module, store, locals, rettype)
-        if ret and rettype:
-            stack.append(ret)
+        locals = _function_locals(f, args)
+        _, results = interpret_wasm_section(f.wf.body, f.module, store, locals, rettype)
+        if rettype:
+            stack.extend(results[-len(rettype):])
     elif isinstance(f, WasmHostFunctionInstance):
         # Host Functions
         locals: Dict[int, WASM_VALUE] = {}
         ret = f.hostfunc(store, module, locals, args)  # type: ignore
-        if isinstance(ret, int):
-            ret = ('i', 32, ret)
-        elif isinstance(ret, float):
-            ret = ('f', 32, ret)
-        elif isinstance(ret, tuple):
-            pass
-        else:
-            ret = None
-        if ret and rettype:
-            stack.append(ret)
+        # host functions return list for multiple values
+        rets = ret if isinstance(ret, list) else [ret]
+        for ret in rets:
+            if isinstance(ret, int):
+                ret = ('i', 32, ret)
+            elif isinstance(ret, float):
+                ret = ('f', 32, ret)
+            elif isinstance(ret, tuple):
+                pass
+            else:
+                ret = None
+            if ret and rettype:
+                stack.append(ret)
     else:
         trap(f'unknown function: {repr(f)}')
 
+
+def _block_type(op: BlockInstructionBase, module: WasmModule) -> Tuple[List[VALTYPE_TYPE], List[VALTYPE_TYPE]]:
+    " Returns parameter and result types of block "
+    if op.typeidx is None:
+        return [], op.resultype
+    functype = module.types[op.typeidx]
+    return functype.argument_types, functype.return_types
+
 WASM_LABEL_CONTINUATION = Tuple[
     Optional[BlockInstructionBase],  # instruction that triggered label block
     int,  # label
@@ -267,6 +359,8 @@ def interpret_wasm_section(
 ) -> Tuple[Optional[WASM_VALUE], List[WASM_VALUE]]:
     if not resulttype:
         resulttype = []
+    # resulttype is overwritten when entering blocks
+    func_resulttype = resulttype
     stack: List[WASM_VALUE] = []
     current_block: Optional[BlockInstructionBase] = None
     current_label = 0
@@ -310,6 +404,9 @@ def interpret_wasm_section(
             # is this correct?
             break
         elif isinstance(op, Block):
+            paramtype, block_resulttype = _block_type(op, module)
+            params = stack[len(stack) - len(paramtype):]
+            del stack[len(stack) - len(paramtype):]
             # save continuation
             cont: WASM_LABEL_CONTINUATION = continuation()
             label_stack.append(cont)
@@ -318,12 +415,15 @@ def interpret_wasm_section(
             current_label = 0
             code = op.instr
             idx = 0
-            stack = []
+            stack = params
             is_loop = False
-            resulttype = op.resultype
+            resulttype = block_resulttype
             # see you at the next continuation!
             continue
         elif isinstance(op, Loop):
+            paramtype, block_resulttype = _block_type(op, module)
+            params = stack[len(stack) - len(paramtype):]
+            del stack[len(stack) - len(paramtype):]
             # save continuation
             cont = continuation()
             label_stack.append(cont)
@@ -332,26 +432,29 @@ def interpret_wasm_section(
             current_label = 0
             code = op.instr
             idx = 0
-            stack = []
+            stack = params
             is_loop = True  # we're in Loop instruction!
-            resulttype = op.resultype
+            resulttype = block_resulttype
             # go!
             continue
         elif isinstance(op, IfElse):
+            operand_c1: WASM_VALUE = stack.pop()
+
+            paramtype, block_resulttype = _block_type(op, module)
+            params = stack[len(stack) - len(paramtype):]
+            del stack[len(stack) - len(paramtype):]
             # save continuation
             cont = continuation()
             label_stack.append(cont)
 
-            operand_c1: WASM_VALUE = stack.pop()
-
             # partially reset "registers"
             current_block = op
             current_label = 0
             # code = op.instr
             idx = 0
-            stack = []
+            stack = params
             is_loop = False
-            resulttype = op.resultype
+            resulttype = block_resulttype
 
             if operand_c1[2] != 0:
                 # op.instr is "then" block, so that's OK
@@ -419,19 +522,29 @@ def interpret_wasm_section(
             f = store.funcs[module.funcaddrs[op.callidx]]
             invoke_wasm_function(f, module, store, stack)
         elif isinstance(op, CallIndirect):
-            tab = store.tables[module.tableaddrs[0]]
-            ft_expect = module.types[op.typeidx]
-            operand_i_value = stack.pop()[2]
-
-            a = tab.elem_addrs[cast(int, operand_i_value)]
-
-            f = store.funcs[a]
-            ft_actual = f.functype
-
-            if ft_expect != ft_actual:
-                trap('type signature mismatch')
-
+            f = _indirect_function(op, module, store, stack)
             invoke_wasm_function(f, module, store, stack)
+        elif isinstance(op, (ReturnCall, ReturnCallIndirect)):
+            if isinstance(op, ReturnCall):
+                f = store.funcs[module.funcaddrs[op.callidx]]
+            else:
+                f = _indirect_function(op, module, store, stack)
+            if not isinstance(f, WasmLocalFunctionInstance):
+                # host functions don't have a frame to reuse
+                invoke_wasm_function(f, module, store, stack)
+                break
+            # replace current frame with the callee's one, then jump to its beginning
+            locals = _function_locals(f, _pop_arguments(f, stack))
+            module = f.module
+            code = f.wf.body
+            func_resulttype = resulttype = f.functype.return_types
+            stack = []
+            current_block = None
+            current_label = 0
+            label_stack = []
+            is_loop = False
+            idx = 0
+            continue
 
         # Constant Instruction
         elif isinstance(op, ConstantInstructionBase):
@@ -461,6 +574,10 @@ def interpret_wasm_section(
             cvtopfunc = CVTOP_FUNC[type(op)]
             stack.append(clamp(op.type, op.bits, cvtopfunc(operand_c1[2])))
 
+        # Vector Instructions (SIMD proposal)
+        elif isinstance(op, VectorInstructionBase):
+            execute_vector_instruction(op, module, store, stack)
+
         # 4.4.2. Parametric Instructions
         elif isinstance(op, DropInstruction):
             stack.pop()
@@ -505,15 +622,54 @@ def interpret_wasm_section(
             mem = store.mems[module.memaddrs[0]]
             operand_c1 = stack.pop()
             length_to_extend = floor(operand_c1[2])
-            try:
-                sz = len(mem) // WASM_PAGE_SIZE
-                if mem.maximum and (sz + length_to_extend) > mem.maximum:
-                    raise Exception(f'Memory cannot grow {mem.maximum} pages')
-                mem.data += bytearray(length_to_extend * WASM_PAGE_SIZE)
-                retval = sz
-            except BaseException:
-                retval = -1
+            retval = mem.grow(length_to_extend)
             stack.append(('i', 32, retval))
+        elif isinstance(op, MemoryFill):
+            mem = store.mems[module.memaddrs[0]]
+            operand_n = int(stack.pop()[2])
+            operand_val = int(stack.pop()[2])
+            operand_d = int(stack.pop()[2])
+            mem.fill(operand_d, operand_val, operand_n)
+        elif isinstance(op, MemoryCopy):
+            mem = store.mems[module.memaddrs[0]]
+            operand_n = int(stack.pop()[2])
+            operand_s = int(stack.pop()[2])
+            operand_d = int(stack.pop()[2])
+            mem.copy(operand_d, operand_s, operand_n)
+        elif isinstance(op, MemoryInit):
+            mem = store.mems[module.memaddrs[0]]
+            operand_n = int(stack.pop()[2])
+            operand_s = int(stack.pop()[2])
+            operand_d = int(stack.pop()[2])
+            data = module.data[op.dataidx]
+            if operand_s + operand_n > len(data.init):
+                trap(f'out of bounds data segment access: {operand_s} + {operand_n} > {len(data.init)}')
+            mem.write(operand_d, data.init[operand_s:operand_s + operand_n])
+        elif isinstance(op, DataDrop):
+            data = module.data[op.dataidx]
+            module.data[op.dataidx] = WasmData(data.memidx, data.offset, b'', data.mode)
+
+        # 4.4.5. Table Instructions
+        elif isinstance(op, TableInit):
+            tab = store.tables[module.tableaddrs[op.tableidx]]
+            operand_n = int(stack.pop()[2])
+            operand_s = int(stack.pop()[2])
+            operand_d = int(stack.pop()[2])
+            elem = module.elem[op.elemidx]
+            if operand_s + operand_n > len(elem.init):
+                trap(f'out of bounds element segment access: {operand_s} + {operand_n} > {len(elem.init)}')
+            addrs = [module.funcaddrs[x] if x >= 0 else -1 for x in elem.init[operand_s:operand_s + operand_n]]
+            tab.set_elements(operand_d, addrs, [store.funcs[x] if x >= 0 else None for x in addrs])
+        elif isinstance(op, ElemDrop):
+            elem = module.elem[op.elemidx]
+            module.elem[op.elemidx] = WasmElemUnresolved(elem.tableidx, elem.offset, [], elem.mode)
+        elif isinstance(op, TableCopy):
+            dest_tab = store.tables[module.tableaddrs[op.dest_tableidx]]
+            src_tab = store.tables[module.tableaddrs[op.src_tableidx]]
+            operand_n = int(stack.pop()[2])
+            operand_s = int(stack.pop()[2])
+            operand_d = int(stack.pop()[2])
+            dest_tab.copy(operand_d, operand_s, operand_n, src_tab)
         elif isinstance(op, MemoryLoadStoreInstructionBase) and op.op.startswith('load'):
             a = module.memaddrs[0]
             mem = store.mems[a]
@@ -575,30 +731,47 @@ def interpret_wasm_section(
             if ea + N // 8 > len(mem):
                 trap('end of store position is beyond memory size')
 
-            if op.op == 'store':
-                if op.type == 'i':
-                    if op.bits == 32:
-                        pack_arg = '<I'
-                    else:
-                        pack_arg = '<Q'
-                    operand_c_value = clamp_anybit(operand_c_value, op.bits)
-                else:
-                    if op.bits == 32:
-                        pack_arg = '<f'
-                    else:
-                        pack_arg = '<d'
+            if op.type == 'f':
+                pack_arg = '<f' if N == 32 else '<d'
             else:
-                # if N is part of the inst.
-                if N == 32:
-                    pack_arg = '<I'
-                else:
-                    pack_arg = '<Q'
+                # storeN writes only the lower N bits
+                pack_arg = STORE_PACK_FORMAT[N]
                 operand_c_value = clamp_anybit(operand_c_value, N)
-            b_star_ = struct.pack(pack_arg, operand_c_value)
-            for i, bb in enumerate(b_star_):
-                mem[ea + i] = bb
+            mem.write(ea, struct.pack(pack_arg, operand_c_value))
 
-    if resulttype:
+        # Atomic Memory Instructions (threads proposal)
+        elif isinstance(op, AtomicFence):
+            pass  # atomic instructions are sequentially consistent, as they hold the memory lock
+        elif isinstance(op, MemoryAtomicNotify):
+            mem = store.mems[module.memaddrs[0]]
+            operand_n = int(stack.pop()[2])
+            ea = _atomic_address(op, stack.pop())
+            mem.read(ea, op.width // 8)  # bounds check
+            stack.append(('i', 32, mem.notify(ea, operand_n)))
+        elif isinstance(op, (MemoryAtomicWait32, MemoryAtomicWait64)):
+            mem = store.mems[module.memaddrs[0]]
+            operand_timeout = unclamp_64bit(int(stack.pop()[2]))
+            operand_expected = clamp_anybit(int(stack.pop()[2]), op.width)  # type: ignore
+            ea = _atomic_address(op, stack.pop())
+            stack.append(('i', 32, mem.wait(ea, operand_expected, op.width // 8, operand_timeout)))
+        elif isinstance(op, AtomicMemoryInstructionBase):
+            mem = store.mems[module.memaddrs[0]]
+            width_mask = 2**op.width - 1
+            operands = [] if op.op.startswith('atomic_load') else [int(stack.pop()[2]) & width_mask]
+            if op.rmw == 'cmpxchg':
+                operands.insert(0, int(stack.pop()[2]) & width_mask)
+            ea = _atomic_address(op, stack.pop())
+            with mem.lock:
+                if op.op.startswith('atomic_store'):
+                    mem.write(ea, operands[0].to_bytes(op.width // 8, 'little'))
+                    continue
+                old_value = int.from_bytes(mem.read(ea, op.width // 8), 'little')
+                if op.rmw:
+                    new_value = ATOMIC_RMW_FUNC[op.rmw](old_value, *operands) & width_mask
+                    mem.write(ea, new_value.to_bytes(op.width // 8, 'little'))
+            stack.append(('i', op.bits, old_value))
+
+    if func_resulttype:
         return stack[-1], stack
     else:
         return None, stack
@@ -0,0 +1,409 @@
+# 4.4.x Vector Instructions (SIMD proposal)
+# v128 values are kept as ('v', 128, int) where the int holds 16 little-endian bytes.
+# Lane-wise operations work on the whole 128-bit integer at once (SWAR) where
+# possible, otherwise they unpack all lanes with a single struct call.
+
+import struct
+from math import ceil, copysign, floor, inf, isinf, isnan, nan, sqrt, trunc
+from typing import Callable, Dict, Iterable, List, Tuple, Union, cast
+
+from ...execute.context import WasmModule, WasmStore
+from ...execute.utils import WASM_VALUE, clamp, wasm_trunc_sat_signed, wasm_trunc_sat_unsigned
+from ...opcode.vector_generated import (
+    V128Const,
+    VectorBinopInstructionBase,
+    VectorBitmaskInstructionBase,
+    VectorInstructionBase,
+    VectorLaneInstructionBase,
+    VectorMemoryInstructionBase,
+    VectorMemoryLaneInstructionBase,
+    VectorRelopInstructionBase,
+    VectorShiftInstructionBase,
+    VectorShuffleInstructionBase,
+    VectorSplatInstructionBase,
+    VectorTernopInstructionBase,
+    VectorTestInstructionBase,
+    VectorUnopInstructionBase)
+
+V128_MASK = 2**128 - 1
+
+LANE = Union[int, float]
+
+# shape: (number of lanes, signed format, unsigned format, bits of lane)
+LANE_SHAPES: Dict[str, Tuple[int, str, str, int]] = {
+    'i8x16': (16, 'b', 'B', 8),
+    'i16x8': (8, 'h', 'H', 16),
+    'i32x4': (4, 'i', 'I', 32),
+    'i64x2': (2, 'q', 'Q', 64),
+    'f32x4': (4, 'f', 'f', 32),
+    'f64x2': (2, 'd', 'd', 64),
+}
+
+INT_SHAPES_BY_BITS: Dict[int, str] = {8: 'i8x16', 16: 'i16x8', 32: 'i32x4', 64: 'i64x2'}
+
+
+def v128_lanes(value: int, shape: str, signed: bool = True) -> Tuple[LANE, ...]:
+    count, sfmt, ufmt, _ = LANE_SHAPES[shape]
+    return struct.unpack(f'<{count}{sfmt if signed else ufmt}', value.to_bytes(16, 'little'))
+
+def v128_from_lanes(lanes: Iterable[LANE], shape: str) -> int:
+    " Packs lanes into v128. Integer lanes wrap around, float lanes are rounded to the lane size "
+    count, _, ufmt, bits = LANE_SHAPES[shape]
+    if shape[0] == 'i':
+        mask = 2**bits - 1
+        data = struct.pack(f'<{count}{ufmt}', *[cast(int, x) & mask for x in lanes])
+    elif bits == 32:
+        data = struct.pack(f'<{count}{ufmt}', *map(_round_f32, lanes))
+    else:
+        data = struct.pack(f'<{count}{ufmt}', *lanes)
+    return int.from_bytes(data, 'little')
+
+def _round_f32(value: LANE) -> float:
+    try:
+        return struct.unpack('<f', struct.pack('<f', value))[0]
+    except OverflowError:
+        return copysign(inf, value)
+
+def _repeat(lane: int, bits: int) -> int:
+    " Repeats a lane pattern over all lanes "
+    return int.from_bytes(lane.to_bytes(bits // 8, 'little') * (128 // bits), 'little')
+
+
+# SWAR constants: lowest bit and highest bit of each lane
+_ONES = {bits: _repeat(1, bits) for bits in (8, 16, 32, 64)}
+_HIGHS = {bits: _repeat(1 << (bits - 1), bits) for bits in (8, 16, 32, 64)}
+
+def v128_add(a: int, b: int, bits: int) -> int:
+    h = _HIGHS[bits]
+    low = V128_MASK ^ h
+    return (((a & low) + (b & low)) ^ ((a ^ b) & h)) & V128_MASK
+
+def v128_sub(a: int, b: int, bits: int) -> int:
+    h = _HIGHS[bits]
+    low = V128_MASK ^ h
+    return (((a | h) - (b & low)) ^ ((a ^ ~b) & h)) & V128_MASK
+
+def _nonzero_lanes(a: int, bits: int) -> int:
+    " Sets the highest bit of every non-zero lane "
+    h = _HIGHS[bits]
+    low = V128_MASK ^ h
+    return (((a & low) + low) | a) & h
+
+def _expand_highs(a: int, bits: int) -> int:
+    " Fills every lane whose highest bit is set "
+    return (a >> (bits - 1)) * (2**bits - 1)
+
+def v128_eq(a: int, b: int, bits: int) -> int:
+    return V128_MASK ^ _expand_highs(_nonzero_lanes(a ^ b, bits), bits)
+
+def v128_ne(a: int, b: int, bits: int) -> int:
+    return _expand_highs(_nonzero_lanes(a ^ b, bits), bits)
+
+def v128_abs(a: int, bits: int) -> int:
+    negatives = _expand_highs(a & _HIGHS[bits], bits)
+    return v128_sub(a ^ negatives, negatives, bits)
+
+def v128_shl(a: int, count: int, bits: int) -> int:
+    count %= bits
+    return (a << count) & _repeat(((2**bits - 1) << count) & (2**bits - 1), bits)
+
+def v128_shr_unsigned(a: int, count: int, bits: int) -> int:
+    count %= bits
+    return (a >> count) & _repeat((2**bits - 1) >> count, bits)
+
+def v128_shr_signed(a: int, count: int, bits: int) -> int:
+    count %= bits
+    shape = INT_SHAPES_BY_BITS[bits]
+    return v128_from_lanes([x >> count for x in cast(Tuple[int, ...], v128_lanes(a, shape))], shape)
+
+
+def _saturate(value: int, bits: int, signed: bool) -> int:
+    if signed:
+        return max(-2**(bits - 1), min(2**(bits - 1) - 1, value))
+    return max(0, min(2**bits - 1, value))
+
+def _fmin(a: float, b: float) -> float:
+    if isnan(a) or isnan(b):
+        return nan
+    if a == b == 0:
+        return a if copysign(1, a) < 0 else b
+    return min(a, b)
+
+def _fmax(a: float, b: float) -> float:
+    if isnan(a) or isnan(b):
+        return nan
+    if a == b == 0:
+        return a if copysign(1, a) > 0 else b
+    return max(a, b)
+
+def _fsqrt(a: float) -> float:
+    return sqrt(a) if a >= 0 else nan
+
+def _fround(func: Callable[[float], int]) -> Callable[[float], float]:
+    " ceil, floor, trunc and nearest keep zero, infinity, NaN and the sign of the operand "
+    return lambda a: a if isinf(a) or isnan(a) or a == 0 else copysign(float(func(a)), a)
+
+def _int_shape(shape: str) -> str:
+    return 'i' + shape[1:]
+
+def _lanewise_unop(shape: str, func: Callable[[LANE], LANE], signed: bool = True, result_shape: str = '') -> Callable[[int], int]:
+    return lambda a: v128_from_lanes(map(func, v128_lanes(a, shape, signed)), result_shape or shape)
+
+def _lanewise_binop(
+    shape: str, func: Callable[[LANE, LANE], LANE], signed: bool = True, result_shape: str = ''
+) -> Callable[[int, int], int]:
+    return lambda a, b: v128_from_lanes(
+        map(func, v128_lanes(a, shape, signed), v128_lanes(b, shape, signed)), result_shape or shape)
+
+def _lanewise_relop(shape: str, func: Callable[[LANE, LANE], bool], signed: bool = True) -> Callable[[int, int], int]:
+    return _lanewise_binop(shape, lambda a, b: -1 if func(a, b) else 0, signed, _int_shape(shape))
+
+def _extend(shape: str, src: str, half: str, signed: bool) -> Callable[[int], int]:
+    count = LANE_SHAPES[shape][0]
+    begin = 0 if half == 'low' else count
+    return lambda a: v128_from_lanes(v128_lanes(a, src, signed)[begin:begin + count], shape)
+
+def _extmul(shape: str, src: str, half: str, signed: bool) -> Callable[[int, int], int]:
+    count = LANE_SHAPES[shape][0]
+    begin = 0 if half == 'low' else count
+    return lambda a, b: v128_from_lanes(map(
+        lambda x, y: x * y,  # type: ignore
+        v128_lanes(a, src, signed)[begin:begin + count],
+        v128_lanes(b, src, signed)[begin:begin + count]), shape)
+
+def _extadd_pairwise(shape: str, src: str, signed: bool) -> Callable[[int], int]:
+    def extadd(a: int) -> int:
+        lanes = cast(Tuple[int, ...], v128_lanes(a, src, signed))
+        return v128_from_lanes(map(lambda x, y: x + y, lanes[0::2], lanes[1::2]), shape)
+    return extadd
+
+def _narrow(shape: str, src: str, signed: bool) -> Callable[[int, int], int]:
+    bits = LANE_SHAPES[shape][3]
+    return lambda a, b: v128_from_lanes(
+        [_saturate(cast(int, x), bits, signed) for x in v128_lanes(a, src) + v128_lanes(b, src)], shape)
+
+def _dot(a: int, b: int) -> int:
+    products = [x * y for x, y in zip(v128_lanes(a, 'i16x8'), v128_lanes(b, 'i16x8'))]
+    return v128_from_lanes(map(lambda x, y: x + y, products[0::2], products[1::2]), 'i32x4')
+
+def _swizzle(a: int, b: int) -> int:
+    data = a.to_bytes(16, 'little')
+    return int.from_bytes(bytes(data[i] if i < 16 else 0 for i in b.to_bytes(16, 'little')), 'little')
+
+
+VECTOR_UNOP_FUNC: Dict[str, Callable[[int], int]] = {
+    'v128.not': lambda a: a ^ V128_MASK,
+    'i8x16.popcnt': _lanewise_unop('i8x16', lambda x: bin(cast(int, x)).count('1'), False),
+    'f32x4.demote_f64x2_zero': lambda a: v128_from_lanes(v128_lanes(a, 'f64x2') + (0.0, 0.0), 'f32x4'),
+    'f64x2.promote_low_f32x4': lambda a: v128_from_lanes(v128_lanes(a, 'f32x4')[:2], 'f64x2'),
+    'i32x4.trunc_sat_f32x4_s': _lanewise_unop('f32x4', lambda x: wasm_trunc_sat_signed(x, 32), result_shape='i32x4'),
+    'i32x4.trunc_sat_f32x4_u': _lanewise_unop('f32x4', lambda x: wasm_trunc_sat_unsigned(x, 32), result_shape='i32x4'),
+    'f32x4.convert_i32x4_s': _lanewise_unop('i32x4', float, True, 'f32x4'),
+    'f32x4.convert_i32x4_u': _lanewise_unop('i32x4', float, False, 'f32x4'),
+    'i32x4.trunc_sat_f64x2_s_zero': lambda a: v128_from_lanes(
+        [wasm_trunc_sat_signed(x, 32) for x in v128_lanes(a, 'f64x2')] + [0, 0], 'i32x4'),
+    'i32x4.trunc_sat_f64x2_u_zero': lambda a: v128_from_lanes(
+        [wasm_trunc_sat_unsigned(x, 32) for x in v128_lanes(a, 'f64x2')] + [0, 0], 'i32x4'),
+    'f64x2.convert_low_i32x4_s': lambda a: v128_from_lanes(map(float, v128_lanes(a, 'i32x4', True)[:2]), 'f64x2'),
+    'f64x2.convert_low_i32x4_u': lambda a: v128_from_lanes(map(float, v128_lanes(a, 'i32x4', False)[:2]), 'f64x2'),
+}
+VECTOR_BINOP_FUNC: Dict[str, Callable[[int, int], int]] = {
+    'v128.and': lambda a, b: a & b,
+    'v128.andnot': lambda a, b: a & (b ^ V128_MASK),
+    'v128.or': lambda a, b: a | b,
+    'v128.xor': lambda a, b: a ^ b,
+    'i8x16.swizzle': _swizzle,
+    'i8x16.narrow_i16x8_s': _narrow('i8x16', 'i16x8', True),
+    'i8x16.narrow_i16x8_u': _narrow('i8x16', 'i16x8', False),
+    'i16x8.narrow_i32x4_s': _narrow('i16x8', 'i32x4', True),
+    'i16x8.narrow_i32x4_u': _narrow('i16x8', 'i32x4', False),
+    'i16x8.q15mulr_sat_s': _lanewise_binop('i16x8', lambda x, y: _saturate((cast(int, x) * cast(int, y) + 0x4000) >> 15, 16, True)),
+    'i32x4.dot_i16x8_s': _dot,
+}
+VECTOR_RELOP_FUNC: Dict[str, Callable[[int, int], int]] = {}
+
+for _shape, _lane_shape in LANE_SHAPES.items():
+    _bits = _lane_shape[3]
+    if _shape[0] == 'i':
+        VECTOR_UNOP_FUNC[f'{_shape}.abs'] = (lambda bits: lambda a: v128_abs(a, bits))(_bits)
+        VECTOR_UNOP_FUNC[f'{_shape}.neg'] = (lambda bits: lambda a: v128_sub(0, a, bits))(_bits)
+        VECTOR_BINOP_FUNC[f'{_shape}.add'] = (lambda bits: lambda a, b: v128_add(a, b, bits))(_bits)
+        VECTOR_BINOP_FUNC[f'{_shape}.sub'] = (lambda bits: lambda a, b: v128_sub(a, b, bits))(_bits)
+        VECTOR_BINOP_FUNC[f'{_shape}.mul'] = _lanewise_binop(_shape, lambda x, y: x * y)
+        VECTOR_RELOP_FUNC[f'{_shape}.eq'] = (lambda bits: lambda a, b: v128_eq(a, b, bits))(_bits)
+        VECTOR_RELOP_FUNC[f'{_shape}.ne'] = (lambda bits: lambda a, b: v128_ne(a, b, bits))(_bits)
+        for _sx, _signed in (('s', True), ('u', False)):
+            VECTOR_BINOP_FUNC[f'{_shape}.min_{_sx}'] = _lanewise_binop(_shape, min, _signed)
+            VECTOR_BINOP_FUNC[f'{_shape}.max_{_sx}'] = _lanewise_binop(_shape, max, _signed)
+            VECTOR_BINOP_FUNC[f'{_shape}.add_sat_{_sx}'] = _lanewise_binop(
+                _shape, (lambda bits, signed: lambda x, y: _saturate(x + y, bits, signed))(_bits, _signed), _signed)
+            VECTOR_BINOP_FUNC[f'{_shape}.sub_sat_{_sx}'] = _lanewise_binop(
+                _shape, (lambda bits, signed: lambda x, y: _saturate(x - y, bits, signed))(_bits, _signed), _signed)
+            VECTOR_RELOP_FUNC[f'{_shape}.lt_{_sx}'] = _lanewise_relop(_shape, lambda x, y: x < y, _signed)
+            VECTOR_RELOP_FUNC[f'{_shape}.gt_{_sx}'] = _lanewise_relop(_shape, lambda x, y: x > y, _signed)
+            VECTOR_RELOP_FUNC[f'{_shape}.le_{_sx}'] = _lanewise_relop(_shape, lambda x, y: x <= y, _signed)
+            VECTOR_RELOP_FUNC[f'{_shape}.ge_{_sx}'] = _lanewise_relop(_shape, lambda x, y: x >= y, _signed)
+        VECTOR_BINOP_FUNC[f'{_shape}.avgr_u'] = _lanewise_binop(_shape, lambda x, y: (x + y + 1) >> 1, False)  # type: ignore
+    else:
+        _sign = _HIGHS[_bits]
+        VECTOR_UNOP_FUNC[f'{_shape}.abs'] = (lambda sign: lambda a: a & (V128_MASK ^ sign))(_sign)
+        VECTOR_UNOP_FUNC[f'{_shape}.neg'] = (lambda sign: lambda a: a ^ sign)(_sign)
+        VECTOR_UNOP_FUNC[f'{_shape}.sqrt'] = _lanewise_unop(_shape, _fsqrt)  # type: ignore
+        VECTOR_UNOP_FUNC[f'{_shape}.ceil'] = _lanewise_unop(_shape, _fround(ceil))  # type: ignore
+        VECTOR_UNOP_FUNC[f'{_shape}.floor'] = _lanewise_unop(_shape, _fround(floor))  # type: ignore
+        VECTOR_UNOP_FUNC[f'{_shape}.trunc'] = _lanewise_unop(_shape, _fround(trunc))  # type: ignore
+        VECTOR_UNOP_FUNC[f'{_shape}.nearest'] = _lanewise_unop(_shape, _fround(round))  # type: ignore
+        VECTOR_BINOP_FUNC[f'{_shape}.add'] = _lanewise_binop(_shape, lambda x, y: x + y)
+        VECTOR_BINOP_FUNC[f'{_shape}.sub'] = _lanewise_binop(_shape, lambda x, y: x - y)
+        VECTOR_BINOP_FUNC[f'{_shape}.mul'] = _lanewise_binop(_shape, lambda x, y: x * y)
+        VECTOR_BINOP_FUNC[f'{_shape}.div'] = _lanewise_binop(
+            _shape, lambda x, y: x / y if y != 0 else (nan if x == 0 or isnan(x) else copysign(inf, x) * copysign(1, y)))
+        VECTOR_BINOP_FUNC[f'{_shape}.min'] = _lanewise_binop(_shape, _fmin)  # type: ignore
+        VECTOR_BINOP_FUNC[f'{_shape}.max'] = _lanewise_binop(_shape, _fmax)  # type: ignore
+        VECTOR_BINOP_FUNC[f'{_shape}.pmin'] = _lanewise_binop(_shape, lambda x, y: y if y < x else x)
+        VECTOR_BINOP_FUNC[f'{_shape}.pmax'] = _lanewise_binop(_shape, lambda x, y: y if x < y else x)
+        VECTOR_RELOP_FUNC[f'{_shape}.eq'] = _lanewise_relop(_shape, lambda x, y: x == y)
+        VECTOR_RELOP_FUNC[f'{_shape}.ne'] = _lanewise_relop(_shape, lambda x, y: x != y)
+        VECTOR_RELOP_FUNC[f'{_shape}.lt'] = _lanewise_relop(_shape, lambda x, y: x < y)
+        VECTOR_RELOP_FUNC[f'{_shape}.gt'] = _lanewise_relop(_shape, lambda x, y: x > y)
+        VECTOR_RELOP_FUNC[f'{_shape}.le'] = _lanewise_relop(_shape, lambda x, y: x <= y)
+        VECTOR_RELOP_FUNC[f'{_shape}.ge'] = _lanewise_relop(_shape, lambda x, y: x >= y)
+
+for (_shape, _src) in (('i16x8', 'i8x16'), ('i32x4', 'i16x8'), ('i64x2', 'i32x4')):
+    for _sx, _signed in (('s', True), ('u', False)):
+        for _half in ('low', 'high'):
+            VECTOR_UNOP_FUNC[f'{_shape}.extend_{_half}_{_src}_{_sx}'] = _extend(_shape, _src, _half, _signed)
+            VECTOR_BINOP_FUNC[f'{_shape}.extmul_{_half}_{_src}_{_sx}'] = _extmul(_shape, _src, _half, _signed)
+        if _shape != 'i64x2':
+            VECTOR_UNOP_FUNC[f'{_shape}.extadd_pairwise_{_src}_{_sx}'] = _extadd_pairwise(_shape, _src, _signed)
+
+VECTOR_SHIFT_FUNC: Dict[str, Callable[[int, int, int], int]] = {
+    'shl': v128_shl,
+    'shr_s': v128_shr_signed,
+    'shr_u': v128_shr_unsigned,
+}
+
+# extending loads: (format of 8 bytes read, shape of the result)
+_VECTOR_LOAD_EXTEND: Dict[str, Tuple[str, str]] = {
+    'load8x8_s': ('<8b', 'i16x8'),
+    'load8x8_u': ('<8B', 'i16x8'),
+    'load16x4_s': ('<4h', 'i32x4'),
+    'load16x4_u': ('<4H', 'i32x4'),
+    'load32x2_s': ('<2i', 'i64x2'),
+    'load32x2_u': ('<2I', 'i64x2'),
+}
+
+
+def _replace_lane(value: int, shape: str, laneidx: int, lane: LANE) -> int:
+    lanes = list(v128_lanes(value, shape, False))
+    lanes[laneidx] = lane
+    return v128_from_lanes(lanes, shape)
+
+def _lane_value(shape: str, lane: LANE) -> WASM_VALUE:
+    " Scalar value extracted from a lane "
+    bits = 64 if shape in ('i64x2', 'f64x2') else 32
+    return clamp('f' if shape[0] == 'f' else 'i', bits, lane)  # type: ignore
+
+def _execute_vector_memory(op: VectorMemoryInstructionBase, module: WasmModule, store: WasmStore, stack: List[WASM_VALUE]):
+    mem = store.mems[module.memaddrs[0]]
+
+    if op.op == 'store':
+        operand_v = int(stack.pop()[2])
+        ea = int(stack.pop()[2] + op.offset)
+        mem.write(ea, operand_v.to_bytes(16, 'little'))
+        return
+    if isinstance(op, VectorMemoryLaneInstructionBase):
+        operand_v = int(stack.pop()[2])
+        ea = int(stack.pop()[2] + op.offset)
+        bits = int(op.op[4:-5] if op.op.startswith('load') else op.op[5:-5])
+        shape = INT_SHAPES_BY_BITS[bits]
+        if op.op.startswith('store'):
+            lane = cast(int, v128_lanes(operand_v, shape, False)[op.laneidx])
+            mem.write(ea, lane.to_bytes(bits // 8, 'little'))
+        else:
+            lane = int.from_bytes(mem.read(ea, bits // 8), 'little')
+            stack.append(('v', 128, _replace_lane(operand_v, shape, op.laneidx, lane)))  # type: ignore
+        return
+
+    ea = int(stack.pop()[2] + op.offset)
+    if op.op == 'load':
+        value = int.from_bytes(mem.read(ea, 16), 'little')
+    elif op.op in _VECTOR_LOAD_EXTEND:
+        fmt, shape = _VECTOR_LOAD_EXTEND[op.op]
+        value = v128_from_lanes(struct.unpack(fmt, mem.read(ea, 8)), shape)
+    elif op.op.endswith('_splat'):
+        bits = int(op.op[4:-6])
+        value = int.from_bytes(mem.read(ea, bits // 8), 'little') * _ONES[bits]
+    elif op.op.endswith('_zero'):
+        bits = int(op.op[4:-5])
+        value = int.from_bytes(mem.read(ea, bits // 8), 'little')
+    else:
+        raise Exception(f'Unknown vector memory instruction: {op.op}')
+    stack.append(('v', 128, value))  # type: ignore
+
+def execute_vector_instruction(op: VectorInstructionBase, module: WasmModule, store: WasmStore, stack: List[WASM_VALUE]):
+    if isinstance(op, VectorMemoryInstructionBase):
+        _execute_vector_memory(op, module, store, stack)
+        return
+
+    if isinstance(op, V128Const):
+        result = op.value
+    elif isinstance(op, VectorUnopInstructionBase):
+        result = VECTOR_UNOP_FUNC[f'{op.shape}.{op.op}'](int(stack.pop()[2]))
+    elif isinstance(op, VectorBinopInstructionBase):
+        operand_c2 = int(stack.pop()[2])
+        operand_c1 = int(stack.pop()[2])
+        result = VECTOR_BINOP_FUNC[f'{op.shape}.{op.op}'](operand_c1, operand_c2)
+    elif isinstance(op, VectorRelopInstructionBase):
+        operand_c2 = int(stack.pop()[2])
+        operand_c1 = int(stack.pop()[2])
+        result = VECTOR_RELOP_FUNC[f'{op.shape}.{op.op}'](operand_c1, operand_c2)
+    elif isinstance(op, VectorTernopInstructionBase):  # v128.bitselect
+        operand_c3 = int(stack.pop()[2])
+        operand_c2 = int(stack.pop()[2])
+        operand_c1 = int(stack.pop()[2])
+        result = (operand_c1 & operand_c3) | (operand_c2 & (operand_c3 ^ V128_MASK))
+    elif isinstance(op, VectorShiftInstructionBase):
+        operand_s = int(stack.pop()[2])
+        operand_c1 = int(stack.pop()[2])
+        result = VECTOR_SHIFT_FUNC[op.op](operand_c1, operand_s, LANE_SHAPES[op.shape][3])
+    elif isinstance(op, VectorShuffleInstructionBase):
+        operand_c2 = int(stack.pop()[2])
+        operand_c1 = int(stack.pop()[2])
+        data = operand_c1.to_bytes(16, 'little') + operand_c2.to_bytes(16, 'little')
+        result = int.from_bytes(bytes(data[i] for i in op.lanes), 'little')
+    elif isinstance(op, VectorSplatInstructionBase):
+        operand_lane = stack.pop()[2]
+        if op.shape[0] == 'i':
+            bits = LANE_SHAPES[op.shape][3]
+            result = (int(operand_lane) & (2**bits - 1)) * _ONES[bits]
+        else:
+            result = v128_from_lanes([operand_lane] * LANE_SHAPES[op.shape][0], op.shape)
+
+    # these instructions do not return v128
+    elif isinstance(op, VectorTestInstructionBase):
+        operand_c1 = int(stack.pop()[2])
+        if op.op == 'any_true':
+            stack.append(('i', 32, 1 if operand_c1 != 0 else 0))
+        else:
+            bits = LANE_SHAPES[op.shape][3]
+            stack.append(('i', 32, 1 if _nonzero_lanes(operand_c1, bits) == _HIGHS[bits] else 0))
+        return
+    elif isinstance(op, VectorBitmaskInstructionBase):
+        operand_c1 = int(stack.pop()[2])
+        lanes = cast(Tuple[int, ...], v128_lanes(operand_c1, op.shape))
+        stack.append(('i', 32, sum(1 << i for i, x in enumerate(lanes) if x < 0)))
+        return
+    elif isinstance(op, VectorLaneInstructionBase):
+        if op.op.startswith('extract_lane'):
+            operand_c1 = int(stack.pop()[2])
+            lane = v128_lanes(operand_c1, op.shape, not op.op.endswith('_u'))[op.laneidx]
+            stack.append(_lane_value(op.shape, lane))
+            return
+        operand_lane = stack.pop()[2]
+        operand_c1 = int(stack.pop()[2])
+        result = _replace_lane(operand_c1, op.shape, op.laneidx, operand_lane)
+    else:
+        raise Exception(f'Unknown vector instruction: {op.shape}.{op.op}')
+
+    stack.append(('v', 128, result))  # type: ignore
@@ -0,0 +1,97 @@
+# Pool of instances which are reset between uses instead of being instantiated again
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from .context import WASM_EXPORT_OBJECT, WASM_PAGE_SIZE, WasmModule, WasmParsedModule
+from .initialization import compile_wasm_module, initialize_wasm_module, instantiate_wasm_module
+from .snapshot import WasmInstanceSnapshot, clone_instance, owned_memories, restore_instance_state, snapshot_instance
+
+
+class WasmInstancePool():
+    """
+    Hands out instances in the state of snapshot, and takes them back after use.
+    Returned instances are reset by restoring only memory pages written while they were out,
+    so that large memories mostly untouched by a request are reset almost for free.
+    Globals, tables and segments are small and restored entirely.
+    At most max_idle instances are kept, others are dropped on release.
+    """
+
+    def __init__(
+        self,
+        snapshot: WasmInstanceSnapshot,
+        import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]],
+        max_idle: int = 8,
+    ) -> None:
+        self.snapshot = snapshot
+        self.import_object = import_object
+        self.max_idle = max_idle
+        self._idle: List[WasmModule] = []
+        self._lock = threading.Lock()
+        self._memories = [memoryview(x) for x in snapshot.memories]
+        # pages which are zero in snapshot are discarded instead of copied, returning them to OS
+        zero_page = bytes(WASM_PAGE_SIZE)
+        self._zero_pages = [
+            {i // WASM_PAGE_SIZE for i in range(0, len(x), WASM_PAGE_SIZE) if x[i:i + WASM_PAGE_SIZE] == zero_page}
+            for x in self._memories
+        ]
+
+    @staticmethod
+    def from_module(
+        parsed_module: WasmParsedModule,
+        import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]],
+        max_idle: int = 8,
+    ) -> 'WasmInstancePool':
+        " Creates pool of instances in the state just after instantiation of parsed_module, including its start function "
+        compiled = compile_wasm_module(parsed_module)
+        module = initialize_wasm_module(compiled, import_object)
+        instantiate_wasm_module(module, compiled, import_object)
+        return WasmInstancePool(snapshot_instance(module, compiled), import_object, max_idle)
+
+    def acquire(self) -> WasmModule:
+        " Returns idle instance, or clone of snapshot if there is none "
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        module = clone_instance(self.snapshot, self.import_object)
+        for mem in owned_memories(module, self.snapshot.compiled):
+            mem.dirty = set()
+        return module
+
+    def release(self, module: WasmModule):
+        " Takes back instance acquired from this pool, which must not be used any more by the caller "
+        with self._lock:
+            if len(self._idle) >= self.max_idle:
+                return
+        self.reset(module)
+        with self._lock:
+            self._idle.append(module)
+
+    @contextmanager
+    def instance(self) -> Iterator[WasmModule]:
+        " Acquires instance for the duration of with block "
+        module = self.acquire()
+        try:
+            yield module
+        finally:
+            self.release(module)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def reset(self, module: WasmModule):
+        " Restores state of instance acquired from this pool to the snapshot "
+        for mem, saved, zero_pages in zip(owned_memories(module, self.snapshot.compiled), self._memories, self._zero_pages):
+            with mem.lock:
+                # pages added by memory.grow are dropped as a whole
+                if len(mem.data) > len(saved):
+                    mem.resize(len(saved))
+                for page in mem.dirty or ():
+                    begin = page * WASM_PAGE_SIZE
+                    if page in zero_pages:
+                        mem.discard(begin, WASM_PAGE_SIZE)
+                    elif begin < len(saved):
+                        mem.data[begin:begin + WASM_PAGE_SIZE] = saved[begin:begin + WASM_PAGE_SIZE]
+                mem.dirty = set()
+        restore_instance_state(self.snapshot, module)
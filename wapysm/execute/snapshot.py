@@ -0,0 +1,136 @@
+# Snapshots of instantiated modules, to create new instances without running their initialization again
+import os
+import pickle
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from ..parser.structure import WasmGlobalType, WasmLimits, WasmTableType
+from .context import WASM_EXPORT_OBJECT, WasmCompiledModule, WasmData, WasmElemUnresolved, WasmMemoryInstance, WasmModule
+from .initialization import compile_wasm_module, initialize_wasm_module
+from .utils import WASM_VALUE
+
+
+class WasmInstanceSnapshot():
+    """
+    State of an instance after its initialization: contents of its memories, values of its globals,
+    elements of its tables, and segments which are not dropped.
+    Only objects defined by the module are captured, as imported ones are given again for each clone.
+    """
+
+    def __init__(self, compiled: WasmCompiledModule) -> None:
+        self.compiled = compiled
+        self.memories = []
+        self.globals_ = []
+        self.tables = []
+        self.elem = {}
+        self.data = {}
+
+    compiled: WasmCompiledModule
+    memories: List[bytes]
+    globals_: List[WASM_VALUE]
+    # funcidx of each element, or None with original address for null reference
+    tables: List[List[Tuple[Optional[int], int]]]
+    elem: Dict[int, WasmElemUnresolved]
+    data: Dict[int, WasmData]
+
+    def save(self, path: str):
+        " Writes snapshot to file atomically "
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def load(path: str) -> 'WasmInstanceSnapshot':
+        " Reads snapshot written by save, which must come from trusted source "
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if not isinstance(snapshot, WasmInstanceSnapshot):
+            raise Exception(f'{path} is not a snapshot of instance')
+        return snapshot
+
+
+def _imported_counts(compiled: WasmCompiledModule) -> Tuple[int, int, int]:
+    " Numbers of imported tables, memories and globals, which come first in their index spaces "
+    descs = [x.importdesc for x in compiled.imports]
+    return (
+        sum(1 for x in descs if isinstance(x, WasmTableType)),
+        sum(1 for x in descs if isinstance(x, WasmLimits)),
+        sum(1 for x in descs if isinstance(x, WasmGlobalType)),
+    )
+
+
+def snapshot_instance(module: WasmModule, compiled: WasmCompiledModule) -> WasmInstanceSnapshot:
+    " Captures state of module instantiated from compiled "
+    compiled = compile_wasm_module(compiled)
+    store = module.store
+    tables_imported, mems_imported, globals_imported = _imported_counts(compiled)
+    snapshot = WasmInstanceSnapshot(compiled)
+
+    for idx in range(mems_imported, len(module.memaddrs)):
+        mem = store.mems[module.memaddrs[idx]]
+        with mem.lock:
+            snapshot.memories.append(bytes(mem.data))
+    for idx in range(globals_imported, len(module.globaladdrs)):
+        snapshot.globals_.append(store.globals_[module.globaladdrs[idx]].value)
+
+    funcidx_of_addr = {addr: funcidx for funcidx, addr in module.funcaddrs.items()}
+    for idx in range(tables_imported, len(module.tableaddrs)):
+        elements: List[Tuple[Optional[int], int]] = []
+        for addr in store.tables[module.tableaddrs[idx]].elem_addrs.values():
+            if addr in funcidx_of_addr:
+                elements.append((funcidx_of_addr[addr], addr))
+            elif addr in store.funcs:
+                raise Exception(f'table {idx} refers function {addr} of other module, which can not be captured')
+            else:
+                elements.append((None, addr))
+        snapshot.tables.append(elements)
+
+    # segments are not modified, only replaced when dropped
+    snapshot.elem = dict(module.elem)
+    snapshot.data = dict(module.data)
+    return snapshot
+
+
+def owned_memories(module: WasmModule, compiled: WasmCompiledModule) -> List[WasmMemoryInstance]:
+    " Memories defined by module, in the order of snapshot memories "
+    _, mems_imported, _ = _imported_counts(compiled)
+    return [module.store.mems[module.memaddrs[idx]] for idx in range(mems_imported, len(module.memaddrs))]
+
+
+def restore_instance_state(snapshot: WasmInstanceSnapshot, module: WasmModule):
+    " Restores globals, tables and segments of module instantiated from snapshot.compiled, but not memories "
+    store = module.store
+    tables_imported, _, globals_imported = _imported_counts(snapshot.compiled)
+
+    for idx, value in enumerate(snapshot.globals_, globals_imported):
+        store.globals_[module.globaladdrs[idx]].value = value
+    for idx, elements in enumerate(snapshot.tables, tables_imported):
+        table = store.tables[module.tableaddrs[idx]]
+        table.elem_addrs = {}
+        table.elem = {}
+        for jdx, (funcidx, addr) in enumerate(elements):
+            if funcidx is None:
+                table.elem_addrs[jdx] = addr
+            else:
+                table.elem_addrs[jdx] = module.funcaddrs[funcidx]
+                table.elem[jdx] = store.funcs[module.funcaddrs[funcidx]]
+
+    module.elem = dict(snapshot.elem)
+    module.data = dict(snapshot.data)
+
+
+def clone_instance(snapshot: WasmInstanceSnapshot, externval: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> WasmModule:
+    """
+    Creates new instance in the state of snapshot, without running start function nor initializing segments.
+    Imports are resolved from externval as in instantiation.
+    """
+    module = initialize_wasm_module(snapshot.compiled, externval)
+    for mem, data in zip(owned_memories(module, snapshot.compiled), snapshot.memories):
+        mem.load(data)
+    restore_instance_state(snapshot, module)
+    return module
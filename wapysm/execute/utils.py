@@ -1,6 +1,6 @@
 # flake8: noqa: E704,E701,E222
 
-from math import copysign, floor, isinf, isnan, sqrt
+from math import copysign, floor, isinf, isnan, sqrt, trunc
 from typing import Any, Dict, Tuple, Union, cast
 from ..parser.structure import TYPES_TO_TYPENAME, VALTYPE_TYPE
 from ..opcode.numeric_generated import INT_OR_FLOAT, VALID_BITS
@@ -24,6 +24,14 @@ class WasmTrappedException(Exception):
     def msg(self):
         return '\n\n'.join([self.orig_msg] + self.wasm_stacktrace)
 
+    def __reduce__(self):
+        # to be raised in other processes, e.g. from WasmProcessPool workers
+        return (self.__class__, (self.orig_msg, self.op, *self.operands), {'wasm_stacktrace': self.wasm_stacktrace})
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.update_message()
+
 def trap(op, *operands):
     raise WasmTrappedException('trapped: %s' % repr(op), op, *operands)
 
@@ -343,5 +351,26 @@ def wasm_i32_signed_to_i64(a: int) -> int:
     # bits beyond 64bit is acceptable; it's get trimmed somewhere
     return unclamp_32bit(a)
 
+def wasm_iextend_signed(a: int, bits: int) -> int:
+    " iextendN_s "
+    a = a & (2**bits - 1)
+    return a - 2**bits if a & 2**(bits - 1) else a
+
+def wasm_trunc_sat_unsigned(value: float, bits: VALID_BITS) -> int:
+    " trunc_sat_u "
+    if isnan(value):
+        return 0
+    if isinf(value):
+        return 0 if value < 0 else 2**bits - 1
+    return max(0, min(2**bits - 1, trunc(value)))
+
+def wasm_trunc_sat_signed(value: float, bits: VALID_BITS) -> int:
+    " trunc_sat_s "
+    if isnan(value):
+        return 0
+    if isinf(value):
+        return -2**(bits - 1) if value < 0 else 2**(bits - 1) - 1
+    return max(-2**(bits - 1), min(2**(bits - 1) - 1, trunc(value)))
+
 def typeof(value: WASM_VALUE) -> VALTYPE_TYPE:
     return cast(VALTYPE_TYPE, f'{value[0]}{value[1]}')
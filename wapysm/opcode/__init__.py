@@ -2,17 +2,30 @@
 # This defines structure of all instructions,
 # and not responsible for parsing binaries or texts.
 
-from typing import List
+from typing import List, Optional
 from ..parser.structure import VALTYPE_TYPE
 
 
-class InstructionBase(object):
-    _debug_internal_index = 0
+class _InstructionMeta(type):
+    """
+    Gives empty __slots__ to instruction classes which don't declare their own,
+    so that no instruction has per-instance __dict__.
+    Operands are declared in __slots__ of the class introducing them, and set by the parser.
+    """
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        namespace.setdefault('__slots__', ())
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+class InstructionBase(metaclass=_InstructionMeta):
+    __slots__ = ('_debug_internal_index', )
+    _debug_internal_index: int
 
     def __repr__(self) -> str:
         exclude_names = ('instr', 'else_block', '_debug_internal_index')
-        ddr = self.__dict__
-        ddr = dict((k, v) for k, v in ddr.items() if not (k.startswith('__') or k in exclude_names))
+        ddr = dict(
+            (k, getattr(self, k))
+            for cls in reversed(type(self).__mro__) for k in getattr(cls, '__slots__', ())
+            if k not in exclude_names and hasattr(self, k))
         return f'{type(self).__name__}: {repr(ddr)}' if ddr else super().__repr__()
 
 # 2.4.1 Numeric Instructions
@@ -30,7 +43,8 @@ class SelectInstruction(InstructionBase):
 # 2.4.3 Variable Instructions
 
 class VariableInstructionBase(InstructionBase):
-    index: int = 0
+    __slots__ = ('index', )
+    index: int
 
 class LocalGetInstruction(VariableInstructionBase):
     pass
@@ -51,6 +65,34 @@ class GlobalSetInstruction(VariableInstructionBase):
 
 # See /opcode_autogen.py and ./memory_generated.py
 
+class DataDrop(InstructionBase):
+    "data.drop"
+    __slots__ = ('dataidx', )
+    dataidx: int
+
+class AtomicFence(InstructionBase):
+    "atomic.fence (threads proposal)"
+    pass
+
+# Table Instructions (bulk memory operations)
+
+class TableInit(InstructionBase):
+    "table.init"
+    __slots__ = ('elemidx', 'tableidx')
+    elemidx: int
+    tableidx: int
+
+class ElemDrop(InstructionBase):
+    "elem.drop"
+    __slots__ = ('elemidx', )
+    elemidx: int
+
+class TableCopy(InstructionBase):
+    "table.copy"
+    __slots__ = ('dest_tableidx', 'src_tableidx')
+    dest_tableidx: int
+    src_tableidx: int
+
 # 2.4.5 Control Instructions
 
 class Unreachable(InstructionBase):
@@ -60,8 +102,16 @@ class Nop(InstructionBase):
     "nop"
 
 class BlockInstructionBase(InstructionBase):
-    resultype: List[VALTYPE_TYPE] = []
-    instr: List[InstructionBase] = []
+    __slots__ = ('resultype', 'typeidx', 'instr')
+    resultype: List[VALTYPE_TYPE]
+    # set instead of resultype when block has parameters or multiple results
+    typeidx: Optional[int]
+    instr: List[InstructionBase]
+
+    def __init__(self) -> None:
+        self.resultype = []
+        self.typeidx = None
+        self.instr = []
 
 class Block(BlockInstructionBase):
     "block"
@@ -71,11 +121,17 @@ class Loop(BlockInstructionBase):
 
 class IfElse(BlockInstructionBase):
     "if_else"
-    else_block: List[InstructionBase] = []
+    __slots__ = ('else_block', )
+    else_block: List[InstructionBase]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.else_block = []
 
 
 class BranchInstructionBase(InstructionBase):
-    labelidx: int = 0
+    __slots__ = ('labelidx', )
+    labelidx: int
 
 class Br(BranchInstructionBase):
     "br"
@@ -85,8 +141,9 @@ class BrIf(BranchInstructionBase):
 
 class BrTable(InstructionBase):
     "br_table"
-    labelindices: List[int] = []
-    lastlabel: int = 0
+    __slots__ = ('labelindices', 'lastlabel')
+    labelindices: List[int]
+    lastlabel: int
 
 class Return(InstructionBase):
     "return"
@@ -97,8 +154,22 @@ class CallInstructionBase(BranchInstructionBase):
 
 class Call(CallInstructionBase):
     "call"
-    callidx: int = 0
+    __slots__ = ('callidx', )
+    callidx: int
 
 class CallIndirect(CallInstructionBase):
     "call_indirect"
-    typeidx: int = 0
+    __slots__ = ('typeidx', 'tableidx')
+    typeidx: int
+    tableidx: int
+
+class ReturnCall(CallInstructionBase):
+    "return_call"
+    __slots__ = ('callidx', )
+    callidx: int
+
+class ReturnCallIndirect(CallInstructionBase):
+    "return_call_indirect"
+    __slots__ = ('typeidx', 'tableidx')
+    typeidx: int
+    tableidx: int
@@ -10,6 +10,7 @@ VALID_BITS = Literal[32, 64]
 SIGNED = Optional[Literal['u', 's']]
 
 class MemoryLoadStoreInstructionBase(InstructionBase):
+    __slots__ = ('offset', 'align')
     type: INT_OR_FLOAT
     bits: VALID_BITS
     op: str
@@ -161,3 +162,421 @@ class MemorySize(InstructionBase):
 
 class MemoryGrow(InstructionBase):
     op: str = 'memory.grow'
+
+# Bulk memory operations
+
+class MemoryInit(InstructionBase):
+    op: str = 'memory.init'
+    __slots__ = ('dataidx', )
+    dataidx: int
+
+class MemoryCopy(InstructionBase):
+    op: str = 'memory.copy'
+
+class MemoryFill(InstructionBase):
+    op: str = 'memory.fill'
+
+# Atomic memory instructions (threads proposal)
+
+class AtomicMemoryInstructionBase(InstructionBase):
+    __slots__ = ('offset', 'align')
+    type: INT_OR_FLOAT = 'i'
+    bits: VALID_BITS
+    width: int  # bits accessed in memory
+    op: str
+    rmw: Optional[str] = None
+    offset: int
+    align: int
+
+class MemoryAtomicNotify(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'memory.atomic.notify'
+
+class MemoryAtomicWait32(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'memory.atomic.wait32'
+
+class MemoryAtomicWait64(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 64
+    op: str = 'memory.atomic.wait64'
+
+class I32Atomic_load(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_load'
+    rmw: Optional[str] = None
+
+class I64Atomic_load(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_load'
+    rmw: Optional[str] = None
+
+class I32Atomic_load8_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_load8_u'
+    rmw: Optional[str] = None
+
+class I32Atomic_load16_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_load16_u'
+    rmw: Optional[str] = None
+
+class I64Atomic_load8_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_load8_u'
+    rmw: Optional[str] = None
+
+class I64Atomic_load16_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_load16_u'
+    rmw: Optional[str] = None
+
+class I64Atomic_load32_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_load32_u'
+    rmw: Optional[str] = None
+
+class I32Atomic_store(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_store'
+    rmw: Optional[str] = None
+
+class I64Atomic_store(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_store'
+    rmw: Optional[str] = None
+
+class I32Atomic_store8(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_store8'
+    rmw: Optional[str] = None
+
+class I32Atomic_store16(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_store16'
+    rmw: Optional[str] = None
+
+class I64Atomic_store8(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_store8'
+    rmw: Optional[str] = None
+
+class I64Atomic_store16(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_store16'
+    rmw: Optional[str] = None
+
+class I64Atomic_store32(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_store32'
+    rmw: Optional[str] = None
+
+class I32Atomic_rmw_add(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_add'
+    rmw: Optional[str] = 'add'
+
+class I64Atomic_rmw_add(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_add'
+    rmw: Optional[str] = 'add'
+
+class I32Atomic_rmw8_add_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_add_u'
+    rmw: Optional[str] = 'add'
+
+class I32Atomic_rmw16_add_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_add_u'
+    rmw: Optional[str] = 'add'
+
+class I64Atomic_rmw8_add_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_add_u'
+    rmw: Optional[str] = 'add'
+
+class I64Atomic_rmw16_add_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_add_u'
+    rmw: Optional[str] = 'add'
+
+class I64Atomic_rmw32_add_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_add_u'
+    rmw: Optional[str] = 'add'
+
+class I32Atomic_rmw_sub(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_sub'
+    rmw: Optional[str] = 'sub'
+
+class I64Atomic_rmw_sub(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_sub'
+    rmw: Optional[str] = 'sub'
+
+class I32Atomic_rmw8_sub_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_sub_u'
+    rmw: Optional[str] = 'sub'
+
+class I32Atomic_rmw16_sub_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_sub_u'
+    rmw: Optional[str] = 'sub'
+
+class I64Atomic_rmw8_sub_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_sub_u'
+    rmw: Optional[str] = 'sub'
+
+class I64Atomic_rmw16_sub_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_sub_u'
+    rmw: Optional[str] = 'sub'
+
+class I64Atomic_rmw32_sub_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_sub_u'
+    rmw: Optional[str] = 'sub'
+
+class I32Atomic_rmw_and(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_and'
+    rmw: Optional[str] = 'and'
+
+class I64Atomic_rmw_and(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_and'
+    rmw: Optional[str] = 'and'
+
+class I32Atomic_rmw8_and_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_and_u'
+    rmw: Optional[str] = 'and'
+
+class I32Atomic_rmw16_and_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_and_u'
+    rmw: Optional[str] = 'and'
+
+class I64Atomic_rmw8_and_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_and_u'
+    rmw: Optional[str] = 'and'
+
+class I64Atomic_rmw16_and_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_and_u'
+    rmw: Optional[str] = 'and'
+
+class I64Atomic_rmw32_and_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_and_u'
+    rmw: Optional[str] = 'and'
+
+class I32Atomic_rmw_or(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_or'
+    rmw: Optional[str] = 'or'
+
+class I64Atomic_rmw_or(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_or'
+    rmw: Optional[str] = 'or'
+
+class I32Atomic_rmw8_or_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_or_u'
+    rmw: Optional[str] = 'or'
+
+class I32Atomic_rmw16_or_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_or_u'
+    rmw: Optional[str] = 'or'
+
+class I64Atomic_rmw8_or_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_or_u'
+    rmw: Optional[str] = 'or'
+
+class I64Atomic_rmw16_or_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_or_u'
+    rmw: Optional[str] = 'or'
+
+class I64Atomic_rmw32_or_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_or_u'
+    rmw: Optional[str] = 'or'
+
+class I32Atomic_rmw_xor(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_xor'
+    rmw: Optional[str] = 'xor'
+
+class I64Atomic_rmw_xor(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_xor'
+    rmw: Optional[str] = 'xor'
+
+class I32Atomic_rmw8_xor_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_xor_u'
+    rmw: Optional[str] = 'xor'
+
+class I32Atomic_rmw16_xor_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_xor_u'
+    rmw: Optional[str] = 'xor'
+
+class I64Atomic_rmw8_xor_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_xor_u'
+    rmw: Optional[str] = 'xor'
+
+class I64Atomic_rmw16_xor_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_xor_u'
+    rmw: Optional[str] = 'xor'
+
+class I64Atomic_rmw32_xor_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_xor_u'
+    rmw: Optional[str] = 'xor'
+
+class I32Atomic_rmw_xchg(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_xchg'
+    rmw: Optional[str] = 'xchg'
+
+class I64Atomic_rmw_xchg(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_xchg'
+    rmw: Optional[str] = 'xchg'
+
+class I32Atomic_rmw8_xchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_xchg_u'
+    rmw: Optional[str] = 'xchg'
+
+class I32Atomic_rmw16_xchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_xchg_u'
+    rmw: Optional[str] = 'xchg'
+
+class I64Atomic_rmw8_xchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_xchg_u'
+    rmw: Optional[str] = 'xchg'
+
+class I64Atomic_rmw16_xchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_xchg_u'
+    rmw: Optional[str] = 'xchg'
+
+class I64Atomic_rmw32_xchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_xchg_u'
+    rmw: Optional[str] = 'xchg'
+
+class I32Atomic_rmw_cmpxchg(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 32
+    op: str = 'atomic_rmw_cmpxchg'
+    rmw: Optional[str] = 'cmpxchg'
+
+class I64Atomic_rmw_cmpxchg(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 64
+    op: str = 'atomic_rmw_cmpxchg'
+    rmw: Optional[str] = 'cmpxchg'
+
+class I32Atomic_rmw8_cmpxchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 8
+    op: str = 'atomic_rmw8_cmpxchg_u'
+    rmw: Optional[str] = 'cmpxchg'
+
+class I32Atomic_rmw16_cmpxchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 32
+    width: int = 16
+    op: str = 'atomic_rmw16_cmpxchg_u'
+    rmw: Optional[str] = 'cmpxchg'
+
+class I64Atomic_rmw8_cmpxchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 8
+    op: str = 'atomic_rmw8_cmpxchg_u'
+    rmw: Optional[str] = 'cmpxchg'
+
+class I64Atomic_rmw16_cmpxchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 16
+    op: str = 'atomic_rmw16_cmpxchg_u'
+    rmw: Optional[str] = 'cmpxchg'
+
+class I64Atomic_rmw32_cmpxchg_u(AtomicMemoryInstructionBase):
+    bits: VALID_BITS = 64
+    width: int = 32
+    op: str = 'atomic_rmw32_cmpxchg_u'
+    rmw: Optional[str] = 'cmpxchg'
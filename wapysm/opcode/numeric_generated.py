@@ -15,6 +15,7 @@ class NumericInstructionBase(InstructionBase):
 
 
 class ConstantInstructionBase(NumericInstructionBase):
+    __slots__ = ('value', )
     type: INT_OR_FLOAT
     value: Union[int, float]
     bits: VALID_BITS
@@ -22,22 +23,22 @@ class ConstantInstructionBase(NumericInstructionBase):
 
 class I32Const(ConstantInstructionBase):
     type: INT_OR_FLOAT = 'i'
-    value: int = 0
+    value: int
     bits: VALID_BITS = 32
 
 class I64Const(ConstantInstructionBase):
     type: INT_OR_FLOAT = 'i'
-    value: int = 0
+    value: int
     bits: VALID_BITS = 64
 
 class F32Const(ConstantInstructionBase):
     type: INT_OR_FLOAT = 'f'
-    value: float = 0
+    value: float
     bits: VALID_BITS = 32
 
 class F64Const(ConstantInstructionBase):
     type: INT_OR_FLOAT = 'f'
-    value: float = 0
+    value: float
     bits: VALID_BITS = 64
 
 
@@ -547,11 +548,41 @@ class I64Extend_i32_u(CvtInstructionBase):
     op: str = 'extend_i32_u'
     type: INT_OR_FLOAT = 'i'
 
+class I32Extend8_s(CvtInstructionBase):
+    bits: VALID_BITS = 32
+    op: str = 'extend8_s'
+    type: INT_OR_FLOAT = 'i'
+
+class I32Extend16_s(CvtInstructionBase):
+    bits: VALID_BITS = 32
+    op: str = 'extend16_s'
+    type: INT_OR_FLOAT = 'i'
+
+class I64Extend8_s(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'extend8_s'
+    type: INT_OR_FLOAT = 'i'
+
+class I64Extend16_s(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'extend16_s'
+    type: INT_OR_FLOAT = 'i'
+
+class I64Extend32_s(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'extend32_s'
+    type: INT_OR_FLOAT = 'i'
+
 class I32Trunc_f32_s(CvtInstructionBase):
     bits: VALID_BITS = 32
     op: str = 'trunc_f32_s'
     type: INT_OR_FLOAT = 'i'
 
+class I32Trunc_sat_f32_s(CvtInstructionBase):
+    bits: VALID_BITS = 32
+    op: str = 'trunc_sat_f32_s'
+    type: INT_OR_FLOAT = 'i'
+
 class F32Convert_i32_s(CvtInstructionBase):
     bits: VALID_BITS = 32
     op: str = 'convert_i32_s'
@@ -562,6 +593,11 @@ class I32Trunc_f32_u(CvtInstructionBase):
     op: str = 'trunc_f32_u'
     type: INT_OR_FLOAT = 'i'
 
+class I32Trunc_sat_f32_u(CvtInstructionBase):
+    bits: VALID_BITS = 32
+    op: str = 'trunc_sat_f32_u'
+    type: INT_OR_FLOAT = 'i'
+
 class F32Convert_i32_u(CvtInstructionBase):
     bits: VALID_BITS = 32
     op: str = 'convert_i32_u'
@@ -572,6 +608,11 @@ class I32Trunc_f64_s(CvtInstructionBase):
     op: str = 'trunc_f64_s'
     type: INT_OR_FLOAT = 'i'
 
+class I32Trunc_sat_f64_s(CvtInstructionBase):
+    bits: VALID_BITS = 32
+    op: str = 'trunc_sat_f64_s'
+    type: INT_OR_FLOAT = 'i'
+
 class F32Convert_i64_s(CvtInstructionBase):
     bits: VALID_BITS = 32
     op: str = 'convert_i64_s'
@@ -582,6 +623,11 @@ class I32Trunc_f64_u(CvtInstructionBase):
     op: str = 'trunc_f64_u'
     type: INT_OR_FLOAT = 'i'
 
+class I32Trunc_sat_f64_u(CvtInstructionBase):
+    bits: VALID_BITS = 32
+    op: str = 'trunc_sat_f64_u'
+    type: INT_OR_FLOAT = 'i'
+
 class F32Convert_i64_u(CvtInstructionBase):
     bits: VALID_BITS = 32
     op: str = 'convert_i64_u'
@@ -592,6 +638,11 @@ class I64Trunc_f32_s(CvtInstructionBase):
     op: str = 'trunc_f32_s'
     type: INT_OR_FLOAT = 'i'
 
+class I64Trunc_sat_f32_s(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'trunc_sat_f32_s'
+    type: INT_OR_FLOAT = 'i'
+
 class F64Convert_i32_s(CvtInstructionBase):
     bits: VALID_BITS = 64
     op: str = 'convert_i32_s'
@@ -602,6 +653,11 @@ class I64Trunc_f32_u(CvtInstructionBase):
     op: str = 'trunc_f32_u'
     type: INT_OR_FLOAT = 'i'
 
+class I64Trunc_sat_f32_u(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'trunc_sat_f32_u'
+    type: INT_OR_FLOAT = 'i'
+
 class F64Convert_i32_u(CvtInstructionBase):
     bits: VALID_BITS = 64
     op: str = 'convert_i32_u'
@@ -612,6 +668,11 @@ class I64Trunc_f64_s(CvtInstructionBase):
     op: str = 'trunc_f64_s'
     type: INT_OR_FLOAT = 'i'
 
+class I64Trunc_sat_f64_s(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'trunc_sat_f64_s'
+    type: INT_OR_FLOAT = 'i'
+
 class F64Convert_i64_s(CvtInstructionBase):
     bits: VALID_BITS = 64
     op: str = 'convert_i64_s'
@@ -622,6 +683,11 @@ class I64Trunc_f64_u(CvtInstructionBase):
     op: str = 'trunc_f64_u'
     type: INT_OR_FLOAT = 'i'
 
+class I64Trunc_sat_f64_u(CvtInstructionBase):
+    bits: VALID_BITS = 64
+    op: str = 'trunc_sat_f64_u'
+    type: INT_OR_FLOAT = 'i'
+
 class F64Convert_i64_u(CvtInstructionBase):
     bits: VALID_BITS = 64
     op: str = 'convert_i64_u'
@@ -0,0 +1,1001 @@
+# Vector Instructions (SIMD proposal)
+# Automatically generated. DO NOT EDIT
+
+from typing import Literal
+from . import InstructionBase
+
+
+SHAPE = Literal['v128', 'i8x16', 'i16x8', 'i32x4', 'i64x2', 'f32x4', 'f64x2']
+
+class VectorInstructionBase(InstructionBase):
+    shape: SHAPE
+    op: str
+
+class VectorMemoryInstructionBase(VectorInstructionBase):
+    __slots__ = ('offset', 'align')
+    offset: int
+    align: int
+
+class VectorMemoryLaneInstructionBase(VectorMemoryInstructionBase):
+    __slots__ = ('laneidx', )
+    laneidx: int
+
+class VectorConstInstructionBase(VectorInstructionBase):
+    __slots__ = ('value', )
+    value: int
+
+class VectorShuffleInstructionBase(VectorInstructionBase):
+    __slots__ = ('lanes', )
+    lanes: bytes
+
+class VectorSplatInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorLaneInstructionBase(VectorInstructionBase):
+    __slots__ = ('laneidx', )
+    laneidx: int
+
+class VectorUnopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorBinopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorTernopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorRelopInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorShiftInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorTestInstructionBase(VectorInstructionBase):
+    pass
+
+class VectorBitmaskInstructionBase(VectorInstructionBase):
+    pass
+
+class V128Load(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load'
+
+class V128Load8x8_s(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load8x8_s'
+
+class V128Load8x8_u(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load8x8_u'
+
+class V128Load16x4_s(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load16x4_s'
+
+class V128Load16x4_u(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load16x4_u'
+
+class V128Load32x2_s(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load32x2_s'
+
+class V128Load32x2_u(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load32x2_u'
+
+class V128Load8_splat(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load8_splat'
+
+class V128Load16_splat(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load16_splat'
+
+class V128Load32_splat(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load32_splat'
+
+class V128Load64_splat(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load64_splat'
+
+class V128Store(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'store'
+
+class V128Const(VectorConstInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'const'
+
+class I8x16Shuffle(VectorShuffleInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'shuffle'
+
+class I8x16Swizzle(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'swizzle'
+
+class I8x16Splat(VectorSplatInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'splat'
+
+class I16x8Splat(VectorSplatInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'splat'
+
+class I32x4Splat(VectorSplatInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'splat'
+
+class I64x2Splat(VectorSplatInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'splat'
+
+class F32x4Splat(VectorSplatInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'splat'
+
+class F64x2Splat(VectorSplatInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'splat'
+
+class I8x16Extract_lane_s(VectorLaneInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'extract_lane_s'
+
+class I8x16Extract_lane_u(VectorLaneInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'extract_lane_u'
+
+class I8x16Replace_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'replace_lane'
+
+class I16x8Extract_lane_s(VectorLaneInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extract_lane_s'
+
+class I16x8Extract_lane_u(VectorLaneInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extract_lane_u'
+
+class I16x8Replace_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'replace_lane'
+
+class I32x4Extract_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extract_lane'
+
+class I32x4Replace_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'replace_lane'
+
+class I64x2Extract_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extract_lane'
+
+class I64x2Replace_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'replace_lane'
+
+class F32x4Extract_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'extract_lane'
+
+class F32x4Replace_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'replace_lane'
+
+class F64x2Extract_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'extract_lane'
+
+class F64x2Replace_lane(VectorLaneInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'replace_lane'
+
+class I8x16Eq(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'eq'
+
+class I8x16Ne(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'ne'
+
+class I8x16Lt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'lt_s'
+
+class I8x16Lt_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'lt_u'
+
+class I8x16Gt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'gt_s'
+
+class I8x16Gt_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'gt_u'
+
+class I8x16Le_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'le_s'
+
+class I8x16Le_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'le_u'
+
+class I8x16Ge_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'ge_s'
+
+class I8x16Ge_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'ge_u'
+
+class I16x8Eq(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'eq'
+
+class I16x8Ne(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'ne'
+
+class I16x8Lt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'lt_s'
+
+class I16x8Lt_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'lt_u'
+
+class I16x8Gt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'gt_s'
+
+class I16x8Gt_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'gt_u'
+
+class I16x8Le_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'le_s'
+
+class I16x8Le_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'le_u'
+
+class I16x8Ge_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'ge_s'
+
+class I16x8Ge_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'ge_u'
+
+class I32x4Eq(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'eq'
+
+class I32x4Ne(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'ne'
+
+class I32x4Lt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'lt_s'
+
+class I32x4Lt_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'lt_u'
+
+class I32x4Gt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'gt_s'
+
+class I32x4Gt_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'gt_u'
+
+class I32x4Le_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'le_s'
+
+class I32x4Le_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'le_u'
+
+class I32x4Ge_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'ge_s'
+
+class I32x4Ge_u(VectorRelopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'ge_u'
+
+class F32x4Eq(VectorRelopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'eq'
+
+class F32x4Ne(VectorRelopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'ne'
+
+class F32x4Lt(VectorRelopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'lt'
+
+class F32x4Gt(VectorRelopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'gt'
+
+class F32x4Le(VectorRelopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'le'
+
+class F32x4Ge(VectorRelopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'ge'
+
+class F64x2Eq(VectorRelopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'eq'
+
+class F64x2Ne(VectorRelopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'ne'
+
+class F64x2Lt(VectorRelopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'lt'
+
+class F64x2Gt(VectorRelopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'gt'
+
+class F64x2Le(VectorRelopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'le'
+
+class F64x2Ge(VectorRelopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'ge'
+
+class V128Not(VectorUnopInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'not'
+
+class V128And(VectorBinopInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'and'
+
+class V128Andnot(VectorBinopInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'andnot'
+
+class V128Or(VectorBinopInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'or'
+
+class V128Xor(VectorBinopInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'xor'
+
+class V128Bitselect(VectorTernopInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'bitselect'
+
+class V128Any_true(VectorTestInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'any_true'
+
+class V128Load8_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load8_lane'
+
+class V128Load16_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load16_lane'
+
+class V128Load32_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load32_lane'
+
+class V128Load64_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load64_lane'
+
+class V128Store8_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'store8_lane'
+
+class V128Store16_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'store16_lane'
+
+class V128Store32_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'store32_lane'
+
+class V128Store64_lane(VectorMemoryLaneInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'store64_lane'
+
+class V128Load32_zero(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load32_zero'
+
+class V128Load64_zero(VectorMemoryInstructionBase):
+    shape: SHAPE = 'v128'
+    op: str = 'load64_zero'
+
+class F32x4Demote_f64x2_zero(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'demote_f64x2_zero'
+
+class F64x2Promote_low_f32x4(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'promote_low_f32x4'
+
+class I8x16Abs(VectorUnopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'abs'
+
+class I8x16Neg(VectorUnopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'neg'
+
+class I8x16Popcnt(VectorUnopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'popcnt'
+
+class I8x16All_true(VectorTestInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'all_true'
+
+class I8x16Bitmask(VectorBitmaskInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'bitmask'
+
+class I8x16Narrow_i16x8_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'narrow_i16x8_s'
+
+class I8x16Narrow_i16x8_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'narrow_i16x8_u'
+
+class F32x4Ceil(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'ceil'
+
+class F32x4Floor(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'floor'
+
+class F32x4Trunc(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'trunc'
+
+class F32x4Nearest(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'nearest'
+
+class I8x16Shl(VectorShiftInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'shl'
+
+class I8x16Shr_s(VectorShiftInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'shr_s'
+
+class I8x16Shr_u(VectorShiftInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'shr_u'
+
+class I8x16Add(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'add'
+
+class I8x16Add_sat_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'add_sat_s'
+
+class I8x16Add_sat_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'add_sat_u'
+
+class I8x16Sub(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'sub'
+
+class I8x16Sub_sat_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'sub_sat_s'
+
+class I8x16Sub_sat_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'sub_sat_u'
+
+class F64x2Ceil(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'ceil'
+
+class F64x2Floor(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'floor'
+
+class I8x16Min_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'min_s'
+
+class I8x16Min_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'min_u'
+
+class I8x16Max_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'max_s'
+
+class I8x16Max_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'max_u'
+
+class F64x2Trunc(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'trunc'
+
+class I8x16Avgr_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i8x16'
+    op: str = 'avgr_u'
+
+class I16x8Extadd_pairwise_i8x16_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extadd_pairwise_i8x16_s'
+
+class I16x8Extadd_pairwise_i8x16_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extadd_pairwise_i8x16_u'
+
+class I32x4Extadd_pairwise_i16x8_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extadd_pairwise_i16x8_s'
+
+class I32x4Extadd_pairwise_i16x8_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extadd_pairwise_i16x8_u'
+
+class I16x8Abs(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'abs'
+
+class I16x8Neg(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'neg'
+
+class I16x8Q15mulr_sat_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'q15mulr_sat_s'
+
+class I16x8All_true(VectorTestInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'all_true'
+
+class I16x8Bitmask(VectorBitmaskInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'bitmask'
+
+class I16x8Narrow_i32x4_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'narrow_i32x4_s'
+
+class I16x8Narrow_i32x4_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'narrow_i32x4_u'
+
+class I16x8Extend_low_i8x16_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extend_low_i8x16_s'
+
+class I16x8Extend_high_i8x16_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extend_high_i8x16_s'
+
+class I16x8Extend_low_i8x16_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extend_low_i8x16_u'
+
+class I16x8Extend_high_i8x16_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extend_high_i8x16_u'
+
+class I16x8Shl(VectorShiftInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'shl'
+
+class I16x8Shr_s(VectorShiftInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'shr_s'
+
+class I16x8Shr_u(VectorShiftInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'shr_u'
+
+class I16x8Add(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'add'
+
+class I16x8Add_sat_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'add_sat_s'
+
+class I16x8Add_sat_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'add_sat_u'
+
+class I16x8Sub(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'sub'
+
+class I16x8Sub_sat_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'sub_sat_s'
+
+class I16x8Sub_sat_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'sub_sat_u'
+
+class F64x2Nearest(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'nearest'
+
+class I16x8Mul(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'mul'
+
+class I16x8Min_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'min_s'
+
+class I16x8Min_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'min_u'
+
+class I16x8Max_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'max_s'
+
+class I16x8Max_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'max_u'
+
+class I16x8Avgr_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'avgr_u'
+
+class I16x8Extmul_low_i8x16_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extmul_low_i8x16_s'
+
+class I16x8Extmul_high_i8x16_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extmul_high_i8x16_s'
+
+class I16x8Extmul_low_i8x16_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extmul_low_i8x16_u'
+
+class I16x8Extmul_high_i8x16_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i16x8'
+    op: str = 'extmul_high_i8x16_u'
+
+class I32x4Abs(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'abs'
+
+class I32x4Neg(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'neg'
+
+class I32x4All_true(VectorTestInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'all_true'
+
+class I32x4Bitmask(VectorBitmaskInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'bitmask'
+
+class I32x4Extend_low_i16x8_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extend_low_i16x8_s'
+
+class I32x4Extend_high_i16x8_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extend_high_i16x8_s'
+
+class I32x4Extend_low_i16x8_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extend_low_i16x8_u'
+
+class I32x4Extend_high_i16x8_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extend_high_i16x8_u'
+
+class I32x4Shl(VectorShiftInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'shl'
+
+class I32x4Shr_s(VectorShiftInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'shr_s'
+
+class I32x4Shr_u(VectorShiftInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'shr_u'
+
+class I32x4Add(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'add'
+
+class I32x4Sub(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'sub'
+
+class I32x4Mul(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'mul'
+
+class I32x4Min_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'min_s'
+
+class I32x4Min_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'min_u'
+
+class I32x4Max_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'max_s'
+
+class I32x4Max_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'max_u'
+
+class I32x4Dot_i16x8_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'dot_i16x8_s'
+
+class I32x4Extmul_low_i16x8_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extmul_low_i16x8_s'
+
+class I32x4Extmul_high_i16x8_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extmul_high_i16x8_s'
+
+class I32x4Extmul_low_i16x8_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extmul_low_i16x8_u'
+
+class I32x4Extmul_high_i16x8_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'extmul_high_i16x8_u'
+
+class I64x2Abs(VectorUnopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'abs'
+
+class I64x2Neg(VectorUnopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'neg'
+
+class I64x2All_true(VectorTestInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'all_true'
+
+class I64x2Bitmask(VectorBitmaskInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'bitmask'
+
+class I64x2Extend_low_i32x4_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extend_low_i32x4_s'
+
+class I64x2Extend_high_i32x4_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extend_high_i32x4_s'
+
+class I64x2Extend_low_i32x4_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extend_low_i32x4_u'
+
+class I64x2Extend_high_i32x4_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extend_high_i32x4_u'
+
+class I64x2Shl(VectorShiftInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'shl'
+
+class I64x2Shr_s(VectorShiftInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'shr_s'
+
+class I64x2Shr_u(VectorShiftInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'shr_u'
+
+class I64x2Add(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'add'
+
+class I64x2Sub(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'sub'
+
+class I64x2Mul(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'mul'
+
+class I64x2Eq(VectorRelopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'eq'
+
+class I64x2Ne(VectorRelopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'ne'
+
+class I64x2Lt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'lt_s'
+
+class I64x2Gt_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'gt_s'
+
+class I64x2Le_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'le_s'
+
+class I64x2Ge_s(VectorRelopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'ge_s'
+
+class I64x2Extmul_low_i32x4_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extmul_low_i32x4_s'
+
+class I64x2Extmul_high_i32x4_s(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extmul_high_i32x4_s'
+
+class I64x2Extmul_low_i32x4_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extmul_low_i32x4_u'
+
+class I64x2Extmul_high_i32x4_u(VectorBinopInstructionBase):
+    shape: SHAPE = 'i64x2'
+    op: str = 'extmul_high_i32x4_u'
+
+class F32x4Abs(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'abs'
+
+class F32x4Neg(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'neg'
+
+class F32x4Sqrt(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'sqrt'
+
+class F32x4Add(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'add'
+
+class F32x4Sub(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'sub'
+
+class F32x4Mul(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'mul'
+
+class F32x4Div(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'div'
+
+class F32x4Min(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'min'
+
+class F32x4Max(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'max'
+
+class F32x4Pmin(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'pmin'
+
+class F32x4Pmax(VectorBinopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'pmax'
+
+class F64x2Abs(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'abs'
+
+class F64x2Neg(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'neg'
+
+class F64x2Sqrt(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'sqrt'
+
+class F64x2Add(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'add'
+
+class F64x2Sub(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'sub'
+
+class F64x2Mul(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'mul'
+
+class F64x2Div(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'div'
+
+class F64x2Min(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'min'
+
+class F64x2Max(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'max'
+
+class F64x2Pmin(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'pmin'
+
+class F64x2Pmax(VectorBinopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'pmax'
+
+class I32x4Trunc_sat_f32x4_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'trunc_sat_f32x4_s'
+
+class I32x4Trunc_sat_f32x4_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'trunc_sat_f32x4_u'
+
+class F32x4Convert_i32x4_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'convert_i32x4_s'
+
+class F32x4Convert_i32x4_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'f32x4'
+    op: str = 'convert_i32x4_u'
+
+class I32x4Trunc_sat_f64x2_s_zero(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'trunc_sat_f64x2_s_zero'
+
+class I32x4Trunc_sat_f64x2_u_zero(VectorUnopInstructionBase):
+    shape: SHAPE = 'i32x4'
+    op: str = 'trunc_sat_f64x2_u_zero'
+
+class F64x2Convert_low_i32x4_s(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'convert_low_i32x4_s'
+
+class F64x2Convert_low_i32x4_u(VectorUnopInstructionBase):
+    shape: SHAPE = 'f64x2'
+    op: str = 'convert_low_i32x4_u'
@@ -6,23 +6,31 @@ from ..structure import (
     TYPES_TO_TYPENUMBER, TYPES_TO_TYPENAME,
     WasmFunctionType, WasmLimits, WasmTableType, WasmGlobalType,
 )
-from typing import List, Callable, TypeVar, IO
+from .cursor import BinaryCursor
+from typing import List, Callable, TypeVar, IO, Union
 
-BIO = IO[bytes]
+# readers take BinaryCursor for speed, but IO[bytes] is still accepted
+BIO = Union[IO[bytes], BinaryCursor]
+WBIO = IO[bytes]
 T = TypeVar('T')
+S = TypeVar('S', bound=BIO)
 
 
 def read_bytes_typesafe(strm: BIO, size: int = -1) -> bytes:
     return strm.read(size) or b''
 
 def read_byte(strm: BIO) -> int:
+    if isinstance(strm, BinaryCursor):
+        return strm.read_byte()
     return struct.unpack('B', read_bytes_typesafe(strm, 1))[0]
 
-def write_byte(strm: BIO, value: int):
+def write_byte(strm: WBIO, value: int):
     strm.write(struct.pack('B', value))
 
 
 def read_leb128_unsigned(stream: BIO) -> int:
+    if isinstance(stream, BinaryCursor):
+        return stream.read_leb128_unsigned()
     shift = 0
     result = 0
     while True:
@@ -34,7 +42,7 @@ def read_leb128_unsigned(stream: BIO) -> int:
 
     return result
 
-def write_leb128_unsigned(strm: BIO, value: int):
+def write_leb128_unsigned(strm: WBIO, value: int):
     while True:
         towrite = value & 0x7f
         value >>= 7
@@ -47,6 +55,8 @@ def write_leb128_unsigned(strm: BIO, value: int):
 
 # https://en.wikipedia.org/wiki/LEB128#Signed_LEB128
 def read_leb128_signed(stream: BIO) -> int:
+    if isinstance(stream, BinaryCursor):
+        return stream.read_leb128_signed()
     shift = 0
     result = 0
     while True:
@@ -60,7 +70,7 @@ def read_leb128_signed(stream: BIO) -> int:
 
     return result
 
-def write_leb128_signed(strm: BIO, value: int):
+def write_leb128_signed(strm: WBIO, value: int):
     while True:
         towrite = value & 0x7f
         value >>= 7
@@ -72,34 +82,38 @@ def write_leb128_signed(strm: BIO, value: int):
 
 
 def read_float32(strm: BIO) -> float:
+    if isinstance(strm, BinaryCursor):
+        return struct.unpack('<f', strm.view(4))[0]
     return struct.unpack('<f', read_bytes_typesafe(strm, 4))[0]
 
-def write_float32(strm: BIO, value: float):
+def write_float32(strm: WBIO, value: float):
     strm.write(struct.pack('<f', value))
 
 
 def read_float64(strm: BIO) -> float:
+    if isinstance(strm, BinaryCursor):
+        return struct.unpack('<d', strm.view(8))[0]
     return struct.unpack('<d', read_bytes_typesafe(strm, 8))[0]
 
-def write_float64(strm: BIO, value: float):
+def write_float64(strm: WBIO, value: float):
     strm.write(struct.pack('<d', value))
 
 def read_int32_le(strm: BIO) -> int:
     return struct.unpack('<I', read_bytes_typesafe(strm, 4))[0]
 
-def write_int32_le(strm: BIO, value: int):
+def write_int32_le(strm: WBIO, value: int):
     strm.write(struct.pack('<I', value))
 
 # wasm-core-1 5.1
 
 
-def read_vector(strm: BIO, read_function: Callable[[BIO], T]) -> List[T]:
+def read_vector(strm: S, read_function: Callable[[S], T]) -> List[T]:
     elements: List[T] = []
     for _ in range(read_leb128_unsigned(strm)):
         elements.append(read_function(strm))
     return elements
 
-def write_vector(strm: BIO, elements: List[T], write_function: Callable[[BIO, T], None]):
+def write_vector(strm: WBIO, elements: List[T], write_function: Callable[[WBIO, T], None]):
     write_leb128_signed(strm, len(elements))
     for element in elements:
         write_function(strm, element)
@@ -110,7 +124,7 @@ def read_vector_bytes(strm: BIO) -> bytes:
     length = read_leb128_unsigned(strm)
     return read_bytes_typesafe(strm, length)
 
-def write_vector_bytes(strm: BIO, elements: bytes):
+def write_vector_bytes(strm: WBIO, elements: bytes):
     "Short and efficient version of write_vector(stream, elements, write_byte)"
 
     write_leb128_unsigned(strm, len(elements))
@@ -119,10 +133,12 @@ def write_vector_bytes(strm: BIO, elements: bytes):
 #  5.2.4 Names
 
 def read_utf8(strm: BIO) -> str:
-    return bytes(read_vector(strm, read_byte)).decode('utf8')
+    if isinstance(strm, BinaryCursor):
+        return str(strm.view(strm.read_leb128_unsigned()), 'utf8')
+    return read_vector_bytes(strm).decode('utf8')
 
 
-def write_utf8(strm: BIO, value: str):
+def write_utf8(strm: WBIO, value: str):
     write_vector(strm, list(value.encode('utf8')), write_byte)
 
 # 5.3.1 Value Types
@@ -130,42 +146,52 @@ def write_utf8(strm: BIO, value: str):
 def read_valtype(strm: BIO) -> VALTYPE_STRINGS:
     return TYPES_TO_TYPENAME[read_byte(strm)]  # type: ignore
 
-def write_valtype(strm: BIO, value: VALTYPE_TYPE):
+def write_valtype(strm: WBIO, value: VALTYPE_TYPE):
     write_byte(strm, TYPES_TO_TYPENUMBER[value])
 
 # 5.3.2 Result Types
 
-def read_blocktype(strm: BIO) -> List[VALTYPE_TYPE]:
+def read_blocktype(strm: BIO) -> Union[List[VALTYPE_TYPE], int]:
+    "Returns result type, or type index if the block has parameters or multiple results"
     num = read_byte(strm)
     if num == 0x40:
         return []
-    return [TYPES_TO_TYPENAME[num]]  # type: ignore
+    if num in TYPES_TO_TYPENAME:
+        return [TYPES_TO_TYPENAME[num]]  # type: ignore
+    # type index is encoded as positive s33, first byte is already read
+    result = num & 0x7f
+    shift = 7
+    while num & 0x80:
+        num = read_byte(strm)
+        result |= (num & 0x7f) << shift
+        shift += 7
+    return result
 
 
-# value has type of List[VALTYPE_TYPE] to allow supporting multiple return types in the future
-def write_blocktype(strm: BIO, value: List[VALTYPE_TYPE]):
+def write_blocktype(strm: WBIO, value: Union[List[VALTYPE_TYPE], int]):
+    if isinstance(value, int):
+        write_leb128_signed(strm, value)
+        return
     if not value:
         write_byte(strm, 0x40)
         return
     if len(value) != 1:
-        raise Exception('Current WASM specification does not allow multiple values for return value!')
+        raise Exception('Multiple results must be written as type index')
     write_byte(strm, TYPES_TO_TYPENUMBER[value[0]])
 
 
 # 5.3.3 Function Types
 
 
-def read_functype(strm: BIO, strict: bool = False) -> WasmFunctionType:
+def read_functype(strm: BIO) -> WasmFunctionType:
     header = read_byte(strm)
     if header != 0x60:
         raise Exception(f"We're supposed to read non-functype value! ({header})")
     argument_types: List[VALTYPE_TYPE] = read_vector(strm, read_valtype)
     return_types: List[VALTYPE_TYPE] = read_vector(strm, read_valtype)
-    if strict and len(return_types) < 2:
-        raise Exception(f'There is more than 1 return type! ({len(return_types)})')
     return WasmFunctionType(argument_types, return_types)
 
-def write_functype(strm: BIO, value: WasmFunctionType):
+def write_functype(strm: WBIO, value: WasmFunctionType):
     write_byte(strm, 0x60)
     write_vector(strm, value.argument_types, write_valtype)
     write_vector(strm, value.return_types, write_valtype)
@@ -181,12 +207,15 @@ def read_limits(strm: BIO) -> WasmLimits:
     elif type == 0x01:
         maximum = read_leb128_unsigned(strm)
         return WasmLimits(minimum, maximum)
+    elif type == 0x03:  # shared memory, which always has maximum
+        maximum = read_leb128_unsigned(strm)
+        return WasmLimits(minimum, maximum, True)
     else:
         raise Exception(f'Invalid type for limit: {type}, minimum: {minimum}')
 
 
-def write_limits(strm: BIO, value: WasmLimits):
-    write_byte(strm, 0x00 if value.maximum is None else 0x01)
+def write_limits(strm: WBIO, value: WasmLimits):
+    write_byte(strm, (0x00 if value.maximum is None else 0x01) | (0x02 if value.shared else 0x00))
     write_leb128_unsigned(strm, value.minimum)
     if value.maximum is not None:
         write_leb128_unsigned(strm, value.maximum)
@@ -197,7 +226,7 @@ def write_limits(strm: BIO, value: WasmLimits):
 def read_memtype(strm: BIO) -> WasmLimits:
     return read_limits(strm)
 
-def write_memtype(strm: BIO, value: WasmLimits):
+def write_memtype(strm: WBIO, value: WasmLimits):
     write_limits(strm, value)
 
 
@@ -210,7 +239,7 @@ def read_tabletype(strm: BIO) -> WasmTableType:
     lmt = read_limits(strm)
     return WasmTableType(elemtype, lmt)
 
-def write_tabletype(strm: BIO, value: WasmTableType):
+def write_tabletype(strm: WBIO, value: WasmTableType):
     write_byte(strm, value.elemtype)
     write_limits(strm, value.lim)
 
@@ -222,6 +251,6 @@ def read_globaltype(strm: BIO) -> WasmGlobalType:
     mutability = read_byte(strm)
     return WasmGlobalType(vt, mutability == 0x01)
 
-def write_globaltype(strm: BIO, value: WasmGlobalType):
+def write_globaltype(strm: WBIO, value: WasmGlobalType):
     write_valtype(strm, value.t)
     write_byte(strm, 0x01 if value.m else 0x00)
@@ -0,0 +1,127 @@
+# Cursor over a whole module binary, used by the binary parser instead of
+# reading IO[bytes] byte by byte.
+
+import mmap
+from typing import IO, Optional, Union
+
+BUFFER_SOURCE = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class BinaryCursor():
+    """
+    Reads a memoryview with an integer position.
+    Cursor can be limited to [pos, end) of the buffer, e.g. to one section.
+    read, tell and seek behave like IO[bytes] so that generic readers keep working.
+    """
+    __slots__ = ('buf', 'pos', 'end')
+
+    buf: memoryview
+    pos: int
+    end: int
+
+    def __init__(self, source: BUFFER_SOURCE, pos: int = 0, end: Optional[int] = None) -> None:
+        buf = source if isinstance(source, memoryview) else memoryview(source)
+        self.buf = buf if buf.format == 'B' and buf.ndim == 1 else buf.cast('B')
+        self.pos = pos
+        self.end = len(self.buf) if end is None else end
+
+    @staticmethod
+    def open(source: Union[BUFFER_SOURCE, IO[bytes], 'BinaryCursor']) -> 'BinaryCursor':
+        """
+        Returns cursor over buffer or the rest of stream.
+        bytes, mmap and read-only memoryview are not copied, while bytearray and writable memoryview are copied once,
+        as views of function bodies are kept after parsing and the caller may modify or resize its buffer.
+        """
+        if isinstance(source, BinaryCursor):
+            return source
+        if isinstance(source, bytearray) or (isinstance(source, memoryview) and not source.readonly):
+            return BinaryCursor(bytes(source))
+        if isinstance(source, (bytes, memoryview, mmap.mmap)):
+            return BinaryCursor(source)
+        return BinaryCursor(source.read() or b'')
+
+    def __len__(self) -> int:
+        return self.end - self.pos
+
+    def eof(self) -> bool:
+        return self.pos >= self.end
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self.pos
+        elif whence == 2:
+            offset += self.end
+        self.pos = offset
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        pos = self.pos
+        end = self.end if size < 0 else min(self.end, pos + size)
+        self.pos = max(pos, end)
+        return bytes(self.buf[pos:end])
+
+    def view(self, size: int) -> memoryview:
+        " Same as read, but without copying "
+        pos = self.pos
+        end = min(self.end, pos + size)
+        self.pos = max(pos, end)
+        return self.buf[pos:end]
+
+    def sub(self, size: int) -> 'BinaryCursor':
+        " Returns cursor over next size bytes, and skips them "
+        pos = self.pos
+        if pos + size > self.end:
+            raise IndexError(f'{size} bytes from {pos} is beyond the end {self.end}')
+        self.pos = pos + size
+        return BinaryCursor(self.buf, pos, pos + size)
+
+    def read_byte(self) -> int:
+        pos = self.pos
+        if pos >= self.end:
+            raise IndexError(f'reading beyond the end {self.end}')
+        self.pos = pos + 1
+        return self.buf[pos]
+
+    def read_leb128_unsigned(self) -> int:
+        buf = self.buf
+        pos = self.pos
+        if pos >= self.end:
+            raise IndexError(f'reading beyond the end {self.end}')
+        result = buf[pos]
+        pos += 1
+        if result & 0x80:
+            result &= 0x7f
+            shift = 7
+            while True:
+                b = buf[pos]
+                pos += 1
+                result |= (b & 0x7f) << shift
+                if not (b & 0x80):
+                    break
+                shift += 7
+            if pos > self.end:
+                raise IndexError(f'reading beyond the end {self.end}')
+        self.pos = pos
+        return result
+
+    def read_leb128_signed(self) -> int:
+        buf = self.buf
+        pos = self.pos
+        result = 0
+        shift = 0
+        while True:
+            b = buf[pos]
+            pos += 1
+            result |= (b & 0x7f) << shift
+            shift += 7
+            if not (b & 0x80):
+                break
+        if pos > self.end:
+            raise IndexError(f'reading beyond the end {self.end}')
+        if b & 0x40:
+            result |= ~0 << shift
+        self.pos = pos
+        return result
@@ -1,19 +1,35 @@
 # 5.4 Instructions
 import logging
-from typing import IO, Dict, List, Literal, Set, Tuple, Type, cast
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Type
 
-from wapysm.opcode.opcode_visitor import walk_bottomup
-from .byteencode import read_blocktype, read_byte, read_float32, read_float64, read_leb128_unsigned, read_vector
+from .byteencode import read_blocktype, read_byte, read_bytes_typesafe, read_float32, read_float64, read_leb128_unsigned
+from .cursor import BinaryCursor
 
 from ...opcode import (
-    Block, BlockInstructionBase, Br, BrIf, BrTable, BranchInstructionBase, Call, CallIndirect,
-    DropInstruction, GlobalGetInstruction,
+    AtomicFence, Block, BlockInstructionBase, Br, BrIf, BrTable, Call, CallIndirect,
+    DataDrop, DropInstruction, ElemDrop, GlobalGetInstruction,
     GlobalSetInstruction, IfElse, InstructionBase,
     LocalGetInstruction, LocalSetInstruction,
-    LocalTeeInstruction, Loop, Nop, Return,
-    SelectInstruction, Unreachable, VariableInstructionBase
+    LocalTeeInstruction, Loop, Nop, Return, ReturnCall, ReturnCallIndirect,
+    SelectInstruction, TableCopy, TableInit, Unreachable
 )
 from ...opcode.memory_generated import (
+    AtomicMemoryInstructionBase, I32Atomic_load, I32Atomic_load16_u, I32Atomic_load8_u,
+    I32Atomic_rmw16_add_u, I32Atomic_rmw16_and_u, I32Atomic_rmw16_cmpxchg_u, I32Atomic_rmw16_or_u,
+    I32Atomic_rmw16_sub_u, I32Atomic_rmw16_xchg_u, I32Atomic_rmw16_xor_u, I32Atomic_rmw8_add_u,
+    I32Atomic_rmw8_and_u, I32Atomic_rmw8_cmpxchg_u, I32Atomic_rmw8_or_u, I32Atomic_rmw8_sub_u,
+    I32Atomic_rmw8_xchg_u, I32Atomic_rmw8_xor_u, I32Atomic_rmw_add, I32Atomic_rmw_and,
+    I32Atomic_rmw_cmpxchg, I32Atomic_rmw_or, I32Atomic_rmw_sub, I32Atomic_rmw_xchg,
+    I32Atomic_rmw_xor, I32Atomic_store, I32Atomic_store16, I32Atomic_store8, I64Atomic_load,
+    I64Atomic_load16_u, I64Atomic_load32_u, I64Atomic_load8_u, I64Atomic_rmw16_add_u,
+    I64Atomic_rmw16_and_u, I64Atomic_rmw16_cmpxchg_u, I64Atomic_rmw16_or_u, I64Atomic_rmw16_sub_u,
+    I64Atomic_rmw16_xchg_u, I64Atomic_rmw16_xor_u, I64Atomic_rmw32_add_u, I64Atomic_rmw32_and_u,
+    I64Atomic_rmw32_cmpxchg_u, I64Atomic_rmw32_or_u, I64Atomic_rmw32_sub_u, I64Atomic_rmw32_xchg_u,
+    I64Atomic_rmw32_xor_u, I64Atomic_rmw8_add_u, I64Atomic_rmw8_and_u, I64Atomic_rmw8_cmpxchg_u,
+    I64Atomic_rmw8_or_u, I64Atomic_rmw8_sub_u, I64Atomic_rmw8_xchg_u, I64Atomic_rmw8_xor_u,
+    I64Atomic_rmw_add, I64Atomic_rmw_and, I64Atomic_rmw_cmpxchg, I64Atomic_rmw_or,
+    I64Atomic_rmw_sub, I64Atomic_rmw_xchg, I64Atomic_rmw_xor, I64Atomic_store, I64Atomic_store16,
+    I64Atomic_store32, I64Atomic_store8, MemoryAtomicNotify, MemoryAtomicWait32, MemoryAtomicWait64,
     F32Load, F32Store, F64Load, F64Store,
     I32Load, I32Load8_s, I32Load8_u,
     I32Load16_s, I32Load16_u, I32Store,
@@ -21,10 +37,11 @@ from ...opcode.memory_generated import (
     I64Load8_s, I64Load8_u, I64Load16_s,
     I64Load16_u, I64Load32_s, I64Load32_u,
     I64Store, I64Store8, I64Store16,
-    I64Store32, MemoryGrow, MemoryLoadStoreInstructionBase, MemorySize
+    I64Store32, MemoryCopy, MemoryFill, MemoryGrow, MemoryInit,
+    MemorySize
 )
 from ...opcode.numeric_generated import (
-    ConstantInstructionBase, F32Abs, F32Add, F32Ceil, F32Const,
+    F32Abs, F32Add, F32Ceil, F32Const,
     F32Convert_i32_s, F32Convert_i32_u,
     F32Convert_i64_s, F32Convert_i64_u,
     F32Copysign, F32Demote_f64, F32Div,
@@ -53,7 +70,13 @@ from ...opcode.numeric_generated import (
     I32Wrap_I64, I32Xor, I64Add, I64And,
     I64Clz, I64Const, I64Ctz, I64Div_s,
     I64Div_u, I64Eq, I64Eqz,
+    I32Extend8_s, I32Extend16_s,
+    I32Trunc_sat_f32_s, I32Trunc_sat_f32_u,
+    I32Trunc_sat_f64_s, I32Trunc_sat_f64_u,
+    I64Extend8_s, I64Extend16_s, I64Extend32_s,
     I64Extend_i32_s, I64Extend_i32_u,
+    I64Trunc_sat_f32_s, I64Trunc_sat_f32_u,
+    I64Trunc_sat_f64_s, I64Trunc_sat_f64_u,
     I64Ge_s, I64Ge_u, I64Gt_s, I64Gt_u,
     I64Le_s, I64Le_u, I64Lt_s, I64Lt_u,
     I64Mul, I64Ne, I64Or, I64Popcnt,
@@ -64,6 +87,50 @@ from ...opcode.numeric_generated import (
     I64Trunc_f64_s, I64Trunc_f64_u,
     I64Xor
 )
+from ...opcode.vector_generated import (
+    F32x4Abs, F32x4Add, F32x4Ceil, F32x4Convert_i32x4_s, F32x4Convert_i32x4_u,
+    F32x4Demote_f64x2_zero, F32x4Div, F32x4Eq, F32x4Extract_lane, F32x4Floor, F32x4Ge, F32x4Gt,
+    F32x4Le, F32x4Lt, F32x4Max, F32x4Min, F32x4Mul, F32x4Ne, F32x4Nearest, F32x4Neg, F32x4Pmax,
+    F32x4Pmin, F32x4Replace_lane, F32x4Splat, F32x4Sqrt, F32x4Sub, F32x4Trunc, F64x2Abs, F64x2Add,
+    F64x2Ceil, F64x2Convert_low_i32x4_s, F64x2Convert_low_i32x4_u, F64x2Div, F64x2Eq,
+    F64x2Extract_lane, F64x2Floor, F64x2Ge, F64x2Gt, F64x2Le, F64x2Lt, F64x2Max, F64x2Min, F64x2Mul,
+    F64x2Ne, F64x2Nearest, F64x2Neg, F64x2Pmax, F64x2Pmin, F64x2Promote_low_f32x4,
+    F64x2Replace_lane, F64x2Splat, F64x2Sqrt, F64x2Sub, F64x2Trunc, I16x8Abs, I16x8Add,
+    I16x8Add_sat_s, I16x8Add_sat_u, I16x8All_true, I16x8Avgr_u, I16x8Bitmask, I16x8Eq,
+    I16x8Extadd_pairwise_i8x16_s, I16x8Extadd_pairwise_i8x16_u, I16x8Extend_high_i8x16_s,
+    I16x8Extend_high_i8x16_u, I16x8Extend_low_i8x16_s, I16x8Extend_low_i8x16_u,
+    I16x8Extmul_high_i8x16_s, I16x8Extmul_high_i8x16_u, I16x8Extmul_low_i8x16_s,
+    I16x8Extmul_low_i8x16_u, I16x8Extract_lane_s, I16x8Extract_lane_u, I16x8Ge_s, I16x8Ge_u,
+    I16x8Gt_s, I16x8Gt_u, I16x8Le_s, I16x8Le_u, I16x8Lt_s, I16x8Lt_u, I16x8Max_s, I16x8Max_u,
+    I16x8Min_s, I16x8Min_u, I16x8Mul, I16x8Narrow_i32x4_s, I16x8Narrow_i32x4_u, I16x8Ne, I16x8Neg,
+    I16x8Q15mulr_sat_s, I16x8Replace_lane, I16x8Shl, I16x8Shr_s, I16x8Shr_u, I16x8Splat, I16x8Sub,
+    I16x8Sub_sat_s, I16x8Sub_sat_u, I32x4Abs, I32x4Add, I32x4All_true, I32x4Bitmask,
+    I32x4Dot_i16x8_s, I32x4Eq, I32x4Extadd_pairwise_i16x8_s, I32x4Extadd_pairwise_i16x8_u,
+    I32x4Extend_high_i16x8_s, I32x4Extend_high_i16x8_u, I32x4Extend_low_i16x8_s,
+    I32x4Extend_low_i16x8_u, I32x4Extmul_high_i16x8_s, I32x4Extmul_high_i16x8_u,
+    I32x4Extmul_low_i16x8_s, I32x4Extmul_low_i16x8_u, I32x4Extract_lane, I32x4Ge_s, I32x4Ge_u,
+    I32x4Gt_s, I32x4Gt_u, I32x4Le_s, I32x4Le_u, I32x4Lt_s, I32x4Lt_u, I32x4Max_s, I32x4Max_u,
+    I32x4Min_s, I32x4Min_u, I32x4Mul, I32x4Ne, I32x4Neg, I32x4Replace_lane, I32x4Shl, I32x4Shr_s,
+    I32x4Shr_u, I32x4Splat, I32x4Sub, I32x4Trunc_sat_f32x4_s, I32x4Trunc_sat_f32x4_u,
+    I32x4Trunc_sat_f64x2_s_zero, I32x4Trunc_sat_f64x2_u_zero, I64x2Abs, I64x2Add, I64x2All_true,
+    I64x2Bitmask, I64x2Eq, I64x2Extend_high_i32x4_s, I64x2Extend_high_i32x4_u,
+    I64x2Extend_low_i32x4_s, I64x2Extend_low_i32x4_u, I64x2Extmul_high_i32x4_s,
+    I64x2Extmul_high_i32x4_u, I64x2Extmul_low_i32x4_s, I64x2Extmul_low_i32x4_u, I64x2Extract_lane,
+    I64x2Ge_s, I64x2Gt_s, I64x2Le_s, I64x2Lt_s, I64x2Mul, I64x2Ne, I64x2Neg, I64x2Replace_lane,
+    I64x2Shl, I64x2Shr_s, I64x2Shr_u, I64x2Splat, I64x2Sub, I8x16Abs, I8x16Add, I8x16Add_sat_s,
+    I8x16Add_sat_u, I8x16All_true, I8x16Avgr_u, I8x16Bitmask, I8x16Eq, I8x16Extract_lane_s,
+    I8x16Extract_lane_u, I8x16Ge_s, I8x16Ge_u, I8x16Gt_s, I8x16Gt_u, I8x16Le_s, I8x16Le_u,
+    I8x16Lt_s, I8x16Lt_u, I8x16Max_s, I8x16Max_u, I8x16Min_s, I8x16Min_u, I8x16Narrow_i16x8_s,
+    I8x16Narrow_i16x8_u, I8x16Ne, I8x16Neg, I8x16Popcnt, I8x16Replace_lane, I8x16Shl, I8x16Shr_s,
+    I8x16Shr_u, I8x16Shuffle, I8x16Splat, I8x16Sub, I8x16Sub_sat_s, I8x16Sub_sat_u, I8x16Swizzle,
+    V128And, V128Andnot, V128Any_true, V128Bitselect, V128Load, V128Load16_lane, V128Load16_splat,
+    V128Load16x4_s, V128Load16x4_u, V128Load32_lane, V128Load32_splat, V128Load32_zero,
+    V128Load32x2_s, V128Load32x2_u, V128Load64_lane, V128Load64_splat, V128Load64_zero,
+    V128Load8_lane, V128Load8_splat, V128Load8x8_s, V128Load8x8_u, V128Not, V128Or, V128Store,
+    V128Store16_lane, V128Store32_lane, V128Store64_lane, V128Store8_lane, V128Xor, V128Const,
+    VectorLaneInstructionBase, VectorMemoryInstructionBase, VectorMemoryLaneInstructionBase,
+    VectorShuffleInstructionBase
+)
 
 logger = logging.getLogger('wapysm.parser.binary.instruction')
 
@@ -82,6 +149,8 @@ OPCODE_TABLE: Dict[int, Type[InstructionBase]] = {
     0x0F: Return,
     0x10: Call,
     0x11: CallIndirect,
+    0x12: ReturnCall,
+    0x13: ReturnCallIndirect,
 
     # 5.4.2 Parametric Instructions
     0x1A: DropInstruction,
@@ -259,6 +328,355 @@ OPCODE_TABLE: Dict[int, Type[InstructionBase]] = {
     0xBD: I64Reinterpret_f64,
     0xBE: F32Reinterpret_i32,
     0xBF: F64Reinterpret_i64,
+
+    # sign-extension operators
+    0xC0: I32Extend8_s,
+    0xC1: I32Extend16_s,
+    0xC2: I64Extend8_s,
+    0xC3: I64Extend16_s,
+    0xC4: I64Extend32_s,
+}
+
+# Instructions prefixed with 0xFC, keyed by u32 that follows the prefix
+OPCODE_TABLE_FC: Dict[int, Type[InstructionBase]] = {
+    # Non-trapping float-to-int conversions
+    0x00: I32Trunc_sat_f32_s,
+    0x01: I32Trunc_sat_f32_u,
+    0x02: I32Trunc_sat_f64_s,
+    0x03: I32Trunc_sat_f64_u,
+    0x04: I64Trunc_sat_f32_s,
+    0x05: I64Trunc_sat_f32_u,
+    0x06: I64Trunc_sat_f64_s,
+    0x07: I64Trunc_sat_f64_u,
+
+    # Bulk memory operations
+    0x08: MemoryInit,
+    0x09: DataDrop,
+    0x0A: MemoryCopy,
+    0x0B: MemoryFill,
+    0x0C: TableInit,
+    0x0D: ElemDrop,
+    0x0E: TableCopy,
+}
+
+# Atomic memory instructions (threads proposal) prefixed with 0xFE, keyed by u32 that follows the prefix
+OPCODE_TABLE_FE: Dict[int, Type[InstructionBase]] = {
+    0x00: MemoryAtomicNotify,
+    0x01: MemoryAtomicWait32,
+    0x02: MemoryAtomicWait64,
+    0x03: AtomicFence,
+
+    0x10: I32Atomic_load,
+    0x11: I64Atomic_load,
+    0x12: I32Atomic_load8_u,
+    0x13: I32Atomic_load16_u,
+    0x14: I64Atomic_load8_u,
+    0x15: I64Atomic_load16_u,
+    0x16: I64Atomic_load32_u,
+
+    0x17: I32Atomic_store,
+    0x18: I64Atomic_store,
+    0x19: I32Atomic_store8,
+    0x1A: I32Atomic_store16,
+    0x1B: I64Atomic_store8,
+    0x1C: I64Atomic_store16,
+    0x1D: I64Atomic_store32,
+
+    0x1E: I32Atomic_rmw_add,
+    0x1F: I64Atomic_rmw_add,
+    0x20: I32Atomic_rmw8_add_u,
+    0x21: I32Atomic_rmw16_add_u,
+    0x22: I64Atomic_rmw8_add_u,
+    0x23: I64Atomic_rmw16_add_u,
+    0x24: I64Atomic_rmw32_add_u,
+
+    0x25: I32Atomic_rmw_sub,
+    0x26: I64Atomic_rmw_sub,
+    0x27: I32Atomic_rmw8_sub_u,
+    0x28: I32Atomic_rmw16_sub_u,
+    0x29: I64Atomic_rmw8_sub_u,
+    0x2A: I64Atomic_rmw16_sub_u,
+    0x2B: I64Atomic_rmw32_sub_u,
+
+    0x2C: I32Atomic_rmw_and,
+    0x2D: I64Atomic_rmw_and,
+    0x2E: I32Atomic_rmw8_and_u,
+    0x2F: I32Atomic_rmw16_and_u,
+    0x30: I64Atomic_rmw8_and_u,
+    0x31: I64Atomic_rmw16_and_u,
+    0x32: I64Atomic_rmw32_and_u,
+
+    0x33: I32Atomic_rmw_or,
+    0x34: I64Atomic_rmw_or,
+    0x35: I32Atomic_rmw8_or_u,
+    0x36: I32Atomic_rmw16_or_u,
+    0x37: I64Atomic_rmw8_or_u,
+    0x38: I64Atomic_rmw16_or_u,
+    0x39: I64Atomic_rmw32_or_u,
+
+    0x3A: I32Atomic_rmw_xor,
+    0x3B: I64Atomic_rmw_xor,
+    0x3C: I32Atomic_rmw8_xor_u,
+    0x3D: I32Atomic_rmw16_xor_u,
+    0x3E: I64Atomic_rmw8_xor_u,
+    0x3F: I64Atomic_rmw16_xor_u,
+    0x40: I64Atomic_rmw32_xor_u,
+
+    0x41: I32Atomic_rmw_xchg,
+    0x42: I64Atomic_rmw_xchg,
+    0x43: I32Atomic_rmw8_xchg_u,
+    0x44: I32Atomic_rmw16_xchg_u,
+    0x45: I64Atomic_rmw8_xchg_u,
+    0x46: I64Atomic_rmw16_xchg_u,
+    0x47: I64Atomic_rmw32_xchg_u,
+
+    0x48: I32Atomic_rmw_cmpxchg,
+    0x49: I64Atomic_rmw_cmpxchg,
+    0x4A: I32Atomic_rmw8_cmpxchg_u,
+    0x4B: I32Atomic_rmw16_cmpxchg_u,
+    0x4C: I64Atomic_rmw8_cmpxchg_u,
+    0x4D: I64Atomic_rmw16_cmpxchg_u,
+    0x4E: I64Atomic_rmw32_cmpxchg_u,
+}
+
+# Vector instructions (SIMD proposal) prefixed with 0xFD, keyed by u32 that follows the prefix
+OPCODE_TABLE_FD: Dict[int, Type[InstructionBase]] = {
+    0x00: V128Load,
+    0x01: V128Load8x8_s,
+    0x02: V128Load8x8_u,
+    0x03: V128Load16x4_s,
+    0x04: V128Load16x4_u,
+    0x05: V128Load32x2_s,
+    0x06: V128Load32x2_u,
+    0x07: V128Load8_splat,
+    0x08: V128Load16_splat,
+    0x09: V128Load32_splat,
+    0x0A: V128Load64_splat,
+    0x0B: V128Store,
+    0x0C: V128Const,
+    0x0D: I8x16Shuffle,
+    0x0E: I8x16Swizzle,
+    0x0F: I8x16Splat,
+    0x10: I16x8Splat,
+    0x11: I32x4Splat,
+    0x12: I64x2Splat,
+    0x13: F32x4Splat,
+    0x14: F64x2Splat,
+    0x15: I8x16Extract_lane_s,
+    0x16: I8x16Extract_lane_u,
+    0x17: I8x16Replace_lane,
+    0x18: I16x8Extract_lane_s,
+    0x19: I16x8Extract_lane_u,
+    0x1A: I16x8Replace_lane,
+    0x1B: I32x4Extract_lane,
+    0x1C: I32x4Replace_lane,
+    0x1D: I64x2Extract_lane,
+    0x1E: I64x2Replace_lane,
+    0x1F: F32x4Extract_lane,
+    0x20: F32x4Replace_lane,
+    0x21: F64x2Extract_lane,
+    0x22: F64x2Replace_lane,
+    0x23: I8x16Eq,
+    0x24: I8x16Ne,
+    0x25: I8x16Lt_s,
+    0x26: I8x16Lt_u,
+    0x27: I8x16Gt_s,
+    0x28: I8x16Gt_u,
+    0x29: I8x16Le_s,
+    0x2A: I8x16Le_u,
+    0x2B: I8x16Ge_s,
+    0x2C: I8x16Ge_u,
+    0x2D: I16x8Eq,
+    0x2E: I16x8Ne,
+    0x2F: I16x8Lt_s,
+    0x30: I16x8Lt_u,
+    0x31: I16x8Gt_s,
+    0x32: I16x8Gt_u,
+    0x33: I16x8Le_s,
+    0x34: I16x8Le_u,
+    0x35: I16x8Ge_s,
+    0x36: I16x8Ge_u,
+    0x37: I32x4Eq,
+    0x38: I32x4Ne,
+    0x39: I32x4Lt_s,
+    0x3A: I32x4Lt_u,
+    0x3B: I32x4Gt_s,
+    0x3C: I32x4Gt_u,
+    0x3D: I32x4Le_s,
+    0x3E: I32x4Le_u,
+    0x3F: I32x4Ge_s,
+    0x40: I32x4Ge_u,
+    0x41: F32x4Eq,
+    0x42: F32x4Ne,
+    0x43: F32x4Lt,
+    0x44: F32x4Gt,
+    0x45: F32x4Le,
+    0x46: F32x4Ge,
+    0x47: F64x2Eq,
+    0x48: F64x2Ne,
+    0x49: F64x2Lt,
+    0x4A: F64x2Gt,
+    0x4B: F64x2Le,
+    0x4C: F64x2Ge,
+    0x4D: V128Not,
+    0x4E: V128And,
+    0x4F: V128Andnot,
+    0x50: V128Or,
+    0x51: V128Xor,
+    0x52: V128Bitselect,
+    0x53: V128Any_true,
+    0x54: V128Load8_lane,
+    0x55: V128Load16_lane,
+    0x56: V128Load32_lane,
+    0x57: V128Load64_lane,
+    0x58: V128Store8_lane,
+    0x59: V128Store16_lane,
+    0x5A: V128Store32_lane,
+    0x5B: V128Store64_lane,
+    0x5C: V128Load32_zero,
+    0x5D: V128Load64_zero,
+    0x5E: F32x4Demote_f64x2_zero,
+    0x5F: F64x2Promote_low_f32x4,
+    0x60: I8x16Abs,
+    0x61: I8x16Neg,
+    0x62: I8x16Popcnt,
+    0x63: I8x16All_true,
+    0x64: I8x16Bitmask,
+    0x65: I8x16Narrow_i16x8_s,
+    0x66: I8x16Narrow_i16x8_u,
+    0x67: F32x4Ceil,
+    0x68: F32x4Floor,
+    0x69: F32x4Trunc,
+    0x6A: F32x4Nearest,
+    0x6B: I8x16Shl,
+    0x6C: I8x16Shr_s,
+    0x6D: I8x16Shr_u,
+    0x6E: I8x16Add,
+    0x6F: I8x16Add_sat_s,
+    0x70: I8x16Add_sat_u,
+    0x71: I8x16Sub,
+    0x72: I8x16Sub_sat_s,
+    0x73: I8x16Sub_sat_u,
+    0x74: F64x2Ceil,
+    0x75: F64x2Floor,
+    0x76: I8x16Min_s,
+    0x77: I8x16Min_u,
+    0x78: I8x16Max_s,
+    0x79: I8x16Max_u,
+    0x7A: F64x2Trunc,
+    0x7B: I8x16Avgr_u,
+    0x7C: I16x8Extadd_pairwise_i8x16_s,
+    0x7D: I16x8Extadd_pairwise_i8x16_u,
+    0x7E: I32x4Extadd_pairwise_i16x8_s,
+    0x7F: I32x4Extadd_pairwise_i16x8_u,
+    0x80: I16x8Abs,
+    0x81: I16x8Neg,
+    0x82: I16x8Q15mulr_sat_s,
+    0x83: I16x8All_true,
+    0x84: I16x8Bitmask,
+    0x85: I16x8Narrow_i32x4_s,
+    0x86: I16x8Narrow_i32x4_u,
+    0x87: I16x8Extend_low_i8x16_s,
+    0x88: I16x8Extend_high_i8x16_s,
+    0x89: I16x8Extend_low_i8x16_u,
+    0x8A: I16x8Extend_high_i8x16_u,
+    0x8B: I16x8Shl,
+    0x8C: I16x8Shr_s,
+    0x8D: I16x8Shr_u,
+    0x8E: I16x8Add,
+    0x8F: I16x8Add_sat_s,
+    0x90: I16x8Add_sat_u,
+    0x91: I16x8Sub,
+    0x92: I16x8Sub_sat_s,
+    0x93: I16x8Sub_sat_u,
+    0x94: F64x2Nearest,
+    0x95: I16x8Mul,
+    0x96: I16x8Min_s,
+    0x97: I16x8Min_u,
+    0x98: I16x8Max_s,
+    0x99: I16x8Max_u,
+    0x9B: I16x8Avgr_u,
+    0x9C: I16x8Extmul_low_i8x16_s,
+    0x9D: I16x8Extmul_high_i8x16_s,
+    0x9E: I16x8Extmul_low_i8x16_u,
+    0x9F: I16x8Extmul_high_i8x16_u,
+    0xA0: I32x4Abs,
+    0xA1: I32x4Neg,
+    0xA3: I32x4All_true,
+    0xA4: I32x4Bitmask,
+    0xA7: I32x4Extend_low_i16x8_s,
+    0xA8: I32x4Extend_high_i16x8_s,
+    0xA9: I32x4Extend_low_i16x8_u,
+    0xAA: I32x4Extend_high_i16x8_u,
+    0xAB: I32x4Shl,
+    0xAC: I32x4Shr_s,
+    0xAD: I32x4Shr_u,
+    0xAE: I32x4Add,
+    0xB1: I32x4Sub,
+    0xB5: I32x4Mul,
+    0xB6: I32x4Min_s,
+    0xB7: I32x4Min_u,
+    0xB8: I32x4Max_s,
+    0xB9: I32x4Max_u,
+    0xBA: I32x4Dot_i16x8_s,
+    0xBC: I32x4Extmul_low_i16x8_s,
+    0xBD: I32x4Extmul_high_i16x8_s,
+    0xBE: I32x4Extmul_low_i16x8_u,
+    0xBF: I32x4Extmul_high_i16x8_u,
+    0xC0: I64x2Abs,
+    0xC1: I64x2Neg,
+    0xC3: I64x2All_true,
+    0xC4: I64x2Bitmask,
+    0xC7: I64x2Extend_low_i32x4_s,
+    0xC8: I64x2Extend_high_i32x4_s,
+    0xC9: I64x2Extend_low_i32x4_u,
+    0xCA: I64x2Extend_high_i32x4_u,
+    0xCB: I64x2Shl,
+    0xCC: I64x2Shr_s,
+    0xCD: I64x2Shr_u,
+    0xCE: I64x2Add,
+    0xD1: I64x2Sub,
+    0xD5: I64x2Mul,
+    0xD6: I64x2Eq,
+    0xD7: I64x2Ne,
+    0xD8: I64x2Lt_s,
+    0xD9: I64x2Gt_s,
+    0xDA: I64x2Le_s,
+    0xDB: I64x2Ge_s,
+    0xDC: I64x2Extmul_low_i32x4_s,
+    0xDD: I64x2Extmul_high_i32x4_s,
+    0xDE: I64x2Extmul_low_i32x4_u,
+    0xDF: I64x2Extmul_high_i32x4_u,
+    0xE0: F32x4Abs,
+    0xE1: F32x4Neg,
+    0xE3: F32x4Sqrt,
+    0xE4: F32x4Add,
+    0xE5: F32x4Sub,
+    0xE6: F32x4Mul,
+    0xE7: F32x4Div,
+    0xE8: F32x4Min,
+    0xE9: F32x4Max,
+    0xEA: F32x4Pmin,
+    0xEB: F32x4Pmax,
+    0xEC: F64x2Abs,
+    0xED: F64x2Neg,
+    0xEF: F64x2Sqrt,
+    0xF0: F64x2Add,
+    0xF1: F64x2Sub,
+    0xF2: F64x2Mul,
+    0xF3: F64x2Div,
+    0xF4: F64x2Min,
+    0xF5: F64x2Max,
+    0xF6: F64x2Pmin,
+    0xF7: F64x2Pmax,
+    0xF8: I32x4Trunc_sat_f32x4_s,
+    0xF9: I32x4Trunc_sat_f32x4_u,
+    0xFA: F32x4Convert_i32x4_s,
+    0xFB: F32x4Convert_i32x4_u,
+    0xFC: I32x4Trunc_sat_f64x2_s_zero,
+    0xFD: I32x4Trunc_sat_f64x2_u_zero,
+    0xFE: F64x2Convert_low_i32x4_s,
+    0xFF: F64x2Convert_low_i32x4_u,
 }
 
 
@@ -267,118 +685,238 @@ _INSTRUCTIONS_WITHOUT_OPERANDS: Set[int] = {x for rgn in [
     (0x00, 0x01),  # unreachable and nop
     [0x0F],  # return
     (0x1A, 0x1B),  # drop and select
-    (0x3F, 0x40),  # memory.*
     range(0x45, 0xBF + 1),  # "All other numeric instructions" in 5.4.5. Numeric Instructions
+    range(0xC0, 0xC4 + 1),  # sign-extension operators
 ] for x in rgn}
 _INSTRUCTION_CACHE: Dict[int, InstructionBase] = {}
 
+# How operands of each opcode are read in _read_instructions
+_OPERANDS_NONE = 0
+_OPERANDS_INDEX = 1  # local.* and global.*
+_OPERANDS_CONST = 2  # i32.const and i64.const
+_OPERANDS_LABELIDX = 3  # br and br_if
+_OPERANDS_CALLIDX = 4  # call and return_call
+_OPERANDS_MEMARG = 5  # i32.load ~ i64.store
+_OPERANDS_OTHER = 6  # everything else, including unknown opcodes
+
+# indexed by opcode, as list lookup is faster than dict
+_OPCODE_LIST: List[Optional[Type[InstructionBase]]] = [OPCODE_TABLE.get(x) for x in range(256)]
+_OPERANDS_LIST: List[int] = [
+    _OPERANDS_NONE if x in _INSTRUCTIONS_WITHOUT_OPERANDS else
+    _OPERANDS_INDEX if 0x20 <= x <= 0x24 else
+    _OPERANDS_CONST if x in (0x41, 0x42) else
+    _OPERANDS_LABELIDX if x in (0x0C, 0x0D) else
+    _OPERANDS_CALLIDX if x in (0x10, 0x12) else
+    _OPERANDS_MEMARG if 0x28 <= x <= 0x3E else
+    _OPERANDS_OTHER
+    for x in range(256)]
+
 READ_FINISH_REASON = Literal['eof', 'else', 'end']
 
 _ENABLE_WASM_STACKTRACE = True
 
-def _read_instructions(stream: IO[bytes]) -> Tuple[READ_FINISH_REASON, List[InstructionBase]]:
+def _read_instructions(stream: BinaryCursor) -> Tuple[READ_FINISH_REASON, List[InstructionBase]]:
     result: List[InstructionBase] = []
-    while True:
-        try:
-            opcode = read_byte(stream)
-        except IndexError:
-            break
-        logger.debug('going to parse instruction 0x%02X' % opcode)
+    append = result.append
+    read_leb128_unsigned = stream.read_leb128_unsigned
+    opcodes: List[Any] = _OPCODE_LIST  # operands are set as per opcode
+    operands = _OPERANDS_LIST
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # position is kept in local variable, and synchronized to stream before calling other readers
+    buf = stream.buf
+    end = stream.end
+    pos = stream.pos
+    while pos < end:
+        opcode = buf[pos]
+        pos += 1
+        if debug:
+            logger.debug('going to parse instruction 0x%02X', opcode)
+
+        kind = operands[opcode]
+        if kind == _OPERANDS_NONE:
+            if _ENABLE_WASM_STACKTRACE:
+                append(opcodes[opcode]())
+            else:
+                inst = _INSTRUCTION_CACHE.get(opcode) or opcodes[opcode]()
+                _INSTRUCTION_CACHE[opcode] = inst
+                append(inst)
+            continue
 
+        if kind != _OPERANDS_OTHER:
+            # instructions with one u32 operand (or memarg), which mostly fits in a byte
+            value = buf[pos]
+            if value & 0x80:
+                stream.pos = pos
+                value = read_leb128_unsigned()
+                pos = stream.pos
+            else:
+                pos += 1
+            inst = opcodes[opcode]()
+            if kind == _OPERANDS_INDEX:
+                inst.index = value
+            elif kind == _OPERANDS_CONST:
+                inst.value = value
+            elif kind == _OPERANDS_LABELIDX:
+                inst.labelidx = value
+            elif kind == _OPERANDS_CALLIDX:
+                inst.callidx = value
+            else:
+                inst.align = value
+                stream.pos = pos
+                inst.offset = read_leb128_unsigned()
+                pos = stream.pos
+            append(inst)
+            continue
+
+        stream.pos = pos
         if opcode == 0x0B:  # end of block
+            if _ENABLE_WASM_STACKTRACE:
+                _set_debug_indices(result)
             return 'end', result
         elif opcode == 0x05:  # end of if block, but else comes next
+            if _ENABLE_WASM_STACKTRACE:
+                _set_debug_indices(result)
             return 'else', result
-        elif opcode not in OPCODE_TABLE:
+        elif opcode == 0xFC:
+            append(_read_instruction_fc(stream))
+        elif opcode == 0xFD:
+            append(_read_instruction_fd(stream))
+        elif opcode == 0xFE:
+            append(_read_instruction_fe(stream))
+        elif opcodes[opcode] is None:
             raise Exception('Unknown opcode: 0x%02X' % opcode)
-        elif opcode in _INSTRUCTIONS_WITHOUT_OPERANDS:
-            if _ENABLE_WASM_STACKTRACE:
-                inst = OPCODE_TABLE[opcode]()
-            else:
-                inst = _INSTRUCTION_CACHE.get(opcode) or OPCODE_TABLE[opcode]()
-                _INSTRUCTION_CACHE[opcode] = inst
-            result.append(inst)
-        elif opcode == 0x10:
-            inst = Call()
-            inst.callidx = read_leb128_unsigned(stream)
-            result.append(inst)
-        elif opcode == 0x11:
-            inst = CallIndirect()
-            inst.typeidx = read_leb128_unsigned(stream)
-            read_byte(stream)  # dummy byte?
-            result.append(inst)
+
+        # Numeric Instructions (except instructions without operands)
+        elif opcode == 0x43:
+            inst = F32Const()
+            inst.value = read_float32(stream)
+            append(inst)
+        elif opcode == 0x44:
+            inst = F64Const()
+            inst.value = read_float64(stream)
+            append(inst)
+
+        elif opcode == 0x11 or opcode == 0x13:  # call_indirect or return_call_indirect
+            inst = opcodes[opcode]()
+            inst.typeidx = read_leb128_unsigned()
+            inst.tableidx = read_leb128_unsigned()
+            append(inst)
 
         # Block instructions
         elif opcode == 0x02 or opcode == 0x03:  # block .. end or loop .. end
-            inst = cast(BlockInstructionBase, OPCODE_TABLE[opcode]())
-            inst.resultype = read_blocktype(stream)
+            inst = opcodes[opcode]()
+            _read_blocktype(stream, inst)
             cause, inst.instr = _read_instructions(stream)
             if cause != 'end':
                 raise Exception(f'"block" or "loop" instruction must end with "end" instruction. was: {cause}')
-            result.append(inst)
+            append(inst)
         elif opcode == 0x04:  # if .. (else ..) end
             inst = IfElse()
-            inst.resultype = read_blocktype(stream)
+            _read_blocktype(stream, inst)
             cause, inst.instr = _read_instructions(stream)
             if cause == 'else':
                 cause, inst.else_block = _read_instructions(stream)
             if cause != 'end':
                 raise Exception(f'"if" branch instruction must end with "end" opcode even if it contains "else" block. was: {cause}')
-            result.append(inst)
-        elif opcode == 0x0C or opcode == 0x0D:  # br*
-            inst = cast(BranchInstructionBase, OPCODE_TABLE[opcode]())
-            inst.labelidx = read_leb128_unsigned(stream)
-            result.append(inst)
+            append(inst)
+        elif opcode == 0x3F or opcode == 0x40:  # memory.size or memory.grow
+            append(opcodes[opcode]())
+            read_byte(stream)  # memory index, always 0x00
         elif opcode == 0x0E:  # br_table
             inst = BrTable()
-            inst.labelindices = read_vector(stream, read_leb128_unsigned)
-            inst.lastlabel = read_leb128_unsigned(stream)
-            result.append(inst)
-
-        # Variable Instructions
-        elif 0x20 <= opcode and opcode <= 0x24:  # local.* and global.*
-            inst = cast(VariableInstructionBase, OPCODE_TABLE[opcode]())
-            inst.index = read_leb128_unsigned(stream)
-            result.append(inst)
-
-        # Memory Instructions (except memory.* which is handled above)
-        elif 0x28 <= opcode and opcode <= 0x3E:  # i32.load ~ i64.store
-            inst = cast(MemoryLoadStoreInstructionBase, OPCODE_TABLE[opcode]())
-            inst.align = read_leb128_unsigned(stream)
-            inst.offset = read_leb128_unsigned(stream)
-            result.append(inst)
-
-        # Numeric Instructions (except instructions without operands)
-        elif opcode == 0x41 or opcode == 0x42:
-            inst = cast(ConstantInstructionBase, OPCODE_TABLE[opcode]())
-            inst.value = read_leb128_unsigned(stream)
-            result.append(inst)
-        elif opcode == 0x43:
-            inst = F32Const()
-            inst.value = read_float32(stream)
-            result.append(inst)
-        elif opcode == 0x44:
-            inst = F64Const()
-            inst.value = read_float64(stream)
-            result.append(inst)
+            inst.labelindices = [read_leb128_unsigned() for _ in range(read_leb128_unsigned())]
+            inst.lastlabel = read_leb128_unsigned()
+            append(inst)
 
         # what else?
         else:
             raise Exception('Unreachable 0x%02X' % opcode)
+        pos = stream.pos
 
+    if pos > end:
+        raise IndexError(f'reading beyond the end {end}')
+    stream.pos = pos
+    if _ENABLE_WASM_STACKTRACE:
+        _set_debug_indices(result)
     return 'eof', result
 
 
-if _ENABLE_WASM_STACKTRACE:
-    def read_instructions(stream: IO[bytes]) -> Tuple[READ_FINISH_REASON, List[InstructionBase]]:
-        a, b = _read_instructions(stream)
-        for i in walk_bottomup(b):
-            if not isinstance(i, BlockInstructionBase):
-                continue
-            for idx, op in enumerate(i.instr):
-                op._debug_internal_index = idx
-            for idx, op in enumerate(getattr(i, 'else_block', ())):
-                op._debug_internal_index = idx
-        return a, b
-else:
-    read_instructions = _read_instructions
+def _read_blocktype(stream: BinaryCursor, inst: BlockInstructionBase):
+    blocktype = read_blocktype(stream)
+    if isinstance(blocktype, int):
+        inst.typeidx = blocktype
+    else:
+        inst.resultype = blocktype
+
+
+def _read_instruction_fc(stream: BinaryCursor) -> InstructionBase:
+    subopcode = read_leb128_unsigned(stream)
+    if subopcode not in OPCODE_TABLE_FC:
+        raise Exception('Unknown opcode: 0xFC 0x%02X' % subopcode)
+    inst = OPCODE_TABLE_FC[subopcode]()
+
+    if isinstance(inst, MemoryInit):
+        inst.dataidx = read_leb128_unsigned(stream)
+        read_byte(stream)  # memory index, always 0x00
+    elif isinstance(inst, DataDrop):
+        inst.dataidx = read_leb128_unsigned(stream)
+    elif isinstance(inst, MemoryCopy):
+        read_byte(stream)  # destination memory index, always 0x00
+        read_byte(stream)  # source memory index, always 0x00
+    elif isinstance(inst, MemoryFill):
+        read_byte(stream)  # memory index, always 0x00
+    elif isinstance(inst, TableInit):
+        inst.elemidx = read_leb128_unsigned(stream)
+        inst.tableidx = read_leb128_unsigned(stream)
+    elif isinstance(inst, ElemDrop):
+        inst.elemidx = read_leb128_unsigned(stream)
+    elif isinstance(inst, TableCopy):
+        inst.dest_tableidx = read_leb128_unsigned(stream)
+        inst.src_tableidx = read_leb128_unsigned(stream)
+
+    return inst
+
+
+def _read_instruction_fd(stream: BinaryCursor) -> InstructionBase:
+    subopcode = read_leb128_unsigned(stream)
+    if subopcode not in OPCODE_TABLE_FD:
+        raise Exception('Unknown opcode: 0xFD 0x%02X' % subopcode)
+    inst = OPCODE_TABLE_FD[subopcode]()
+
+    if isinstance(inst, VectorMemoryInstructionBase):
+        inst.align = read_leb128_unsigned(stream)
+        inst.offset = read_leb128_unsigned(stream)
+        if isinstance(inst, VectorMemoryLaneInstructionBase):
+            inst.laneidx = read_byte(stream)
+    elif isinstance(inst, V128Const):
+        inst.value = int.from_bytes(read_bytes_typesafe(stream, 16), 'little')
+    elif isinstance(inst, VectorShuffleInstructionBase):
+        inst.lanes = read_bytes_typesafe(stream, 16)
+    elif isinstance(inst, VectorLaneInstructionBase):
+        inst.laneidx = read_byte(stream)
+
+    return inst
+
+
+def _read_instruction_fe(stream: BinaryCursor) -> InstructionBase:
+    subopcode = read_leb128_unsigned(stream)
+    if subopcode not in OPCODE_TABLE_FE:
+        raise Exception('Unknown opcode: 0xFE 0x%02X' % subopcode)
+    inst = OPCODE_TABLE_FE[subopcode]()
+
+    if isinstance(inst, AtomicMemoryInstructionBase):
+        inst.align = read_leb128_unsigned(stream)
+        inst.offset = read_leb128_unsigned(stream)
+    elif isinstance(inst, AtomicFence):
+        read_byte(stream)  # reserved, always 0x00
+
+    return inst
+
+
+def _set_debug_indices(instructions: List[InstructionBase]):
+    for idx, op in enumerate(instructions):
+        op._debug_internal_index = idx
+
+
+read_instructions = _read_instructions
@@ -0,0 +1,60 @@
+# Process-wide interning of decoded function bodies and function types.
+# Modules sharing code (libc, language runtimes, allocators) share one decoded form of it,
+# which is kept while any module refers to it.
+# Shared objects must be treated as immutable.
+
+import hashlib
+import threading
+import weakref
+from typing import List, Optional, Tuple, Union
+
+from ..structure import VALTYPE_TYPE, WasmFunctionType
+from ...opcode import InstructionBase
+from .cursor import BinaryCursor
+from .instruction import read_instructions
+
+
+class InternedInstructions(List[InstructionBase]):
+    " Decoded expr shared between identical function bodies, as list itself can't be weakly referenced "
+
+
+_lock = threading.Lock()
+_bodies: 'weakref.WeakValueDictionary[bytes, InternedInstructions]' = weakref.WeakValueDictionary()
+_functypes: 'weakref.WeakValueDictionary[Tuple[Tuple[VALTYPE_TYPE, ...], Tuple[VALTYPE_TYPE, ...]], WasmFunctionType]' = weakref.WeakValueDictionary()
+
+
+def _body_key(body: Union[bytes, memoryview]) -> bytes:
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+def intern_function_body(body: Union[bytes, memoryview], expr: List[InstructionBase]) -> List[InstructionBase]:
+    " Returns expr already decoded from identical body if any, otherwise registers expr "
+    with _lock:
+        return _bodies.setdefault(_body_key(body), InternedInstructions(expr))
+
+def lookup_function_body(body: Union[bytes, memoryview]) -> Optional[List[InstructionBase]]:
+    " Returns expr already decoded from identical body if any "
+    key = _body_key(body)
+    with _lock:
+        return _bodies.get(key)
+
+def decode_function_body(body: Union[bytes, memoryview]) -> List[InstructionBase]:
+    " Decodes expr of function body, unless identical one is already decoded "
+    key = _body_key(body)
+    with _lock:
+        expr = _bodies.get(key)
+    if expr is not None:
+        return expr
+    _, decoded = read_instructions(BinaryCursor(body))
+    with _lock:
+        return _bodies.setdefault(key, InternedInstructions(decoded))
+
+def intern_functype(functype: WasmFunctionType) -> WasmFunctionType:
+    " Returns equal function type already read if any, otherwise registers functype "
+    key = (tuple(functype.argument_types), tuple(functype.return_types))
+    with _lock:
+        return _functypes.setdefault(key, functype)
+
+def interned_counts() -> Tuple[int, int]:
+    " Numbers of alive interned function bodies and function types "
+    with _lock:
+        return len(_bodies), len(_functypes)
@@ -1,15 +1,25 @@
+import gc
+import io
 import logging
-import struct
-from typing import List, Tuple, IO
-from ..limitlength import LimitedRawIO
-from ...execute.context import WasmCodeFunction, WasmCodeSection, WasmData, WasmElemUnresolved, WasmExport, WasmGlobalSection, WasmImport, WasmParsedModule, WasmSection
-from ..structure import VALTYPE_TYPE
-from .byteencode import read_byte, read_bytes_typesafe, read_functype, read_globaltype, read_int32_le, read_leb128_unsigned, read_memtype, read_tabletype, read_utf8, read_valtype, read_vector, read_vector_bytes
+import mmap
+import threading
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any, Callable, Container, Dict, Iterator, List, Literal, Optional, Tuple, IO, Union, cast
+from ...execute.context import (
+    WASM_SECTION_TYPE, WASM_SEGMENT_MODE, WasmCodeFunction, WasmCodeSection, WasmData, WasmElemUnresolved, WasmExport,
+    WasmGlobalSection, WasmImport, WasmParsedModule, WasmSection, WasmSectionHeader,
+)
+from ..structure import VALTYPE_TYPE, WasmFunctionType
+from ...opcode import InstructionBase
+from .byteencode import BIO, read_byte, read_bytes_typesafe, read_functype, read_globaltype, read_int32_le, read_leb128_unsigned, read_memtype, read_tabletype, read_utf8, read_valtype, read_vector, read_vector_bytes
+from .cursor import BUFFER_SOURCE, BinaryCursor
 from .instruction import read_instructions
+from .intern import decode_function_body, intern_function_body, intern_functype, lookup_function_body
 
 logger = logging.getLogger('wapysm.parser.binary.module')
 
-def read_binary_import(stream: IO[bytes]) -> WasmImport:
+def read_binary_import(stream: BinaryCursor) -> WasmImport:
     "5.5.5 Import Section"
 
     wim = WasmImport()
@@ -28,13 +38,13 @@ def read_binary_import(stream: IO[bytes]) -> WasmImport:
 
     return wim
 
-def read_global_section(stream: IO[bytes]) -> WasmGlobalSection:
+def read_global_section(stream: BinaryCursor) -> WasmGlobalSection:
     sect = WasmGlobalSection()
     sect.gt = read_globaltype(stream)
     _, sect.e = read_instructions(stream)
     return sect
 
-def read_binary_export(stream: IO[bytes]) -> WasmExport:
+def read_binary_export(stream: BinaryCursor) -> WasmExport:
     "5.5.10 Export Section"
 
     wex = WasmExport()
@@ -53,91 +63,420 @@ def read_binary_export(stream: IO[bytes]) -> WasmExport:
 
     return wex
 
-def read_binary_elem(stream: IO[bytes]) -> WasmElemUnresolved:
+def read_binary_elem_expr(stream: BinaryCursor) -> int:
+    "Reads ref.func or ref.null constant expression of element segment"
+
+    opcode = read_byte(stream)
+    if opcode == 0xD2:  # ref.func
+        funcidx = read_leb128_unsigned(stream)
+    elif opcode == 0xD0:  # ref.null
+        read_byte(stream)  # reftype
+        funcidx = -1
+    else:
+        raise Exception('Unsupported element expression: 0x%02X' % opcode)
+    if read_byte(stream) != 0x0B:
+        raise Exception('Element expression must end with "end" opcode')
+    return funcidx
+
+def read_binary_elem(stream: BinaryCursor) -> WasmElemUnresolved:
     "5.5.12 Element Section"
 
-    tableidx = read_leb128_unsigned(stream)
-    _, expr = read_instructions(stream)
-    init = read_vector(stream, read_leb128_unsigned)
-    return WasmElemUnresolved(tableidx, expr, init)
+    # bit 0: passive or declarative, bit 1: explicit table index or declarative, bit 2: expressions
+    flags = read_leb128_unsigned(stream)
+    if flags > 7:
+        raise Exception(f'Invalid flags for element segment: {flags}')
+    tableidx = 0
+    expr: List[InstructionBase] = []
+    if flags & 0x01:
+        mode: WASM_SEGMENT_MODE = 'declarative' if flags & 0x02 else 'passive'
+    else:
+        mode = 'active'
+        if flags & 0x02:
+            tableidx = read_leb128_unsigned(stream)
+        _, expr = read_instructions(stream)
+    if flags & 0x03:
+        read_byte(stream)  # elemkind or reftype, always funcref
+    if flags & 0x04:
+        init = read_vector(stream, read_binary_elem_expr)
+    else:
+        init = read_vector(stream, read_leb128_unsigned)
+    return WasmElemUnresolved(tableidx, expr, init, mode)
 
-def read_binary_code_function(stream: IO[bytes]) -> WasmCodeFunction:
+def read_functype_interned(stream: BinaryCursor) -> WasmFunctionType:
+    return intern_functype(read_functype(stream))
+
+def read_binary_code_function(stream: BinaryCursor, lazy: bool = False) -> WasmCodeFunction:
+    """
+    Reads locals and expr until the end of stream.
+    If lazy, expr is kept as view of stream and decoded on its first access.
+    """
     wcode = WasmCodeFunction()
 
-    def read_locals(stream: IO[bytes]) -> Tuple[int, VALTYPE_TYPE]:
+    def read_locals(stream: BinaryCursor) -> Tuple[int, VALTYPE_TYPE]:
         n = read_leb128_unsigned(stream)
         type = read_valtype(stream)
         return n, type
 
     wcode.code_locals = read_vector(stream, read_locals)
-    _, wcode.expr = read_instructions(stream)
+    if lazy:
+        wcode.body = stream.view(len(stream))
+    else:
+        wcode.expr = decode_function_body(stream.view(len(stream)))
     return wcode
 
-def read_binary_code_section(stream: IO[bytes]) -> WasmCodeSection:
+def read_binary_code_section(stream: BinaryCursor, lazy: bool = False) -> WasmCodeSection:
     wcode = WasmCodeSection()
     wcode.size = read_leb128_unsigned(stream)
-    wcode.code = read_binary_code_function(stream)
+    wcode.code = read_binary_code_function(stream.sub(wcode.size), lazy)
     return wcode
 
-def read_binary_data_section(stream: IO[bytes]) -> WasmData:
-    memidx = read_leb128_unsigned(stream)
+def read_binary_code_section_lazy(stream: BinaryCursor) -> WasmCodeSection:
+    return read_binary_code_section(stream, True)
+
+def read_binary_data_section(stream: BinaryCursor) -> WasmData:
+    # 0: active with memory 0, 1: passive, 2: active with explicit memory index
+    flags = read_leb128_unsigned(stream)
+    if flags == 1:
+        return WasmData(0, [], read_vector_bytes(stream), 'passive')
+    elif flags == 2:
+        memidx = read_leb128_unsigned(stream)
+    elif flags == 0:
+        memidx = 0
+    else:
+        raise Exception(f'Invalid flags for data segment: {flags}')
     _, expr = read_instructions(stream)
     data = read_vector_bytes(stream)
     return WasmData(memidx, expr, data)
 
-def parse_binary_wasm_sections(stream: IO[bytes]) -> List[WasmSection]:
+def read_binary_section_content(section_id: int, stream: BinaryCursor, lazy: bool = True) -> WASM_SECTION_TYPE:
+    " Reads content of a section until the end of stream "
+    if section_id == 1:  # type section
+        return read_vector(stream, read_functype_interned)
+    elif section_id == 2:  # import section
+        return read_vector(stream, read_binary_import)
+    elif section_id == 3:  # function section
+        return read_vector(stream, read_leb128_unsigned)
+    elif section_id == 4:  # table section
+        return read_vector(stream, read_tabletype)
+    elif section_id == 5:  # memory section
+        return read_vector(stream, read_memtype)
+    elif section_id == 6:  # global section
+        return read_vector(stream, read_global_section)
+    elif section_id == 7:  # export section
+        return read_vector(stream, read_binary_export)
+    elif section_id == 8:  # start section
+        return read_leb128_unsigned(stream)
+    elif section_id == 9:  # element section
+        return read_vector(stream, read_binary_elem)
+    elif section_id == 10:  # code section
+        return read_vector(stream, read_binary_code_section_lazy if lazy else read_binary_code_section)
+    elif section_id == 11:  # data section
+        return read_vector(stream, read_binary_data_section)
+    elif section_id == 12:  # data count section
+        return read_leb128_unsigned(stream)
+    else:  # custom section and undefined ID
+        return read_bytes_typesafe(stream)
+
+def parse_binary_wasm_sections(stream: BinaryCursor, lazy: bool = True, section_ids: Optional[Container[int]] = None) -> List[WasmSection]:
+    " Sections not in section_ids are skipped without decoding "
     sections: List[WasmSection] = []
-    while True:
-        try:
-            section_id = read_byte(stream)
-        except (AssertionError, IndexError, struct.error):
-            break
-        logger.debug(f'going to parse section {section_id}')
-        section_size: int = read_leb128_unsigned(stream)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    while not stream.eof():
+        section_id = stream.read_byte()
+        section_size: int = stream.read_leb128_unsigned()
+        limited = stream.sub(section_size)
+        if section_ids is not None and section_id not in section_ids:
+            continue
+        if debug:
+            logger.debug('going to parse section %d', section_id)
 
         section = WasmSection()
         section.section_id = section_id
-        limited = LimitedRawIO(stream, section_size)
-
-        if section_id == 1:  # type section
-            section.section_content = read_vector(limited, read_functype)
-        elif section_id == 2:  # import section
-            section.section_content = read_vector(limited, read_binary_import)
-        elif section_id == 3:  # function section
-            section.section_content = read_vector(limited, read_leb128_unsigned)
-        elif section_id == 4:  # table section
-            section.section_content = read_vector(limited, read_tabletype)
-        elif section_id == 5:  # memory section
-            section.section_content = read_vector(limited, read_memtype)
-        elif section_id == 6:  # global section
-            section.section_content = read_vector(limited, read_global_section)
-        elif section_id == 7:  # export section
-            section.section_content = read_vector(limited, read_binary_export)
-        elif section_id == 8:  # start section
-            section.section_content = read_leb128_unsigned(limited)
-        elif section_id == 9:  # element section
-            section.section_content = read_vector(limited, read_binary_elem)
-        elif section_id == 10:  # code section
-            section.section_content = read_vector(limited, read_binary_code_section)
-        elif section_id == 11:  # data section
-            section.section_content = read_vector(limited, read_binary_data_section)
-        else:  # custom section and undefined ID
-            section.section_content = read_bytes_typesafe(limited)
-
-
+        section.section_content = read_binary_section_content(section_id, limited, lazy)
         sections.append(section)
 
     return sections
 
-def parse_binary_wasm_module(stream: IO[bytes]) -> WasmParsedModule:
+def _read_header(stream: BIO) -> Tuple[int, int]:
+    " Reads magic and version, returns version and number of bytes read "
     magic = read_bytes_typesafe(stream, 4)
     if magic != b'\x00asm':
         raise Exception('Input does not have valid WASM header')
     version = read_int32_le(stream)
     if version != 1:
         raise Exception(f'Version {version} is not supported')
+    return version, 8
+
+def _read_leb128_unsigned_counted(stream: IO[bytes]) -> Tuple[int, int]:
+    " Returns value and number of bytes read "
+    result = 0
+    count = 0
+    while True:
+        b = read_bytes_typesafe(stream, 1)
+        if not b:
+            raise Exception('Unexpected end of stream in section header')
+        result |= (b[0] & 0x7f) << (7 * count)
+        count += 1
+        if not (b[0] & 0x80):
+            return result, count
+
+def _skip_stream(stream: IO[bytes], size: int):
+    if stream.seekable():
+        stream.seek(size, io.SEEK_CUR)
+        return
+    while size > 0:
+        chunk = read_bytes_typesafe(stream, min(size, 65536))
+        if not chunk:
+            raise Exception('Unexpected end of stream in section content')
+        size -= len(chunk)
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    content = read_bytes_typesafe(stream, size)
+    if len(content) != size:
+        raise Exception('Unexpected end of stream in section content')
+    return content
+
+def _scan_stream_sections(stream: IO[bytes], offset: int, section_ids: Container[int]) -> Iterator[Tuple[WasmSectionHeader, Optional[bytes]]]:
+    " Yields headers with content of sections in section_ids, other sections are skipped "
+    while True:
+        b = read_bytes_typesafe(stream, 1)
+        if not b:
+            return
+        size, count = _read_leb128_unsigned_counted(stream)
+        header = WasmSectionHeader(b[0], offset + 1 + count, size)
+        offset = header.offset + size
+        if header.section_id in section_ids:
+            yield header, _read_exact(stream, size)
+        else:
+            _skip_stream(stream, size)
+            yield header, None
+
+def scan_binary_wasm_section_headers(source: Union[IO[bytes], BUFFER_SOURCE, BinaryCursor]) -> List[WasmSectionHeader]:
+    """
+    Lists sections without reading their content.
+    Content in seekable stream is skipped by seek, otherwise it is read and discarded.
+    """
+    if not isinstance(source, (bytes, bytearray, memoryview, mmap.mmap, BinaryCursor)):
+        _, offset = _read_header(source)
+        return [header for header, _ in _scan_stream_sections(source, offset, ())]
+
+    # content is not kept, so buffer is not copied as BinaryCursor.open would
+    cursor = source if isinstance(source, BinaryCursor) else BinaryCursor(source)
+    _read_header(cursor)
+    headers: List[WasmSectionHeader] = []
+    while not cursor.eof():
+        section_id = cursor.read_byte()
+        size = cursor.read_leb128_unsigned()
+        headers.append(WasmSectionHeader(section_id, cursor.tell(), size))
+        cursor.sub(size)
+    return headers
+
+WASM_PARSE_EVENT_TYPE = Literal[
+    'section',  # WasmSectionHeader, before items of the section
+    'import',  # WasmImport
+    'export',  # WasmExport
+    'code',  # WasmCodeSection, whose expr is decoded on its first access
+    'data',  # WasmData
+    'content',  # WASM_SECTION_TYPE, whole content of other sections
+]
+WASM_PARSE_EVENT = Tuple[WASM_PARSE_EVENT_TYPE, Any]
+
+# sections whose items are emitted one by one
+_SECTION_ITEM_EVENTS: Dict[int, Tuple[WASM_PARSE_EVENT_TYPE, Callable[[BinaryCursor], Any]]] = {
+    2: ('import', read_binary_import),
+    7: ('export', read_binary_export),
+    10: ('code', read_binary_code_section_lazy),
+    11: ('data', read_binary_data_section),
+}
+
+def _iter_section_events(section_id: int, stream: BinaryCursor) -> Iterator[WASM_PARSE_EVENT]:
+    item_event = _SECTION_ITEM_EVENTS.get(section_id)
+    if item_event is None:
+        yield 'content', read_binary_section_content(section_id, stream)
+        return
+    event_type, read_item = item_event
+    for _ in range(stream.read_leb128_unsigned()):
+        yield event_type, read_item(stream)
+
+def iter_binary_wasm_events(source: Union[IO[bytes], BUFFER_SOURCE]) -> Iterator[WASM_PARSE_EVENT]:
+    """
+    Parses module as events instead of WasmParsedModule, see WASM_PARSE_EVENT_TYPE.
+    Stream is read as events are consumed, and function bodies are read one by one,
+    so that events of earlier sections are available before the rest arrives.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap, BinaryCursor)):
+        cursor = BinaryCursor.open(source)
+        _read_header(cursor)
+        while not cursor.eof():
+            section_id = cursor.read_byte()
+            size = cursor.read_leb128_unsigned()
+            yield 'section', WasmSectionHeader(section_id, cursor.tell(), size)
+            yield from _iter_section_events(section_id, cursor.sub(size))
+        return
+
+    _, offset = _read_header(source)
+    while True:
+        b = read_bytes_typesafe(source, 1)
+        if not b:
+            return
+        size, count = _read_leb128_unsigned_counted(source)
+        header = WasmSectionHeader(b[0], offset + 1 + count, size)
+        offset = header.offset + size
+        yield 'section', header
+
+        if header.section_id != 10:
+            yield from _iter_section_events(header.section_id, BinaryCursor(_read_exact(source, size)))
+            continue
+        # code section, items have their size
+        for _ in range(read_leb128_unsigned(source)):
+            wcode = WasmCodeSection()
+            wcode.size = read_leb128_unsigned(source)
+            wcode.code = read_binary_code_function(BinaryCursor(_read_exact(source, wcode.size)), True)
+            yield 'code', wcode
+
+# threads decoding in _gc_paused, and whether collector was enabled before the first of them
+_gc_pause_lock = threading.Lock()
+_gc_pause_count = 0
+_gc_pause_enabled = False
+
+@contextmanager
+def _gc_paused(pause: bool) -> Iterator[None]:
+    """
+    Decoding allocates millions of acyclic instruction objects, which would trigger full collections repeatedly.
+    If pause, the collector is disabled for the whole process, so this only wraps decoding of buffers in memory,
+    never reading streams or waiting for other threads. It is enabled again when the last thread leaves.
+    """
+    global _gc_pause_count, _gc_pause_enabled
+    if not pause:
+        yield
+        return
+    with _gc_pause_lock:
+        if _gc_pause_count == 0:
+            _gc_pause_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_count += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_count -= 1
+            if _gc_pause_count == 0 and _gc_pause_enabled:
+                gc.enable()
+
+def decode_function_bodies(bodies: List[bytes], pause_gc: bool = False) -> List[List[InstructionBase]]:
+    " Decodes function bodies (expr in code section), run in executor of parse_binary_wasm_module "
+    with _gc_paused(pause_gc):
+        return [read_instructions(BinaryCursor(body))[1] for body in bodies]
+
+def _take_undecoded_bodies(codes: List[WasmCodeFunction], waiting: Dict[bytes, List[WasmCodeFunction]]) -> List[bytes]:
+    """
+    Sets expr of codes whose body is already interned, and returns bodies to be decoded in executor,
+    each only once even if it appears again in waiting (which maps bodies being decoded to their codes).
+    """
+    bodies: List[bytes] = []
+    for wcode in codes:
+        # copied to bytes so that they can be sent to other processes
+        body = bytes(cast(memoryview, wcode.body))
+        group = waiting.get(body)
+        if group is not None:
+            group.append(wcode)
+            continue
+        expr = lookup_function_body(body)
+        if expr is not None:
+            wcode.expr = expr
+            continue
+        waiting[body] = [wcode]
+        bodies.append(body)
+    return bodies
+
+def _set_decoded_bodies(bodies: List[bytes], exprs: List[List[InstructionBase]], waiting: Dict[bytes, List[WasmCodeFunction]]):
+    for body, expr in zip(bodies, exprs):
+        expr = intern_function_body(body, expr)
+        for wcode in waiting.pop(body):
+            wcode.expr = expr
+
+def _decode_code_sections_in_executor(sections: List[WasmSection], executor: Executor, chunk_size: int, pause_gc: bool):
+    codes = [x.code for s in sections if s.section_id == 10 for x in cast(List[WasmCodeSection], s.section_content)]
+    waiting: Dict[bytes, List[WasmCodeFunction]] = {}
+    bodies = _take_undecoded_bodies(codes, waiting)
+    chunks = [bodies[i:i + chunk_size] for i in range(0, len(bodies), chunk_size)]
+    for chunk, exprs in zip(chunks, executor.map(decode_function_bodies, chunks, [pause_gc] * len(chunks))):
+        _set_decoded_bodies(chunk, exprs, waiting)
+
+def _parse_binary_wasm_module_pipelined(source: IO[bytes], executor: Executor, chunk_size: int, pause_gc: bool) -> WasmParsedModule:
+    " Function bodies are submitted to executor as soon as chunk_size bodies are read, while the rest is being read "
+    module = WasmParsedModule()
+    module.version = 1  # otherwise rejected by iter_binary_wasm_events
+    module.sections = []
+    # bodies not interned yet, which are submitted by chunk_size
+    waiting: Dict[bytes, List[WasmCodeFunction]] = {}
+    pending: List[bytes] = []
+    submitted: List[Tuple[List[bytes], 'Future[List[List[InstructionBase]]]']] = []
+
+    def submit():
+        submitted.append((pending[:], executor.submit(decode_function_bodies, pending[:], pause_gc)))
+        pending.clear()
+
+    for event_type, value in iter_binary_wasm_events(source):
+        if event_type == 'section':
+            section = WasmSection()
+            section.section_id = value.section_id
+            section.section_content = []
+            module.sections.append(section)
+        elif event_type == 'content':
+            module.sections[-1].section_content = value
+        else:
+            cast(list, module.sections[-1].section_content).append(value)
+            if event_type == 'code':
+                pending.extend(_take_undecoded_bodies([value.code], waiting))
+                if len(pending) >= chunk_size:
+                    submit()
+    if pending:
+        submit()
+
+    for bodies, future in submitted:
+        _set_decoded_bodies(bodies, future.result(), waiting)
+    return module
 
+def parse_binary_wasm_module(
+    source: Union[IO[bytes], BUFFER_SOURCE],
+    lazy: bool = True,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 256,
+    section_ids: Optional[Container[int]] = None,
+    pause_gc: bool = False,
+) -> WasmParsedModule:
+    """
+    Parses module from bytes-like object (including mmap), or rest of the stream.
+    bytes, mmap and read-only memoryview are not copied, other bytes-like objects are copied once (see BinaryCursor.open).
+    If lazy, function bodies are decoded on their first use (and the buffer is kept referenced).
+    If executor is given, all function bodies are decoded in it by chunk_size functions, and lazy is ignored.
+    For stream, they are submitted while the rest of stream is being read.
+    If section_ids is given, only sections with these IDs are decoded, and only their content is read from stream.
+    If pause_gc, garbage collector is disabled while a buffer in memory is being decoded (not while reading stream
+    nor waiting for executor), as the decoded objects are acyclic and collecting them is wasted work.
+    This affects all threads of the process, and overlapping parses enable it again only when the last one ends.
+    """
     module = WasmParsedModule()
-    module.version = version
-    module.sections = parse_binary_wasm_sections(stream)  # noqa: F841
+    lazy = lazy or executor is not None
+    is_stream = not isinstance(source, (bytes, bytearray, memoryview, mmap.mmap, BinaryCursor))
+    if executor is not None and is_stream and section_ids is None:
+        return _parse_binary_wasm_module_pipelined(cast(IO[bytes], source), executor, chunk_size, pause_gc)
+    if section_ids is not None and not isinstance(source, (bytes, bytearray, memoryview, mmap.mmap, BinaryCursor)):
+        module.version, offset = _read_header(source)
+        module.sections = []
+        for header, content in _scan_stream_sections(source, offset, section_ids):
+            if content is not None:
+                section = WasmSection()
+                section.section_id = header.section_id
+                with _gc_paused(pause_gc):
+                    section.section_content = read_binary_section_content(header.section_id, BinaryCursor(content), lazy)
+                module.sections.append(section)
+    else:
+        stream = BinaryCursor.open(source)
+        module.version, _ = _read_header(stream)
+        with _gc_paused(pause_gc):
+            module.sections = parse_binary_wasm_sections(stream, lazy, section_ids)
+    if executor is not None:
+        _decode_code_sections_in_executor(module.sections, executor, chunk_size, pause_gc)
     return module
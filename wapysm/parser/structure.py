@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional, Union, Literal
 
-VALTYPE_NUMBERS = Literal[0x7f, 0x7e, 0x7d, 0x7c]
-VALTYPE_STRINGS = Literal['i32', 'i64', 'f32', 'f64']
+VALTYPE_NUMBERS = Literal[0x7f, 0x7e, 0x7d, 0x7c, 0x7b]
+VALTYPE_STRINGS = Literal['i32', 'i64', 'f32', 'f64', 'v128']
 
 VALTYPE_TYPE = Union[VALTYPE_NUMBERS, VALTYPE_STRINGS]
 
@@ -10,6 +10,7 @@ TYPES_TO_TYPENUMBER: Dict[VALTYPE_TYPE, VALTYPE_NUMBERS] = {
     0x7e: 0x7e, 'i64': 0x7e,
     0x7d: 0x7d, 'f32': 0x7d,
     0x7c: 0x7c, 'f64': 0x7c,
+    0x7b: 0x7b, 'v128': 0x7b,
 }
 
 TYPES_TO_TYPENAME: Dict[VALTYPE_TYPE, VALTYPE_STRINGS] = {
@@ -17,6 +18,7 @@ TYPES_TO_TYPENAME: Dict[VALTYPE_TYPE, VALTYPE_STRINGS] = {
     0x7e: 'i64', 'i64': 'i64',
     0x7d: 'f32', 'f32': 'f32',
     0x7c: 'f64', 'f64': 'f64',
+    0x7b: 'v128', 'v128': 'v128',
 }
 
 class WasmFunctionType():
@@ -35,10 +37,12 @@ class WasmFunctionType():
 class WasmLimits():
     minimum: int = 0
     maximum: Optional[int] = None
+    shared: bool = False  # threads proposal, memories only
 
-    def __init__(self, minimum: int, maximum: Optional[int]) -> None:
+    def __init__(self, minimum: int, maximum: Optional[int], shared: bool = False) -> None:
         self.minimum = minimum
         self.maximum = maximum
+        self.shared = shared
 
 
 class WasmTableType():
@@ -0,0 +1,315 @@
+# Running exported functions in worker processes, as the interpreter holds the GIL
+import functools
+import gc
+import multiprocessing
+import multiprocessing.context
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .execute.context import WASM_EXPORT_OBJECT, WasmModule
+from .execute.pool import WasmInstancePool
+from .execute.snapshot import snapshot_instance
+from .parser.binary.cursor import BUFFER_SOURCE
+from .webassembly import WebAssembly
+
+IMPORT_OBJECT = Dict[str, Dict[str, WASM_EXPORT_OBJECT]]
+
+# state of worker process, set by _initialize_worker
+_worker_wasm: Optional[WebAssembly] = None
+_worker_pool: Optional[WasmInstancePool] = None
+_worker_instances: Dict[int, WebAssembly] = {}
+
+
+def _initialize_worker(
+    source: Union[str, bytes],
+    import_object: Union[IMPORT_OBJECT, Callable[[], IMPORT_OBJECT]],
+    cache_dir: Optional[str],
+    reset: bool,
+):
+    global _worker_wasm, _worker_pool
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            source = f.read()
+    if callable(import_object):
+        import_object = import_object()
+    compiled = WebAssembly.compile(source, cache_dir=cache_dir)
+    if reset:
+        _worker_pool = WasmInstancePool.from_module(compiled, import_object, max_idle=1)
+    else:
+        _worker_wasm = WebAssembly.instantiate_parsed(compiled, import_object)
+
+
+def _invoke(export_name: str, *args: Any) -> Any:
+    if _worker_pool is None:
+        assert _worker_wasm is not None
+        return _worker_wasm.exports[export_name](*args)
+    module: WasmModule = _worker_pool.acquire()
+    try:
+        wasm = _worker_instances.get(id(module))
+        if wasm is None or wasm.module is not module:
+            wasm = _worker_instances[id(module)] = WebAssembly(module, _worker_pool.snapshot.compiled)
+        return wasm.exports[export_name](*args)
+    finally:
+        _worker_pool.release(module)
+
+
+class WasmProcessPool():
+    """
+    Runs exported functions of a module in worker processes, each of which instantiates the module once.
+    source is module binary, or path to it which workers read by themselves.
+    Modules are compiled through ModuleDiskCache in cache_dir if given, which the pool fills before starting workers.
+    import_object must be picklable, or a picklable function called in each worker to make one,
+    e.g. one giving memories made by WasmMemoryInstance.create_shared.
+    If reset, each call runs on an instance in the state just after instantiation, otherwise calls share one instance per worker.
+    Results are returned, and traps are raised, through concurrent.futures.Future.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, BUFFER_SOURCE],
+        import_object: Union[IMPORT_OBJECT, Callable[[], IMPORT_OBJECT], None] = None,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        reset: bool = False,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> None:
+        if not isinstance(source, str):
+            source = bytes(source)
+        if cache_dir is not None:
+            # workers only load the compiled module
+            if isinstance(source, str):
+                with open(source, 'rb') as f:
+                    WebAssembly.compile(f.read(), cache_dir=cache_dir)
+            else:
+                WebAssembly.compile(source, cache_dir=cache_dir)
+        self._executor = ProcessPoolExecutor(
+            max_workers or os.cpu_count() or 1,
+            mp_context=mp_context,
+            initializer=_initialize_worker,
+            initargs=(source, {} if import_object is None else import_object, cache_dir, reset),
+        )
+
+    def submit(self, export_name: str, *args: Any) -> 'Future[Any]':
+        " Calls exported function with args in a worker "
+        return self._executor.submit(_invoke, export_name, *args)
+
+    def map(self, export_name: str, *iterables: Iterable[Any], timeout: Optional[float] = None, chunksize: int = 1) -> Iterator[Any]:
+        " Calls exported function with arguments taken from iterables, as Executor.map "
+        return self._executor.map(functools.partial(_invoke, export_name), *iterables, timeout=timeout, chunksize=chunksize)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self) -> 'WasmProcessPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+def _serve_forked_worker(conn: Connection, wasm: Optional[WebAssembly], pool: Optional[WasmInstancePool]):
+    " Loop of forked worker, answering (export_name, args) with (True, result) or (False, exception) until None "
+    global _worker_wasm, _worker_pool
+    _worker_wasm, _worker_pool = wasm, pool
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        export_name, args = request
+        try:
+            response = (True, _invoke(export_name, *args))
+        except BaseException as e:
+            response = (False, e)
+        try:
+            conn.send(response)
+        except Exception as e:
+            # exception or result which can't be pickled
+            conn.send((False, RuntimeError(repr(e))))
+
+
+class WasmPreforkPool():
+    """
+    Instantiates a module and runs warmup on it in this process, then forks workers which inherit the instance,
+    its decoded code and initialized memory through copy-on-write pages, instead of parsing and initializing it again.
+    Calls are sent to idle workers through pipes, and results and traps are returned through concurrent.futures.Future.
+    Function bodies decoded by warmup are shared, and all of them are decoded before forking if decode_all,
+    which pays decoding of functions workers may never call once rather than in each worker.
+    If reset, workers reset their instance to the state after warmup after each call, restoring only written pages.
+    A call running in a worker which exits fails with BrokenProcessPool, and once all workers have exited,
+    queued and new calls fail with it too.
+    Available only where os.fork is, and should be created before starting threads.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, BUFFER_SOURCE],
+        import_object: Optional[IMPORT_OBJECT] = None,
+        workers: Optional[int] = None,
+        warmup: Optional[Callable[[WebAssembly], None]] = None,
+        reset: bool = False,
+        cache_dir: Optional[str] = None,
+        decode_all: bool = False,
+    ) -> None:
+        if not hasattr(os, 'fork'):
+            raise NotImplementedError('WasmPreforkPool requires os.fork')
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                source = f.read()
+        import_object = {} if import_object is None else import_object
+        compiled = WebAssembly.compile(source, cache_dir=cache_dir)
+        wasm = WebAssembly.instantiate_parsed(compiled, import_object)
+        if warmup is not None:
+            warmup(wasm)
+        pool: Optional[WasmInstancePool] = None
+        if reset:
+            pool = WasmInstancePool(snapshot_instance(wasm.module, compiled), import_object, max_idle=1)
+            # cloned once here, and shared by workers
+            pool.release(pool.acquire())
+        if decode_all:
+            for code in compiled.codes:
+                code.code.expr
+
+        self._tasks: 'queue.SimpleQueue[Optional[Tuple[Future[Any], str, Tuple[Any, ...]]]]' = queue.SimpleQueue()
+        # guards _live_workers, _broken and _shutdown, and is held while putting tasks
+        self._lock = threading.Lock()
+        self._broken = False
+        self._shutdown = False
+        self._conns: List[Connection] = []
+        self.pids: List[int] = []
+        pipes = [multiprocessing.Pipe() for _ in range(workers or os.cpu_count() or 1)]
+        # objects made so far are not touched by garbage collector of workers, to keep pages shared
+        gc.freeze()
+        try:
+            for parent_conn, child_conn in pipes:
+                pid = os.fork()
+                if pid == 0:
+                    status = 0
+                    try:
+                        for other_parent, other_child in pipes:
+                            other_parent.close()
+                            if other_child is not child_conn:
+                                other_child.close()
+                        _serve_forked_worker(child_conn, None if reset else wasm, pool)
+                    except BaseException:
+                        status = 1
+                    finally:
+                        os._exit(status)
+                self.pids.append(pid)
+        finally:
+            gc.unfreeze()
+        for parent_conn, child_conn in pipes:
+            child_conn.close()
+            self._conns.append(parent_conn)
+        self._live_workers = len(self._conns)
+        self._threads = [threading.Thread(target=self._dispatch, args=(conn, ), daemon=True) for conn in self._conns]
+        for thread in self._threads:
+            thread.start()
+
+    def _dispatch(self, conn: Connection):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+                conn.close()
+                return
+            future, export_name, args = task
+            # tasks queued again by _worker_exited are already running
+            if not (future.running() or future.set_running_or_notify_cancel()):
+                continue
+            try:
+                conn.send((export_name, args))
+            except OSError as e:
+                # not received by the worker, so other workers can run it
+                self._worker_exited(conn, task, e)
+                return
+            try:
+                succeeded, value = conn.recv()
+            except (EOFError, OSError) as e:
+                future.set_exception(BrokenProcessPool(f'worker exited while running {export_name}: {e!r}'))
+                self._worker_exited(conn, None, e)
+                return
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _worker_exited(self, conn: Connection, task: Optional[Tuple['Future[Any]', str, Tuple[Any, ...]]], error: BaseException):
+        " Stops dispatching to conn, and queues task again for other workers, or fails it and queued calls if none is left "
+        conn.close()
+        with self._lock:
+            self._live_workers -= 1
+            self._broken = self._live_workers == 0
+            # after shutdown, task queued again would be behind the sentinels
+            if task is not None and not self._broken and not self._shutdown:
+                self._tasks.put(task)
+                return
+        if task is not None:
+            task[0].set_exception(BrokenProcessPool(f'worker exited: {error!r}'))
+        if not self._broken:
+            return
+        while True:
+            try:
+                queued = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            if queued is not None and (queued[0].running() or queued[0].set_running_or_notify_cancel()):
+                queued[0].set_exception(BrokenProcessPool(f'all workers exited: {error!r}'))
+
+    def submit(self, export_name: str, *args: Any) -> 'Future[Any]':
+        " Calls exported function with args in an idle worker "
+        future: 'Future[Any]' = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot submit calls after shutdown')
+            if self._broken:
+                raise BrokenProcessPool('all workers exited')
+            self._tasks.put((future, export_name, args))
+        return future
+
+    def map(self, export_name: str, *iterables: Iterable[Any], timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Calls exported function with arguments taken from iterables, and returns iterator of results in order.
+        As Executor.map, all calls are submitted before returning, and timeout counts from this call.
+        """
+        futures = [self.submit(export_name, *args) for args in zip(*iterables)]
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def results() -> Iterator[Any]:
+            for future in futures:
+                yield future.result(None if deadline is None else max(0, deadline - time.monotonic()))
+        return results()
+
+    def shutdown(self, wait: bool = True):
+        " Stops workers after queued calls "
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                for _ in self._threads:
+                    self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+            for pid in self.pids:
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    # already waited for by the caller
+                    pass
+
+    def __enter__(self) -> 'WasmPreforkPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -7,7 +7,7 @@ import sys
 import time
 
 from math import isnan
-from typing import Callable, Dict, List, Sized, cast
+from typing import Callable, Dict, List, Sized, Union, cast
 
 from .utils import reflect_delete_prop, reflect_get, reflect_set
 from ..execute.interpreter.invocation import wrap_function
@@ -87,11 +87,15 @@ class Go():
             self.mem.set_int32(addr + 4, NAN_HEAD or type_flag)
             self.mem.set_int32(addr, obj_id)
 
-        def load_slice(addr: int) -> bytearray:
+        def load_slice(addr: int) -> Union[bytearray, bytes]:
             begin = self.mem.get_int64(addr)
             length = self.mem.get_int64(addr + 8)
             return self.mem.trim(begin, length)
 
+        def store_slice(addr: int, data: Union[bytes, bytearray]):
+            " writes into slice at addr, as load_slice returns a copy "
+            self.mem.write(self.mem.get_int64(addr), data)
+
         def load_slice_of_values(addr) -> list:
             begin = self.mem.get_int64(addr)
             length = self.mem.get_int64(addr + 8)
@@ -164,8 +168,7 @@ class Go():
 
         def _golangimport_runtime_getrandomdata(ws: WasmStore, wm: WasmModule, lc: Dict[int, WASM_VALUE], args: List[WASM_VALUE]):
             sp = int(args[0][2])
-            sl = load_slice(sp + 8)
-            sl[:] = secrets.token_bytes(len(sl))
+            store_slice(sp + 8, secrets.token_bytes(self.mem.get_int64(sp + 16)))
 
         def _golangimport_syscall_js_finalizeref(ws: WasmStore, wm: WasmModule, lc: Dict[int, WASM_VALUE], args: List[WASM_VALUE]):
             sp = int(args[0][2])
@@ -260,7 +263,7 @@ class Go():
         def _golangimport_syscall_js_valueloadstring(ws: WasmStore, wm: WasmModule, lc: Dict[int, WASM_VALUE], args: List[WASM_VALUE]):
             sp = int(args[0][2])
             string = load_value(sp + 8)
-            load_slice(sp + 16)[:] = cast(bytes, string)
+            store_slice(sp + 16, cast(bytes, string))
 
         def _golangimport_syscall_js_valueinstanceof(ws: WasmStore, wm: WasmModule, lc: Dict[int, WASM_VALUE], args: List[WASM_VALUE]):
             sp = int(args[0][2])
@@ -274,7 +277,7 @@ class Go():
                 self.mem[sp + 48] = 0
                 return
             copy_length = min(len(dst), len(src))
-            dst[:copy_length] = src[:copy_length]
+            store_slice(sp + 8, src[:copy_length])
             self.mem.set_int64(sp + 40, copy_length)
             self.mem[sp + 48] = 1
 
@@ -346,7 +349,7 @@ class Go():
             nonlocal offset
             ptr = offset
             bytes_ = f'{str}\0'.encode('utf-8')
-            mem.data[offset:offset + len(bytes_)] = bytes_
+            mem.write(offset, bytes_)
             offset += len(bytes_)
 
             if offset % 8 != 0:
@@ -1,9 +1,12 @@
-from typing import IO, Dict, Union
-from io import BytesIO
+from concurrent.futures import Executor
+from typing import IO, Dict, Optional, Union
 
+from .cache import ModuleCache, ModuleDiskCache
 from .execute.interpreter.invocation import wrap_function
-from .execute.initialization import initialize_wasm_module, instantiate_wasm_module
-from .execute.context import WASM_EXPORT_OBJECT, WasmFunctionInstance, WasmModule, WasmParsedModule
+from .execute.initialization import compile_wasm_module, initialize_wasm_module, instantiate_wasm_module
+from .execute.context import WASM_EXPORT_OBJECT, WasmCompiledModule, WasmFunctionInstance, WasmModule, WasmParsedModule
+from .execute.snapshot import WasmInstanceSnapshot, clone_instance, snapshot_instance
+from .parser.binary.cursor import BUFFER_SOURCE
 from .parser.binary.module import parse_binary_wasm_module
 
 
@@ -22,32 +25,72 @@ class WebAssembly:
 
 
     @staticmethod
-    def instantiate(buffer_source: Union[bytearray, bytes], import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> 'WebAssembly':
+    def instantiate(
+        buffer_source: BUFFER_SOURCE,
+        import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]],
+        executor: Optional[Executor] = None,
+        cache_dir: Optional[str] = None,
+        module_cache: Optional[ModuleCache] = None,
+    ) -> 'WebAssembly':
         """
         https://developer.mozilla.org/ja/docs/Web/JavaScript/Reference/Global_Objects/WebAssembly/instantiate
         """
-        return WebAssembly.instantiate_streaming(BytesIO(buffer_source), import_object)
+        if cache_dir is not None or module_cache is not None:
+            return WebAssembly.instantiate_parsed(WebAssembly.compile(buffer_source, executor, cache_dir, module_cache), import_object)
+        return WebAssembly.instantiate_streaming(buffer_source, import_object, executor)
 
     @staticmethod
-    def instantiate_streaming(source: IO[bytes], import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> 'WebAssembly':
+    def instantiate_streaming(
+        source: Union[IO[bytes], BUFFER_SOURCE],
+        import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]],
+        executor: Optional[Executor] = None,
+    ) -> 'WebAssembly':
         """
         https://developer.mozilla.org/ja/docs/Web/JavaScript/Reference/Global_Objects/WebAssembly/instantiateStreaming
+        If executor is given, function bodies are decoded in it while the rest of source is being read.
         """
-        parsed_module = parse_binary_wasm_module(source)
+        return WebAssembly.instantiate_parsed(WebAssembly.compile_streaming(source, executor), import_object)
+
+    @staticmethod
+    def instantiate_parsed(parsed_module: WasmParsedModule, import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> 'WebAssembly':
+        " Instantiates module returned by compile, which can be instantiated many times "
         module = initialize_wasm_module(parsed_module, import_object)
         instantiate_wasm_module(module, parsed_module, import_object)
         return WebAssembly(module, parsed_module)
 
+    def snapshot(self) -> WasmInstanceSnapshot:
+        " Captures state of this instance, e.g. after its runtime is initialized, to clone it by from_snapshot "
+        return snapshot_instance(self.module, compile_wasm_module(self.raw_module))
+
+    @staticmethod
+    def from_snapshot(snapshot: Union[WasmInstanceSnapshot, str], import_object: Dict[str, Dict[str, WASM_EXPORT_OBJECT]]) -> 'WebAssembly':
+        " Creates new instance in the state of snapshot, or of snapshot file, without running start function "
+        if isinstance(snapshot, str):
+            snapshot = WasmInstanceSnapshot.load(snapshot)
+        return WebAssembly(clone_instance(snapshot, import_object), snapshot.compiled)
+
     @staticmethod
-    def compile(buffer_source: Union[bytearray, bytes]) -> WasmParsedModule:
+    def compile(
+        buffer_source: BUFFER_SOURCE,
+        executor: Optional[Executor] = None,
+        cache_dir: Optional[str] = None,
+        module_cache: Optional[ModuleCache] = None,
+    ) -> WasmCompiledModule:
         """
         https://developer.mozilla.org/ja/docs/Web/JavaScript/Reference/Global_Objects/WebAssembly/compile
+        Function bodies are decoded in executor if given, otherwise on their first call.
+        If cache_dir is given, parsed module is loaded from or stored to ModuleDiskCache there, and executor is not used.
+        If module_cache is given, parsed module is shared through it, and cache_dir and executor are not used.
         """
-        return WebAssembly.compile_streaming(BytesIO(buffer_source))
+        if module_cache is not None:
+            return module_cache.compile(buffer_source)
+        if cache_dir is not None:
+            return ModuleDiskCache(cache_dir).compile(buffer_source)
+        return WebAssembly.compile_streaming(buffer_source, executor)
 
     @staticmethod
-    def compile_streaming(source: IO[bytes]) -> WasmParsedModule:
+    def compile_streaming(source: Union[IO[bytes], BUFFER_SOURCE], executor: Optional[Executor] = None) -> WasmCompiledModule:
         """
         https://developer.mozilla.org/ja/docs/Web/JavaScript/Reference/Global_Objects/WebAssembly/compileStreaming
         """
-        return parse_binary_wasm_module(source)
+        return compile_wasm_module(parse_binary_wasm_module(source, executor=executor))